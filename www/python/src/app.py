@@ -13,6 +13,7 @@ from flask_cors import CORS
 
 # --- IMPORTS FROM OUR MODULES ---
 from spellchecker import spellchecker_logic as logic
+from spellchecker.config import SNAPSHOT_PATH
 from spellchecker.database import get_db_connection
 from spellchecker.routes import api_blueprint
 
@@ -29,9 +30,10 @@ app.register_blueprint(api_blueprint)
 
 # --- STARTUP LOGIC ---
 # This code now runs in both development and production modes.
-# Load all data into the in-memory cache at startup for high performance.
-with get_db_connection() as conn:
-    logic.load_all_data_into_memory(conn)
+# Map the prebuilt snapshot if there is one; otherwise load all data from the database.
+if not logic.load_all_data_from_snapshot(SNAPSHOT_PATH):
+    with get_db_connection() as conn:
+        logic.load_all_data_into_memory(conn)
 
 # --- Load the pre-calculated data using a robust, absolute path ---
 # This ensures the file is found regardless of where the app is started from.
@@ -51,6 +53,15 @@ process = psutil.Process(os.getpid())
 memory_mb = process.memory_info().rss / (1024 * 1024)  # Convert bytes to megabytes
 print(f"✅ Application ready. Memory usage: {memory_mb:.2f} MB")
 
+# Report how much of that the conjugated verb forms take with the configured storage.
+verb_forms_storage = logic.linguistic_data.get('verb_forms_storage')
+if verb_forms_storage and 'set_bytes' in verb_forms_storage:
+    print(f"   Verb forms: {verb_forms_storage['count']:,} stored as '{verb_forms_storage['storage']}' "
+          f"in approx. {verb_forms_storage['bytes'] / (1024 * 1024):.2f} MB "
+          f"(plain sets: approx. {verb_forms_storage['set_bytes'] / (1024 * 1024):.2f} MB).")
+elif verb_forms_storage:
+    print(f"   Verb forms: recognized from the verb stems, approx. {verb_forms_storage['bytes'] / (1024 * 1024):.2f} MB.")
+
 # --- MAIN EXECUTION (FOR LOCAL DEVELOPMENT ONLY) ---
 if __name__ == '__main__':
     app.run(debug=True, host='127.0.0.1', port=5000)
@@ -0,0 +1,318 @@
+# -*- coding: utf-8 -*-
+"""
+CKB Bijar Spellchecker - Benchmark Suite
+Times the core engines on a deterministic fixture dictionary, without a database:
+loading the data, conjugating the verbs, generating the word sets, checking text
+and finding suggestions. The results are written to a JSON file, and can be compared
+against an earlier run to see whether a change made things faster or slower.
+
+The fixture is generated from a seed (so every run uses the same dictionary), or read
+from a JSON file with the rows of each table (see `TABLE_QUERIES` in data_loader.py).
+
+--- USAGE EXAMPLES ---
+# Run the suite and write benchmark_results.json
+python run.py benchmark
+
+# Keep the results of the main branch, then compare a change against them
+python run.py benchmark -o baseline.json
+python run.py benchmark --baseline baseline.json
+
+# A larger dictionary, more repetitions, and a non-zero exit code on a >10% regression
+python run.py benchmark --stems 50000 --verbs 500 --repeat 5 --baseline baseline.json --fail-on-regression
+
+# Save the generated fixture, or use a checked-in one
+python run.py benchmark --write-fixture fixture.json
+python run.py benchmark --fixture fixture.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Tuple
+
+from spellchecker import spellchecker_logic as logic
+from spellchecker.config import VERB_FORMS_STORAGE
+from spellchecker.constants import MAX_LEVENSHTEIN_DISTANCE
+from spellchecker.data_loader import TABLE_QUERIES, generate_all_word_sets, load_linguistic_data
+from spellchecker.suggestion_engine import SuggestionFinder
+
+LETTERS = 'ئابپتجچحخدرڕزژسشعغفڤقکگلڵمنوۆھەیێ'
+VOWEL_ENDINGS = ('ا', 'ە', 'ێ', 'ۆ', 'و', 'ی')
+SUFFIXES = [
+    ('ەکە', 'consonant'), ('کە', 'vowel'), ('ەکان', 'consonant'), ('کان', 'vowel'), ('ان', 'consonant'),
+    ('یان', 'vowel'), ('ێک', 'consonant'), ('یەک', 'vowel'), ('ی', 'consonant,vowel'), ('ە', 'consonant'),
+    ('م', 'consonant,vowel'), ('ت', 'consonant,vowel'), ('مان', 'consonant,vowel'), ('تان', 'consonant,vowel'),
+    ('ش', 'consonant,vowel'), ('یش', 'consonant'), ('دا', 'consonant,vowel'), ('ەوە', 'consonant'),
+    ('وە', 'vowel'), ('ەکەم', 'consonant'), ('ەکەت', 'consonant'), ('ەکەی', 'consonant'), ('ەکانمان', 'consonant'),
+    ('ەکانیان', 'consonant'), ('ێکی', 'consonant'), ('یەکی', 'vowel'), ('انە', 'consonant'), ('گەل', 'consonant,vowel'),
+]
+PREFIXES = ['ھەڵ', 'دا', 'ڕا', 'وەر', 'تێ', 'لێ', 'پێ', 'دەر']
+PARTICLES = ['و', 'لە', 'بە', 'بۆ', 'کە', 'ئەم', 'ئەو', 'تا', 'ھەر', 'ھیچ', 'یان', 'بەڵام', 'چونکە', 'ئەگەر',
+             'لەگەڵ', 'بێ', 'نێو', 'سەر', 'ژێر', 'پاش', 'پێش', 'ئێستا', 'زۆر', 'کەم', 'ھەموو', 'چەند']
+
+class FixtureConnection:
+    """A stand-in for a database connection that answers the loader's queries from fixture rows."""
+    def __init__(self, tables: Dict[str, List[Dict[str, Any]]]):
+        self._rows_by_query = {query: tables[table] for table, query in TABLE_QUERIES.items()}
+
+    def cursor(self) -> 'FixtureCursor':
+        return FixtureCursor(self._rows_by_query)
+
+class FixtureCursor:
+    def __init__(self, rows_by_query: Dict[str, List[Dict[str, Any]]]):
+        self._rows_by_query = rows_by_query
+        self._rows: List[Dict[str, Any]] = []
+
+    def execute(self, query: str, args: Any = None):
+        # Anything else (e.g. CHECKSUM TABLE) returns no rows.
+        self._rows = [dict(row) for row in self._rows_by_query.get(query, [])]
+
+    def fetchall(self) -> List[Dict[str, Any]]:
+        return self._rows
+
+    def close(self):
+        pass
+
+def build_fixture_tables(seed: int, stem_count: int, verb_count: int) -> Dict[str, List[Dict[str, Any]]]:
+    """Generates the rows of every table, always the same for the same arguments."""
+    rng = random.Random(seed)
+
+    def random_word(min_length: int, max_length: int) -> str:
+        return ''.join(rng.choice(LETTERS) for _ in range(rng.randint(min_length, max_length)))
+
+    stems: Dict[str, None] = {}
+    while len(stems) < stem_count:
+        stems[random_word(2, 9)] = None
+    verbs = []
+    while len(verbs) < verb_count:
+        present_stem = random_word(1, 4)
+        past_stem = present_stem + rng.choice(('ی', 'ا', 'د', 'ت'))
+        verbs.append({'id': len(verbs) + 1, 'infinitive': past_stem + 'ن', 'past_stem': past_stem,
+                      'present_stem': present_stem, 'is_transitive': rng.randint(0, 1)})
+
+    return {
+        'verb_prefixes': [{'prefix': prefix, 'id': i + 1} for i, prefix in enumerate(PREFIXES)],
+        'verbs': verbs,
+        'verb_prefix_link': [{'verb_id': verb['id'], 'prefix_id': rng.randint(1, len(PREFIXES))}
+                             for verb in verbs if rng.random() < 0.4],
+        'stems': [{'word': word, 'sound_type': 'vowel' if word.endswith(VOWEL_ENDINGS) else 'consonant',
+                   'is_bad': int(rng.random() < 0.01)} for word in stems],
+        'suffixes': [{'suffix': suffix, 'applies_to_sound': applies_to} for suffix, applies_to in SUFFIXES],
+        'particles': [{'word': word} for word in PARTICLES],
+    }
+
+def build_text(data: Dict[str, Any], verb_forms: List[str], token_count: int, seed: int) -> str:
+    """A text of mostly correct stems, derived words, verb forms and particles, with ~10% typos."""
+    rng = random.Random(seed)
+    stems = sorted(data['stems_map'])
+    suffixes = sorted({s['suffix'] for s in data['suffixes_list']})
+    tokens: List[str] = []
+    for _ in range(token_count):
+        roll = rng.random()
+        if roll < 0.3:
+            token = rng.choice(stems)
+        elif roll < 0.55:
+            token = rng.choice(stems) + rng.choice(suffixes)
+        elif roll < 0.7 and verb_forms:
+            token = rng.choice(verb_forms)
+        elif roll < 0.9:
+            token = rng.choice(PARTICLES)
+        else:
+            token = make_typo(rng.choice(stems) + rng.choice(suffixes), rng)
+        tokens.append(token)
+    return ' '.join(tokens)
+
+def make_typo(word: str, rng: random.Random) -> str:
+    """Replaces, inserts or deletes one letter."""
+    chars = list(word)
+    position = rng.randrange(len(chars))
+    operation = rng.random()
+    if operation < 0.4:
+        chars[position] = rng.choice(LETTERS)
+    elif operation < 0.8 or len(chars) < 3:
+        chars.insert(position, rng.choice(LETTERS))
+    else:
+        del chars[position]
+    return ''.join(chars)
+
+def time_repeated(function: Callable[[], Any], repeat: int) -> Tuple[List[float], Any]:
+    """Runs the function `repeat` times and returns the durations in seconds and the last result."""
+    durations: List[float] = []
+    result = None
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):  # The loaders report their progress.
+            result = function()
+        durations.append(time.perf_counter() - start_time)
+    return durations, result
+
+def summarize_ms(durations: List[float]) -> Dict[str, float]:
+    return {'min_ms': round(min(durations) * 1000, 2), 'median_ms': round(statistics.median(durations) * 1000, 2)}
+
+def percentiles_ms(latencies: List[float]) -> Dict[str, float]:
+    """p50/p95/p99 of latencies in seconds, in milliseconds."""
+    if len(latencies) < 2:
+        return {'p50_ms': round(latencies[0] * 1000, 3)} if latencies else {}
+    cuts = statistics.quantiles(latencies, n=100, method='inclusive')
+    return {'p50_ms': round(cuts[49] * 1000, 3), 'p95_ms': round(cuts[94] * 1000, 3), 'p99_ms': round(cuts[98] * 1000, 3),
+            'max_ms': round(max(latencies) * 1000, 3)}
+
+def run_benchmarks(tables: Dict[str, List[Dict[str, Any]]], args: argparse.Namespace) -> Dict[str, Dict[str, Any]]:
+    results: Dict[str, Dict[str, Any]] = {}
+    conn = FixtureConnection(tables)
+
+    print(f"  load_linguistic_data ({args.verb_forms_storage}) x{args.repeat}...")
+    durations, data = time_repeated(lambda: load_linguistic_data(conn, args.verb_forms_storage), args.repeat)
+    results['load_linguistic_data'] = summarize_ms(durations)
+
+    print(f"  Verb.generate_all_conjugations for {len(data['verbs'])} verbs x{args.repeat}...")
+    durations, forms = time_repeated(lambda: [verb.generate_all_conjugations() for verb in data['verbs']], args.repeat)
+    form_count = sum(len(f) for f in forms)
+    verb_forms = sorted({form for verb_forms in forms for form in verb_forms if ' ' not in form})
+    results['generate_all_conjugations'] = {**summarize_ms(durations), 'forms': form_count,
+                                            'forms_per_sec': round(form_count / min(durations))}
+
+    print(f"  generate_all_word_sets x{args.repeat}...")
+    durations, word_sets = time_repeated(lambda: generate_all_word_sets(data), args.repeat)
+    results['generate_all_word_sets'] = {**summarize_ms(durations), 'derived_words': len(word_sets['derived'])}
+
+    # The request-time functions work on the prepared data (indexes and caches) of the logic module.
+    with contextlib.redirect_stdout(io.StringIO()):
+        logic.load_all_data_into_memory(conn, args.verb_forms_storage)
+    data = logic.linguistic_data
+
+    text = build_text(data, verb_forms, args.tokens, args.seed)
+    print(f"  check_text_block on {args.tokens:,} tokens x{args.repeat}...")
+    cold: List[float] = []
+    warm: List[float] = []
+    for _ in range(args.repeat):
+        data['validation_cache'].clear()
+        for durations in (cold, warm):  # First with an empty validation cache, then with a full one.
+            start_time = time.perf_counter()
+            problems = logic.check_text_block(text)
+            durations.append(time.perf_counter() - start_time)
+    results['check_text_block'] = {
+        'tokens': args.tokens,
+        'problems': len(problems),
+        'cold_tokens_per_sec': round(args.tokens / min(cold)),
+        'warm_tokens_per_sec': round(args.tokens / min(warm)),
+    }
+
+    rng = random.Random(args.seed)
+    stems = sorted(data['stems_map'])
+    suffixes = sorted({s['suffix'] for s in data['suffixes_list']})
+    words = [make_typo(rng.choice(stems) + (rng.choice(suffixes) if rng.random() < 0.5 else ''), rng)
+             for _ in range(args.suggestion_words)]
+    index = data['suggestion_index']
+    for distance in range(1, MAX_LEVENSHTEIN_DISTANCE + 1):
+        print(f"  SuggestionFinder at distance {distance} for {len(words)} words...")
+        latencies: List[float] = []
+        for word in words:
+            start_time = time.perf_counter()
+            SuggestionFinder(word, args.suggestion_limit, distance, index).get_suggestions()
+            latencies.append(time.perf_counter() - start_time)
+        results[f'suggestions_distance_{distance}'] = percentiles_ms(latencies)
+
+    return results
+
+def compare_with_baseline(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]], tolerance: float) -> List[str]:
+    """
+    Prints every timing next to the baseline's and returns the regressions beyond `tolerance`
+    (a fraction). Metrics ending in _ms are better lower, those ending in _per_sec higher.
+    """
+    regressions: List[str] = []
+    print(f"\n{'benchmark':<32}{'metric':<22}{'baseline':>12}{'current':>12}{'change':>10}")
+    for name, metrics in results.items():
+        for metric, value in metrics.items():
+            old = baseline.get(name, {}).get(metric)
+            if not metric.endswith(('_ms', '_per_sec')) or not isinstance(old, (int, float)) or not old:
+                continue
+            change = (value - old) / old
+            worse = change > tolerance if metric.endswith('_ms') else change < -tolerance
+            print(f"{name:<32}{metric:<22}{old:>12,}{value:>12,}{change:>+10.1%}{'  <- slower' if worse else ''}")
+            if worse:
+                regressions.append(f"{name}.{metric}")
+    return regressions
+
+def setup_arg_parser() -> argparse.ArgumentParser:
+    """Sets up the command-line argument parser."""
+    parser = argparse.ArgumentParser(description="Benchmark the core engines on a fixture dictionary (no database needed).")
+    parser.add_argument('--fixture', help="A JSON file with the rows of each table (default: generate one).")
+    parser.add_argument('--write-fixture', help="Write the generated fixture to this JSON file and exit.")
+    parser.add_argument('--seed', type=int, default=1, help="Random seed of the generated fixture, text and words (default: 1).")
+    parser.add_argument('--stems', type=int, default=20000, help="Number of stems of the generated fixture (default: 20000).")
+    parser.add_argument('--verbs', type=int, default=300, help="Number of verbs of the generated fixture (default: 300).")
+    parser.add_argument('--verb-forms-storage', choices=('set', 'compact', 'recognizer'), default=VERB_FORMS_STORAGE,
+                        help=f"How the verb forms are stored (default: {VERB_FORMS_STORAGE}).")
+    parser.add_argument('--tokens', type=int, default=50000, help="Number of tokens of the checked text (default: 50000).")
+    parser.add_argument('--suggestion-words', type=int, default=200, help="Number of misspelled words to suggest for (default: 200).")
+    parser.add_argument('--suggestion-limit', type=int, default=5, help="Suggestions per word (default: 5).")
+    parser.add_argument('--repeat', type=int, default=3, help="Repetitions of the timed steps; the best run counts (default: 3).")
+    parser.add_argument('-o', '--output', default='benchmark_results.json', help="Results file (default: benchmark_results.json).")
+    parser.add_argument('--baseline', help="Results of an earlier run to compare against.")
+    parser.add_argument('--tolerance', type=float, default=10, help="Change in percent that counts as a regression (default: 10).")
+    parser.add_argument('--fail-on-regression', action='store_true', help="Exit with status 1 if anything regressed.")
+    return parser
+
+def main():
+    """Main execution function."""
+    args = setup_arg_parser().parse_args()
+    args.repeat = max(1, args.repeat)
+
+    if args.fixture:
+        with open(args.fixture, 'r', encoding='utf-8') as f:
+            tables = json.load(f)
+        fixture_info: Dict[str, Any] = {'file': os.path.basename(args.fixture)}
+    else:
+        tables = build_fixture_tables(args.seed, args.stems, args.verbs)
+        fixture_info = {'seed': args.seed, 'stems': args.stems, 'verbs': args.verbs}
+    if args.write_fixture:
+        with open(args.write_fixture, 'w', encoding='utf-8') as f:
+            json.dump(tables, f, ensure_ascii=False)
+        print(f"Fixture written to '{args.write_fixture}'.")
+        return
+
+    print("Running the benchmarks...")
+    results = run_benchmarks(tables, args)
+    fixture_info['data_version'] = logic.linguistic_data.get('data_version')
+    document = {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'fixture': fixture_info,
+        'verb_forms_storage': args.verb_forms_storage,
+        'results': results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(document, f, ensure_ascii=False, indent=2)
+
+    regressions: List[str] = []
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline: Dict[str, Any] = json.load(f)
+        if baseline.get('fixture', {}).get('data_version') != fixture_info['data_version']:
+            print("\nNote: The baseline was run on a different fixture; the numbers are not comparable.")
+        elif baseline.get('verb_forms_storage') != args.verb_forms_storage:
+            print(f"\nNote: The baseline stored the verb forms as '{baseline.get('verb_forms_storage')}'.")
+        regressions = compare_with_baseline(results, baseline.get('results', {}), args.tolerance / 100)
+
+    print("\n---")
+    print("✅ Success!")
+    print(f"Results written to '{args.output}'.")
+    if regressions:
+        print(f"{len(regressions)} metric(s) regressed by more than {args.tolerance:g}%: {', '.join(regressions)}")
+    print("---\n")
+    if regressions and args.fail_on_regression:
+        sys.exit(1)
+
+# --- MAIN EXECUTION ---
+if __name__ == '__main__':
+    main()
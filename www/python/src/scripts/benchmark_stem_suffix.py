@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""
+CKB Bijar Spellchecker - Stem+Suffix Suggestion Benchmark
+Compares the indexed stem+suffix search (Hypothesis B) against the previous
+implementation, which scanned every stem of a similar length for every
+(split, suffix) pair. Both run on the same long derived words and their
+candidates are checked to be identical.
+
+--- USAGE EXAMPLES ---
+# Benchmark 50 words at every distance
+python run.py benchmark_stem_suffix
+
+# More words, a different seed and only distance 3
+python run.py benchmark_stem_suffix --words 200 --seed 7 --distances 3
+"""
+
+import argparse
+import random
+import time
+from typing import Any, Dict, List, Set, Tuple
+import Levenshtein
+
+from spellchecker import spellchecker_logic as logic
+from spellchecker.database import get_db_connection
+from spellchecker.suggestion_engine import SuggestionFinder, SuggestionIndex
+
+class LegacyStemSuffixFinder(SuggestionFinder):
+    """The previous length-bucket scan for Hypothesis B, kept as the benchmark reference."""
+    def __init__(self, word: str, limit: int, max_distance: int, index: SuggestionIndex, stems_by_len: Dict[int, Set[str]]):
+        super().__init__(word, limit, max_distance, index)
+        self.stems_by_len = stems_by_len
+
+    def _find_stem_suffix_suggestions(self):
+        processed_pairs: Set[Tuple[str, str]] = set()
+        min_stem_len = 2
+
+        for i in range(min_stem_len, len(self.word)):
+            hypothetical_stem = self.word[:i]
+            hypothetical_suffix = self.word[i:]
+
+            for suffix_info in self.sorted_suffixes:
+                real_suffix = suffix_info.get('suffix', '')
+                if not real_suffix: continue
+
+                suffix_dist = Levenshtein.distance(hypothetical_suffix, real_suffix)
+                if suffix_dist > self.max_distance:
+                    continue
+
+                remaining_dist = self.max_distance - suffix_dist
+
+                len_range = range(len(hypothetical_stem) - remaining_dist, len(hypothetical_stem) + remaining_dist + 1)
+                for length in len_range:
+                    for real_stem in self.stems_by_len.get(length, set()):
+                        if (real_stem, real_suffix) in processed_pairs: continue
+
+                        if Levenshtein.distance(hypothetical_stem, real_stem) <= remaining_dist:
+                            if self.stems_map[real_stem]['sound_type'] in suffix_info.get('applies_to_sound', ''):
+                                reconstructed = (real_stem[:-1] if real_stem.endswith('ە') and real_suffix.startswith(('ا', 'ە')) else real_stem) + real_suffix
+                                final_dist = Levenshtein.distance(self.word, reconstructed)
+                                if final_dist <= self.max_distance:
+                                    self._add_candidate(reconstructed, final_dist)
+                                processed_pairs.add((real_stem, real_suffix))
+
+                if real_suffix.startswith(('ا', 'ە')):
+                    potential_e_stem = hypothetical_stem + 'ە'
+                    if (potential_e_stem, real_suffix) in processed_pairs: continue
+
+                    if potential_e_stem in self.stems_map:
+                        reconstructed = hypothetical_stem + real_suffix
+                        final_dist = Levenshtein.distance(self.word, reconstructed)
+                        if final_dist <= self.max_distance:
+                            self._add_candidate(reconstructed, final_dist)
+                        processed_pairs.add((potential_e_stem, real_suffix))
+
+def build_long_derived_words(data: Dict[str, Any], count: int, seed: int) -> List[str]:
+    """Builds misspelled long derived words: a long stem, one of the longest suffixes and one typo."""
+    rng = random.Random(seed)
+    stems = sorted(stem for stem in data['stems_map'] if len(stem) >= 5)
+    suffixes = sorted({s['suffix'] for s in data['suffixes_list'] if s['suffix']}, key=len, reverse=True)[:10]
+    letters = sorted({char for stem in stems for char in stem})
+    if not stems or not suffixes:
+        return []
+
+    words: List[str] = []
+    for _ in range(count):
+        chars = list(rng.choice(stems) + rng.choice(suffixes))
+        position = rng.randrange(len(chars))
+        if rng.random() < 0.5:
+            chars[position] = rng.choice(letters)
+        else:
+            chars.insert(position, rng.choice(letters))
+        words.append(''.join(chars))
+    return words
+
+def time_finder(words: List[str], distance: int, make_finder) -> Tuple[float, List[Dict[str, float]]]:
+    """Runs Hypothesis B for every word and returns the total seconds and the candidates."""
+    results: List[Dict[str, float]] = []
+    start_time = time.perf_counter()
+    for word in words:
+        finder = make_finder(word, distance)
+        finder._find_stem_suffix_suggestions()
+        results.append(finder.candidates)
+    return time.perf_counter() - start_time, results
+
+def setup_arg_parser() -> argparse.ArgumentParser:
+    """Sets up the command-line argument parser."""
+    parser = argparse.ArgumentParser(description="Benchmark the stem+suffix suggestion search against the previous implementation.")
+    parser.add_argument('--words', type=int, default=50, help="Number of misspelled words to generate (default: 50).")
+    parser.add_argument('--seed', type=int, default=1, help="Random seed for the generated words (default: 1).")
+    parser.add_argument('--distances', type=int, nargs='+', default=[1, 2, 3], help="Levenshtein distances to benchmark (default: 1 2 3).")
+    return parser
+
+def main():
+    """Main execution function."""
+    args = setup_arg_parser().parse_args()
+
+    print("Loading all linguistic data from the database...")
+    with get_db_connection() as conn:
+        logic.load_all_data_into_memory(conn)
+    data = logic.linguistic_data
+    index: SuggestionIndex = data['suggestion_index']
+
+    stems_by_len: Dict[int, Set[str]] = {}
+    for stem in data['stems_map']:
+        stems_by_len.setdefault(len(stem), set()).add(stem)
+
+    words = build_long_derived_words(data, args.words, args.seed)
+    if not words:
+        print("No stems or suffixes were loaded. Nothing to benchmark.")
+        return
+    print(f"Benchmarking {len(words)} long derived words (average length {sum(map(len, words)) / len(words):.1f}).")
+
+    print("\n--- Stem+Suffix Search (ms per word) ---")
+    print(f"{'Distance':<10}{'Previous':>12}{'Indexed':>12}{'Speedup':>10}  Same results")
+    for distance in args.distances:
+        legacy_seconds, legacy_results = time_finder(
+            words, distance, lambda w, d: LegacyStemSuffixFinder(w, 10, d, index, stems_by_len))
+        indexed_seconds, indexed_results = time_finder(
+            words, distance, lambda w, d: SuggestionFinder(w, 10, d, index))
+
+        legacy_ms = legacy_seconds * 1000 / len(words)
+        indexed_ms = indexed_seconds * 1000 / len(words)
+        speedup = legacy_seconds / indexed_seconds if indexed_seconds else float('inf')
+        same = "yes" if legacy_results == indexed_results else "NO"
+        print(f"{distance:<10}{legacy_ms:>12.2f}{indexed_ms:>12.2f}{speedup:>9.1f}x  {same}")
+
+# --- MAIN EXECUTION ---
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""
+CKB Bijar Spellchecker - Snapshot Builder
+Loads all linguistic data from the database once, conjugates every verb,
+builds the suggestion indexes and writes everything to a versioned binary
+snapshot. Webservice workers memory-map this file at startup instead of
+querying the database, and share its pages with each other.
+
+Re-run it (e.g. from the same cron job as generate_stats) whenever the
+dictionary changes, then restart the webservice.
+
+--- USAGE EXAMPLES ---
+# Write the snapshot to the default location (SNAPSHOT_PATH)
+python run.py build_snapshot
+
+# Write it somewhere else
+python run.py build_snapshot -o /tmp/linguistic_data.snapshot
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from spellchecker.config import SNAPSHOT_PATH, SRC_DIR
+from spellchecker.data_loader import load_linguistic_data
+from spellchecker.database import get_db_connection
+from spellchecker.snapshot import load_snapshot, write_snapshot
+from spellchecker.suggestion_engine import SuggestionIndex
+
+def setup_arg_parser() -> argparse.ArgumentParser:
+    """Sets up the command-line argument parser."""
+    default_path = SNAPSHOT_PATH or os.path.join(SRC_DIR, 'data', 'linguistic_data.snapshot')
+    parser = argparse.ArgumentParser(description="Build a memory-mappable snapshot of the linguistic data.")
+    parser.add_argument('-o', '--output', default=default_path, help=f"Output file (default: {default_path}).")
+    return parser
+
+def main():
+    """Main execution function."""
+    args = setup_arg_parser().parse_args()
+    start_time = time.perf_counter()
+
+    print("Loading all linguistic data from the database...")
+    with get_db_connection() as conn:
+        data = load_linguistic_data(conn)
+
+    print("Building the suggestion indexes...")
+    index = SuggestionIndex.build(data)
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    print(f"Writing the snapshot to '{args.output}'...")
+    size_bytes = write_snapshot(args.output, data, index.deletion_index, index.stem_index)
+
+    # Read it back to make sure the file is usable before any worker tries to.
+    snapshot = load_snapshot(args.output)
+    for key in ('stems_map', 'single_word_verb_forms', 'multi_word_verb_phrases'):
+        if len(snapshot[key]) != len(data[key]):
+            print(f"Error: The snapshot has {len(snapshot[key]):,} entries in '{key}' instead of {len(data[key]):,}.")
+            sys.exit(1)
+
+    print("\n---")
+    print("✅ Success!")
+    print(f"Snapshot of data version {data['data_version']} written: {size_bytes / (1024 * 1024):.2f} MB "
+          f"in {time.perf_counter() - start_time:.1f} s.")
+    print("Restart the webservice to use it.")
+    print("---\n")
+
+# --- MAIN EXECUTION ---
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+"""
+CKB Bijar Spellchecker - Wiki Dump Checker
+Checks every article of a MediaWiki XML dump (e.g. ckbwiki-latest-pages-articles.xml.bz2
+from https://dumps.wikimedia.org/ckbwiki/) offline, with all CPU cores, and reports the
+most common misspellings. The dump is streamed, so it never has to fit in memory.
+
+Three reports are written next to each other:
+  <prefix>.words.tsv     word, type (misspelled/bad), occurrences and number of pages, most frequent first
+  <prefix>.pages.tsv     every page with problems: its counts and its most frequent misspellings
+  <prefix>.summary.json  totals, throughput and the options used
+
+--- USAGE EXAMPLES ---
+# Check all articles with all cores
+python run.py check_dump ckbwiki-latest-pages-articles.xml.bz2
+
+# Try it on the first 2,000 articles, with 4 worker processes
+python run.py check_dump ckbwiki-latest-pages-articles.xml.bz2 --max-pages 2000 --workers 4
+
+# Include the Wikipedia (4) and template (10) namespaces and keep words seen at least 5 times
+python run.py check_dump dump.xml --namespaces 0 4 10 --min-count 5 -o reports/ckbwiki
+
+# Check the raw wikitext, markup included (by default templates, references, links' targets... are skipped)
+python run.py check_dump dump.xml --mode text
+"""
+
+import argparse
+import itertools
+import json
+import os
+import sys
+import time
+from collections import Counter
+from datetime import datetime
+
+from spellchecker import spellchecker_logic as logic
+from spellchecker.config import SNAPSHOT_PATH
+from spellchecker.constants import TEXT_MODES
+from spellchecker.database import get_db_connection
+from spellchecker.dump_checker import check_pages_in_parallel, iter_dump_pages
+
+# Number of a page's most frequent misspellings listed in the pages report.
+TOP_WORDS_PER_PAGE = 5
+
+def default_prefix(dump_path: str) -> str:
+    """'ckbwiki-latest-pages-articles.xml.bz2' -> 'ckbwiki-latest-pages-articles'."""
+    name = os.path.basename(dump_path)
+    for extension in ('.bz2', '.xml'):
+        if name.endswith(extension):
+            name = name[:-len(extension)]
+    return name
+
+def setup_arg_parser() -> argparse.ArgumentParser:
+    """Sets up the command-line argument parser."""
+    parser = argparse.ArgumentParser(description="Check a MediaWiki XML dump and report the most common misspellings.")
+    parser.add_argument('dump', help="Path of the dump (.xml or .xml.bz2).")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="Number of worker processes (default: all cores).")
+    parser.add_argument('--namespaces', type=int, nargs='+', default=[0], help="Namespaces to check (default: 0, the articles).")
+    parser.add_argument('--max-pages', type=int, default=0, help="Stop after this many pages (default: all).")
+    parser.add_argument('--min-count', type=int, default=2, help="Leave out words seen fewer times from the words report (default: 2).")
+    parser.add_argument('-o', '--output-prefix', help="Path prefix of the reports (default: the dump's name, in the current directory).")
+    parser.add_argument('--mode', choices=TEXT_MODES, default='wikitext',
+                        help="'wikitext' skips the markup (templates, references, link targets, URLs...); 'text' checks everything (default: wikitext).")
+    parser.add_argument('--progress-every', type=int, default=1000, help="Print the progress every N pages (default: 1000).")
+    return parser
+
+def main():
+    """Main execution function."""
+    args = setup_arg_parser().parse_args()
+    if not os.path.exists(args.dump):
+        print(f"Error: The dump '{args.dump}' does not exist.")
+        sys.exit(1)
+    prefix = args.output_prefix or default_prefix(args.dump)
+    if os.path.dirname(prefix):
+        os.makedirs(os.path.dirname(prefix), exist_ok=True)
+
+    # Load the data once here; the forked workers share it.
+    if logic.load_all_data_from_snapshot(SNAPSHOT_PATH):
+        print(f"Loaded the linguistic data from the snapshot '{SNAPSHOT_PATH}'.")
+    else:
+        print("Loading all linguistic data from the database...")
+        with get_db_connection() as conn:
+            logic.load_all_data_into_memory(conn)
+
+    print(f"Checking '{args.dump}' (namespaces {', '.join(map(str, args.namespaces))}) with {args.workers} worker(s)...")
+    pages = iter_dump_pages(args.dump, set(args.namespaces))
+    if args.max_pages:
+        pages = itertools.islice(pages, args.max_pages)
+
+    occurrences = {'misspelled': Counter(), 'bad': Counter()}
+    page_counts = {'misspelled': Counter(), 'bad': Counter()}
+    checked = pages_with_problems = 0
+    start_time = time.perf_counter()
+
+    with open(f"{prefix}.pages.tsv", 'w', encoding='utf-8') as pages_report:
+        pages_report.write("title\tmisspelled\tbad\ttop_misspellings\n")
+        for result in check_pages_in_parallel(pages, args.workers, mode=args.mode):
+            checked += 1
+            for problem_type, words in (('misspelled', result.misspelled), ('bad', result.bad)):
+                occurrences[problem_type].update(words)
+                page_counts[problem_type].update(words.keys())
+            if result.misspelled or result.bad:
+                pages_with_problems += 1
+                top = ', '.join(f"{word}:{count}" for word, count in result.misspelled.most_common(TOP_WORDS_PER_PAGE))
+                pages_report.write(f"{result.title}\t{sum(result.misspelled.values())}\t{sum(result.bad.values())}\t{top}\n")
+            if checked % args.progress_every == 0:
+                rate = checked / (time.perf_counter() - start_time)
+                print(f"  {checked:,} pages ({rate:.0f} pages/sec), "
+                      f"{len(occurrences['misspelled']):,} distinct misspellings so far")
+
+    elapsed = time.perf_counter() - start_time
+    rows = [
+        (word, problem_type, count, page_counts[problem_type][word])
+        for problem_type, counter in occurrences.items()
+        for word, count in counter.items() if count >= args.min_count
+    ]
+    rows.sort(key=lambda row: (-row[2], row[0]))
+    with open(f"{prefix}.words.tsv", 'w', encoding='utf-8') as words_report:
+        words_report.write("word\ttype\toccurrences\tpages\n")
+        words_report.writelines(f"{word}\t{problem_type}\t{count}\t{pages}\n" for word, problem_type, count, pages in rows)
+
+    summary = {
+        'dump': os.path.basename(args.dump),
+        'checked_at': datetime.now().isoformat(timespec='seconds'),
+        'data_version': logic.linguistic_data.get('data_version'),
+        'namespaces': args.namespaces,
+        'mode': args.mode,
+        'workers': args.workers,
+        'pages': checked,
+        'pages_with_problems': pages_with_problems,
+        'misspelled_occurrences': sum(occurrences['misspelled'].values()),
+        'distinct_misspellings': len(occurrences['misspelled']),
+        'bad_occurrences': sum(occurrences['bad'].values()),
+        'distinct_bad_words': len(occurrences['bad']),
+        'seconds': round(elapsed, 1),
+        'pages_per_second': round(checked / elapsed, 1) if elapsed else None,
+        'top_misspellings': occurrences['misspelled'].most_common(20),
+    }
+    with open(f"{prefix}.summary.json", 'w', encoding='utf-8') as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+
+    print("\n---")
+    print("✅ Success!")
+    print(f"Checked {checked:,} pages in {elapsed:.1f} s ({summary['pages_per_second'] or 0:.0f} pages/sec): "
+          f"{summary['misspelled_occurrences']:,} misspellings ({summary['distinct_misspellings']:,} distinct) "
+          f"and {summary['bad_occurrences']:,} bad words.")
+    print(f"Reports written to '{prefix}.words.tsv', '{prefix}.pages.tsv' and '{prefix}.summary.json'.")
+    print("---\n")
+
+# --- MAIN EXECUTION ---
+if __name__ == '__main__':
+    main()
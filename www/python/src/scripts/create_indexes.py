@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+CKB Bijar Spellchecker - Database Index Setup
+Creates the indexes the paginated review list (`/api/get_requested_words`)
+relies on, so that filtering by status, sorting by any column and fetching
+the next page stay fast as `requested_words` grows. Every sort also orders
+by the (unique) word, so each index ends with it. Sorting by word uses the
+unique key on word; every other column has an index, both on its own and
+after the status (for the status filter). Sorting by status reads each
+status in word order, with idx_requested_words_status_word.
+
+Indexes that already exist are skipped, so the script is safe to re-run.
+
+--- USAGE EXAMPLES ---
+# Create the missing indexes
+python run.py create_indexes
+
+# Only print the statements that would run
+python run.py create_indexes --dry-run
+"""
+
+import argparse
+from typing import Dict, Tuple
+
+from spellchecker.database import get_db_connection
+
+# index name -> (table, columns)
+INDEXES: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+    'idx_requested_words_count': ('requested_words', ('request_count', 'word')),
+    'idx_requested_words_first_seen': ('requested_words', ('first_seen', 'word')),
+    'idx_requested_words_last_updated': ('requested_words', ('last_updated', 'word')),
+    'idx_requested_words_status_word': ('requested_words', ('status', 'word')),
+    'idx_requested_words_status_count': ('requested_words', ('status', 'request_count', 'word')),
+    'idx_requested_words_status_first_seen': ('requested_words', ('status', 'first_seen', 'word')),
+    'idx_requested_words_status_last_updated': ('requested_words', ('status', 'last_updated', 'word')),
+}
+
+def setup_arg_parser() -> argparse.ArgumentParser:
+    """Sets up the command-line argument parser."""
+    parser = argparse.ArgumentParser(description="Create the database indexes used by the webservice.")
+    parser.add_argument('--dry-run', action='store_true', help="Print the statements without running them.")
+    return parser
+
+def main():
+    """Main execution function."""
+    args = setup_arg_parser().parse_args()
+
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT DISTINCT index_name AS index_name FROM information_schema.statistics WHERE table_schema = DATABASE()"
+        )
+        existing = {row['index_name'] for row in cursor.fetchall()}
+
+        missing = 0
+        for name, (table, columns) in INDEXES.items():
+            if name in existing:
+                print(f"  '{name}' already exists.")
+                continue
+            statement = f"CREATE INDEX {name} ON {table} ({', '.join(columns)})"
+            print(f"  {statement};")
+            missing += 1
+            if not args.dry_run:
+                cursor.execute(statement)
+        cursor.close()
+
+    print("\n---")
+    if args.dry_run:
+        print(f"Dry run: {missing} index(es) would be created.")
+    else:
+        print("✅ Success!")
+        print(f"{missing} index(es) created, {len(INDEXES) - missing} already existed.")
+    print("---\n")
+
+# --- MAIN EXECUTION ---
+if __name__ == '__main__':
+    main()
@@ -3,7 +3,11 @@
 CKB Bijar Spellchecker - Custom Dictionary Exporter
 
 A command-line tool to generate and export word lists by calling the
-generation logic from the data_loader module.
+generation logic from the data_loader module, or to export the rules
+themselves as a Hunspell dictionary (see spellchecker/hunspell.py).
+
+The word list is written without holding it in memory: the words are
+sorted in chunks that are merged into the file (an external merge sort).
 
 --- USAGE EXAMPLES ---
 # Export ALL words to the default file (word_list.txt)
@@ -15,29 +19,96 @@ python export_words.py --stems --verbs -o custom_verb_list.txt
 # Export only derived words (stem + suffix combinations)
 python export_words.py --derived
 
+# Export a Hunspell dictionary (writes ckb.dic and ckb.aff)
+python export_words.py --format hunspell -o ckb.dic
+
 # See all available options
 python export_words.py --help
 """
 
 import argparse
-from typing import Dict, Set, List
+import heapq
+import itertools
+import os
+import tempfile
+from typing import Dict, Iterable, Iterator, List, Optional
 
-from spellchecker.data_loader import load_linguistic_data, generate_all_word_sets
+from spellchecker.data_loader import load_linguistic_data, iter_derived_words, count_words
 from spellchecker.database import get_db_connection
-
-def write_words_to_file(word_list: List[str], filename: str):
-    """Sorts and writes a list of words to a UTF-8 encoded text file."""
-    print(f"\nWriting {len(word_list):,} unique words to '{filename}'...")
+from spellchecker.hunspell import write_hunspell_dictionary
+
+def iter_sorted_unique(words: Iterable[str], chunk_size: int) -> Iterator[str]:
+    """
+    Yields the distinct words in sorted order. Each `chunk_size` words are sorted in memory
+    and written to a temporary file, and the files are then merged.
+    """
+    words = iter(words)
+    chunk = sorted(set(itertools.islice(words, chunk_size)))
+    next_word = list(itertools.islice(words, 1))
+    if not next_word:  # Everything fit in one chunk.
+        yield from chunk
+        return
+    words = itertools.chain(next_word, words)
+
+    with tempfile.TemporaryDirectory(prefix="export_words-") as temp_dir:
+        chunk_paths: List[str] = []
+        while chunk:
+            path = os.path.join(temp_dir, f"chunk-{len(chunk_paths)}.txt")
+            with open(path, "w", encoding="utf-8") as f:
+                for word in chunk:
+                    f.write(word + "\n")
+            chunk_paths.append(path)
+            chunk = sorted(set(itertools.islice(words, chunk_size)))
+
+        files = [open(path, encoding="utf-8") for path in chunk_paths]
+        try:
+            last = None
+            for word in heapq.merge(*((line.rstrip("\n") for line in f) for f in files)):
+                if word != last:
+                    yield word
+                    last = word
+        finally:
+            for f in files:
+                f.close()
+
+def write_words_to_file(words: Iterable[str], filename: str, chunk_size: int) -> Optional[int]:
+    """Sorts and writes the distinct words to a UTF-8 encoded text file. Returns how many were written (None on error)."""
+    print(f"\nWriting the unique words to '{filename}'...")
+    count = 0
     try:
         with open(filename, "w", encoding="utf-8") as f:
-            for word in sorted(word_list):
+            for word in iter_sorted_unique(words, chunk_size):
                 f.write(word + "\n")
-        print("\n---")
-        print("✅ Success!")
-        print(f"The file '{filename}' has been created successfully.")
-        print("---\n")
+                count += 1
+    except IOError as e:
+        print(f"Error: Could not write to file. {e}")
+        return None
+    print("\n---")
+    print("✅ Success!")
+    print(f"The file '{filename}' has been created successfully.")
+    print("---\n")
+    return count
+
+def export_hunspell(linguistic_data: Dict, output: str):
+    """Writes the Hunspell dictionary to '<output>.dic' and '<output>.aff' (an extension on `output` is dropped)."""
+    base_path = os.path.splitext(output)[0]
+    dic_path, aff_path = base_path + ".dic", base_path + ".aff"
+    print(f"\nWriting the Hunspell dictionary to '{dic_path}' and '{aff_path}'...")
+    try:
+        stats = write_hunspell_dictionary(linguistic_data, dic_path, aff_path)
     except IOError as e:
         print(f"Error: Could not write to file. {e}")
+        return
+
+    print("\n--- Export Statistics ---")
+    print(f"- {'Dictionary Entries':<28}: {stats['entries']:>10,}")
+    print(f"- {'Affix Classes':<28}: {stats['affix_classes']:>10,}")
+    print(f"- {'Affix Rules':<28}: {stats['affix_rules']:>10,}")
+    print("-------------------------")
+    print("\n---")
+    print("✅ Success!")
+    print(f"The files '{dic_path}' and '{aff_path}' have been created successfully.")
+    print("---\n")
 
 def setup_arg_parser() -> argparse.ArgumentParser:
     """Sets up the command-line argument parser."""
@@ -50,54 +121,73 @@ def setup_arg_parser() -> argparse.ArgumentParser:
     parser.add_argument('-v', '--verbs', action='store_true', help="Export all generated verb forms.")
     parser.add_argument('-p', '--particles', action='store_true', help="Export particles (prepositions, etc.).")
     parser.add_argument('-o', '--output', default='word_list.txt', help="Specify the output filename (default: word_list.txt).")
+    parser.add_argument('-f', '--format', choices=['list', 'hunspell'], default='list',
+                        help="'list': one word per line (default).\n"
+                             "'hunspell': a .dic and an .aff file named after --output, with the suffix,\n"
+                             "prefix and pronoun rules kept as affix rules. Always covers every category.")
+    parser.add_argument('--chunk-size', type=int, default=1_000_000,
+                        help="How many words are sorted in memory at a time when writing a list (default: 1,000,000).")
     return parser
 
 def main():
     """Main execution function."""
     parser = setup_arg_parser()
     args = parser.parse_args()
+    categories_selected = args.stems or args.derived or args.verbs or args.particles
+    if args.format == 'hunspell' and categories_selected:
+        parser.error("The Hunspell dictionary always covers every category; don't select any.")
+    if args.chunk_size < 1:
+        parser.error("--chunk-size must be at least 1.")
 
     print("Initializing and connecting to the database...")
     with get_db_connection() as conn:
         linguistic_data = load_linguistic_data(conn)
     print("Linguistic data has been loaded into memory.")
 
-    # Get all word sets from the single authoritative function.
-    all_word_sets = generate_all_word_sets(linguistic_data)
+    if args.format == 'hunspell':
+        export_hunspell(linguistic_data, args.output)
+        return
+
+    # The sizes of the categories, counted without generating the derived words.
+    word_counts = count_words(linguistic_data)
 
     # Determine which categories to export. If none are specified, export all.
-    export_all = not (args.stems or args.derived or args.verbs or args.particles)
-    
-    master_word_set: Set[str] = set()
+    export_all = not categories_selected
+
+    sources: List[Iterable[str]] = []
     stats: Dict[str, int] = {}
 
-    # --- Build the master list and stats based on user selection ---
+    # --- Collect the words (streamed, not generated up front) and stats based on user selection ---
     if args.stems or export_all:
-        stats['Stems'] = len(all_word_sets['stems'])
-        master_word_set.update(all_word_sets['stems'])
-        
+        stats['Stems'] = word_counts['stems']
+        sources.append(linguistic_data.get('stems_map', {}).keys())
+
     if args.derived or export_all:
-        stats['Derived Words (Stem+Suffix)'] = len(all_word_sets['derived'])
-        master_word_set.update(all_word_sets['derived'])
+        stats['Derived Words (Stem+Suffix)'] = word_counts['derived']
+        sources.append(iter_derived_words(linguistic_data))
 
     if args.verbs or export_all:
-        stats['Verb Forms'] = len(all_word_sets['verbs'])
-        master_word_set.update(all_word_sets['verbs'])
-        
+        stats['Verb Forms'] = word_counts['verbs']
+        sources.append(linguistic_data.get('single_word_verb_forms', set()))
+        sources.append(linguistic_data.get('multi_word_verb_phrases', set()))
+
     if args.particles or export_all:
-        stats['Particles'] = len(all_word_sets['particles'])
-        master_word_set.update(all_word_sets['particles'])
+        stats['Particles'] = word_counts['particles']
+        sources.append(linguistic_data.get('particles_set', set()))
 
-    if not master_word_set:
+    sum_of_categories = sum(stats.values())
+    if not sum_of_categories:
         print("\nNo words were generated based on your selection. Nothing to export.")
         return
 
-    # --- Print Statistics ---
-    sum_of_categories = sum(stats.values())
-    total_unique = len(master_word_set)
+    # The duplicates are only known once the merge has removed them.
+    total_unique = write_words_to_file(itertools.chain.from_iterable(sources), args.output, args.chunk_size)
+    if total_unique is None:
+        return
     overlap_count = sum_of_categories - total_unique
 
-    print("\n--- Export Statistics ---")
+    # --- Print Statistics ---
+    print("--- Export Statistics ---")
     for category, count in stats.items():
         print(f"- {category:<28}: {count:>10,}")
     print("-------------------------")
@@ -111,8 +201,6 @@ def main():
     print(f"- {'Total Unique Words':<28}: {total_unique:>10,}")
     print("-------------------------")
 
-    write_words_to_file(list(master_word_set), args.output)
-
 
 # --- MAIN EXECUTION ---
 if __name__ == '__main__':
@@ -17,7 +17,7 @@ print("Loading all linguistic data from the database...")
 with get_db_connection() as conn:
     logic.load_all_data_into_memory(conn)
 
-print("Starting the word count calculation. This may take a while...")
+print("Counting the words...")
 calculate_and_cache_word_counts(logic.linguistic_data)
 print("Calculation complete.")
 
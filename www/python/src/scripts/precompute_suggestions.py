@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""
+CKB Bijar Spellchecker - Suggestion Precomputation
+Finds the most frequent misspellings in a word-frequency list or a text
+corpus, computes their suggestions for every distance in parallel, and
+writes them to a compact table that the webservice loads at startup and
+serves before any cache. The slowest common lookups are then instant right
+after a deploy.
+
+The table is tied to the dictionary data it was built from: re-run this
+script (after `build_snapshot`, if you use one) whenever the data changes.
+
+--- USAGE EXAMPLES ---
+# From a frequency list ("word count" or "count word" per line, or one word per line by rank)
+python run.py precompute_suggestions --frequency-list ckb_word_frequencies.txt
+
+# From plain text files, keeping the 20,000 most frequent misspellings
+python run.py precompute_suggestions --corpus articles/*.txt --top 20000
+
+# Use 4 worker processes and write somewhere else
+python run.py precompute_suggestions --corpus dump.txt --workers 4 -o /tmp/precomputed.json
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import Counter
+from typing import Iterable, Iterator, Tuple
+
+from spellchecker import spellchecker_logic as logic
+from spellchecker.config import PRECOMPUTED_SUGGESTIONS_PATH, SRC_DIR
+from spellchecker.constants import MAX_SUGGESTION_LIMIT
+from spellchecker.database import get_db_connection
+from spellchecker.precomputed import compute_in_parallel, write_precomputed_suggestions
+
+def iter_frequency_list(path: str) -> Iterator[Tuple[str, int]]:
+    """Yields (word, count) pairs. Lines without a count are ranked by their position."""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f):
+            parts = line.split()
+            if not parts:
+                continue
+            counts = [p for p in parts if p.isdigit()]
+            words = [p for p in parts if not p.isdigit()]
+            if words:
+                yield words[0], int(counts[0]) if counts else -line_number
+
+def count_misspellings_in_frequency_list(path: str) -> Counter:
+    """Keeps the words of the list the checker flags as misspelled."""
+    misspellings: Counter = Counter()
+    for word, count in iter_frequency_list(path):
+        if any(problem['type'] == 'misspelled' for problem in logic.iter_problematic_words(word)):
+            misspellings[word] += count
+    return misspellings
+
+def count_misspellings_in_corpus(paths: Iterable[str]) -> Counter:
+    """Checks every line of the given text files and counts the flagged misspellings."""
+    misspellings: Counter = Counter()
+    for path in paths:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            for line in f:
+                misspellings.update(p['word'] for p in logic.iter_problematic_words(line) if p['type'] == 'misspelled')
+    return misspellings
+
+def setup_arg_parser() -> argparse.ArgumentParser:
+    """Sets up the command-line argument parser."""
+    default_path = PRECOMPUTED_SUGGESTIONS_PATH or os.path.join(SRC_DIR, 'data', 'precomputed_suggestions.json')
+    parser = argparse.ArgumentParser(description="Precompute suggestions for the most frequent misspellings.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--frequency-list', help="A word-frequency list ('word count' or 'count word' per line).")
+    source.add_argument('--corpus', nargs='+', help="One or more UTF-8 text files.")
+    parser.add_argument('--top', type=int, default=5000, help="Number of most frequent misspellings to keep (default: 5000).")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="Number of worker processes (default: all cores).")
+    parser.add_argument('-o', '--output', default=default_path, help=f"Output file (default: {default_path}).")
+    return parser
+
+def main():
+    """Main execution function."""
+    args = setup_arg_parser().parse_args()
+    start_time = time.perf_counter()
+
+    print("Loading all linguistic data from the database...")
+    with get_db_connection() as conn:
+        logic.load_all_data_into_memory(conn)
+
+    if args.frequency_list:
+        print(f"Finding misspellings in the frequency list '{args.frequency_list}'...")
+        misspellings = count_misspellings_in_frequency_list(args.frequency_list)
+        source = os.path.basename(args.frequency_list)
+    else:
+        print(f"Finding misspellings in {len(args.corpus)} corpus file(s)...")
+        misspellings = count_misspellings_in_corpus(args.corpus)
+        source = ', '.join(os.path.basename(p) for p in args.corpus)
+
+    words = [word for word, _ in misspellings.most_common(args.top)]
+    if not words:
+        print("No misspellings found. Nothing to precompute.")
+        sys.exit(1)
+    print(f"Computing suggestions for the {len(words):,} most frequent of {len(misspellings):,} distinct misspellings "
+          f"with {args.workers} worker(s)...")
+
+    table = {}
+    compute_start = time.perf_counter()
+    index = logic.linguistic_data['suggestion_index']
+    for word, per_distance in compute_in_parallel(words, index, args.workers):
+        table[word] = per_distance
+        if len(table) % 500 == 0:
+            rate = len(table) / (time.perf_counter() - compute_start)
+            print(f"  {len(table):,} / {len(words):,} words ({rate:.0f} words/sec)")
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    write_precomputed_suggestions(args.output, table, MAX_SUGGESTION_LIMIT, logic.linguistic_data['data_version'], source)
+
+    print("\n---")
+    print("✅ Success!")
+    print(f"Suggestions for {len(table):,} words written to '{args.output}' "
+          f"({os.path.getsize(args.output) / 1024:.0f} KB) in {time.perf_counter() - start_time:.1f} s.")
+    print("Restart the webservice to use them.")
+    print("---\n")
+
+# --- MAIN EXECUTION ---
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""
+CKB Bijar Spellchecker - Verb Recognizer Verification
+Checks that the rule-based verb recognizer (VERB_FORMS_STORAGE=recognizer)
+accepts exactly the forms `Verb.generate_all_conjugations` materialises:
+  1. every generated form is recognized,
+  2. iterating the recognizer yields exactly the generated sets, and
+  3. near-miss probes (affixes added, removed or swapped between verbs)
+     are accepted only when they really are generated forms.
+Run it after changing the conjugation rules or the verb tables.
+
+--- USAGE EXAMPLES ---
+# Verify against all verbs in the database
+python run.py verify_verb_recognizer
+
+# Use a different random seed for the near-miss probes
+python run.py verify_verb_recognizer --seed 7
+"""
+
+import argparse
+import random
+import sys
+import time
+from typing import List, Set
+
+from spellchecker.constants import GROUP_1_PRONOUNS, GROUP_2_PRONOUNS
+from spellchecker.data_loader import load_linguistic_data
+from spellchecker.database import get_db_connection
+from spellchecker.verb_recognizer import VerbRecognizer
+
+def build_near_miss_probes(forms: List[str], prefixes: List[str], rng: random.Random) -> Set[str]:
+    """Builds probes that look like verb forms: real forms with affixes added, removed or swapped."""
+    affixes = sorted((GROUP_1_PRONOUNS | GROUP_2_PRONOUNS | {'دە', 'بوو', 'ە', 'یش'}) - {''})
+    first_words = [form.split(' ', 1)[0] for form in forms if ' ' in form]
+    probes: Set[str] = set()
+    for form in forms:
+        probes.update((form[1:], form[:-1], 'دە' + form, form + rng.choice(affixes), rng.choice(affixes) + form))
+        if prefixes:
+            probes.add(rng.choice(prefixes) + form)
+        if ' ' in form:
+            first, second = form.split(' ', 1)
+            probes.add(f"{rng.choice(first_words)} {second}")
+            probes.add(f"{first} {rng.choice(affixes)}{second}")
+            probes.add(f"{first}{rng.choice(affixes)} {second}")
+    return probes
+
+def setup_arg_parser() -> argparse.ArgumentParser:
+    """Sets up the command-line argument parser."""
+    parser = argparse.ArgumentParser(description="Verify the rule-based verb recognizer against the materialised verb forms.")
+    parser.add_argument('--seed', type=int, default=1, help="Random seed for the near-miss probes (default: 1).")
+    return parser
+
+def main():
+    """Main execution function."""
+    args = setup_arg_parser().parse_args()
+
+    print("Loading all linguistic data from the database (materialised verb forms)...")
+    start_time = time.perf_counter()
+    with get_db_connection() as conn:
+        data = load_linguistic_data(conn, verb_forms_storage='set')
+    materialised_seconds = time.perf_counter() - start_time
+    single_word_forms, multi_word_phrases = data['single_word_verb_forms'], data['multi_word_verb_phrases']
+
+    start_time = time.perf_counter()
+    recognizer = VerbRecognizer(data['verbs'])
+    recognizer_seconds = time.perf_counter() - start_time
+    print(f"Loaded in {materialised_seconds:.2f} s with materialised forms; recognizer built in {recognizer_seconds * 1000:.1f} ms.")
+
+    errors: List[str] = []
+
+    # 1. Every generated form is recognized by the matching view.
+    for expected, view in ((single_word_forms, recognizer.single_word_forms), (multi_word_phrases, recognizer.multi_word_phrases)):
+        errors.extend(f"not recognized: '{form}'" for form in expected if form not in view)
+
+    # 2. Iterating the recognizer yields exactly the generated forms.
+    for name, expected, view in (('single-word', single_word_forms, recognizer.single_word_forms),
+                                 ('multi-word', multi_word_phrases, recognizer.multi_word_phrases)):
+        iterated = set(view)
+        if iterated != expected or len(view) != len(expected):
+            errors.append(f"{name} iteration differs: {len(iterated ^ expected):,} forms, len() {len(view):,} vs {len(expected):,}")
+
+    # 3. Near misses are accepted only if they really are generated forms.
+    rng = random.Random(args.seed)
+    probes = build_near_miss_probes(sorted(single_word_forms | multi_word_phrases), sorted(data['all_prefixes']), rng)
+    for probe in sorted(probes):
+        expected = probe in single_word_forms or probe in multi_word_phrases
+        recognized = probe in recognizer.single_word_forms or probe in recognizer.multi_word_phrases
+        if recognized != expected:
+            errors.append(f"{'accepted' if recognized else 'rejected'} near miss: '{probe}'")
+
+    print(f"\nChecked {len(single_word_forms) + len(multi_word_phrases):,} generated forms and {len(probes):,} near-miss probes.")
+    if errors:
+        print(f"❌ {len(errors):,} differences found. First ones:")
+        for error in errors[:20]:
+            print(f"   - {error}")
+        sys.exit(1)
+    print("✅ The recognizer accepts exactly the generated verb forms.")
+
+# --- MAIN EXECUTION ---
+if __name__ == '__main__':
+    main()
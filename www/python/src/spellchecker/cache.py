@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+"""
+CKB Bijar Spellchecker - Bounded Caches
+This module provides the LRU cache used for suggestions, paragraph results and
+word validations. Instead of being cleared all at once when full, it evicts the
+least recently used entries one by one, optionally expires entries after a TTL
+and/or keeps them within a byte budget, and counts hits, misses and evictions.
+"""
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, Hashable, List, Tuple
+
+def approx_size_bytes(key: Any, value: Any) -> int:
+    """Approximates the memory held by a cache entry: the key, the value and the items of a list/tuple value."""
+    size = sys.getsizeof(key) + sys.getsizeof(value)
+    if isinstance(value, (list, tuple)):
+        size += sum(sys.getsizeof(item) for item in value)
+    return size
+
+class LRUCache:
+    """
+    A thread-safe LRU cache bounded by a number of entries and, optionally, a byte budget.
+    Entries can also expire `ttl_seconds` after they were stored. A limit of 0 disables it.
+    """
+    def __init__(self, name: str, max_entries: int, max_bytes: int = 0, ttl_seconds: float = 0,
+                 sizeof: Callable[[Any, Any], int] = approx_size_bytes):
+        self.name = name
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._sizeof = sizeof
+        # key -> (value, size in bytes, expiry time or 0)
+        self._entries: OrderedDict[Hashable, Tuple[Any, int, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = self.misses = self.evictions = self.expirations = 0
+        self.created_at = datetime.now()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and not self._is_expired(entry)
+
+    def _is_expired(self, entry: Tuple[Any, int, float]) -> bool:
+        return entry[2] != 0 and entry[2] <= time.monotonic()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Returns the cached value (marking it as recently used), or `default`."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            if self._is_expired(entry):
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any):
+        """Stores a value, then evicts the least recently used entries until the cache is within its limits."""
+        if self.max_entries <= 0:
+            return
+        size = self._sizeof(key, value) if self.max_bytes else 0
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else 0
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, size, expires_at)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or (self.max_bytes and self._bytes > self.max_bytes and len(self._entries) > 1):
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self.evictions += 1
+
+    def _remove(self, key: Hashable):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def items(self) -> List[Tuple[Hashable, Any]]:
+        """Returns the unexpired (key, value) pairs, least recently used first, without counting them as used."""
+        with self._lock:
+            return [(key, entry[0]) for key, entry in self._entries.items() if not self._is_expired(entry)]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the cache's size, limits and cumulative counters."""
+        lookups = self.hits + self.misses
+        return {
+            "name": self.name,
+            "entries": len(self._entries),
+            "bytes": self._bytes if self.max_bytes else None,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes or None,
+            "ttl_seconds": self.ttl_seconds or None,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            "created_at": self.created_at.strftime('%Y-%m-%d %H:%M:%S'),
+        }
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+CKB Bijar Spellchecker - Compact String Sets
+This module provides a read-only, front-coded string set for the large verb
+form sets. Conjugated forms share long prefixes ("ھەڵم", "دە..."), so storing
+them sorted in small blocks, where each entry only keeps the part that differs
+from the previous one, takes a fraction of the memory of a Python `set[str]`.
+"""
+from __future__ import annotations
+
+import sys
+from array import array
+from bisect import bisect_right
+from collections.abc import Set
+from typing import Iterable, Iterator, List
+
+DEFAULT_BLOCK_SIZE = 8
+
+def _common_prefix_length(a: bytes, b: bytes) -> int:
+    """Returns the length of the common prefix of two byte strings, without a per-byte Python loop."""
+    n = min(len(a), len(b))
+    diff = int.from_bytes(a[:n], 'big') ^ int.from_bytes(b[:n], 'big')
+    return n if diff == 0 else n - 1 - (diff.bit_length() - 1) // 8
+
+def _write_varint(out: bytearray, value: int):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+def _read_varint(blob: bytes, pos: int):
+    """Reads a varint at `pos`. Returns the value and the position after it."""
+    value = shift = 0
+    while True:
+        byte = blob[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+class FrontCodedSet(Set):
+    """
+    A read-only set of strings stored as sorted, front-coded UTF-8 blocks.
+    The first string of every block is kept whole (for binary search); the
+    others are stored as (shared prefix length, rest) against their predecessor.
+    """
+    def __init__(self, strings: Iterable[str], block_size: int = DEFAULT_BLOCK_SIZE):
+        values = sorted({s.encode('utf-8') for s in strings})
+        blob = bytearray()
+        heads = bytearray()
+        head_offsets = array('I', [0])
+        self._offsets = array('I')
+        previous = b''
+        for i, value in enumerate(values):
+            if i % block_size == 0:
+                heads += value
+                head_offsets.append(len(heads))
+                self._offsets.append(len(blob))
+            else:
+                common = _common_prefix_length(previous, value)
+                _write_varint(blob, common)
+                _write_varint(blob, len(value) - common)
+                blob += value[common:]
+            previous = value
+        self._offsets.append(len(blob))
+        self._blob = bytes(blob)
+        self._count = len(values)
+
+        # The block heads are only created once the temporary encoded values are freed,
+        # so they don't end up scattered across the memory those values occupied.
+        del values, previous
+        heads = bytes(heads)
+        self._heads: List[bytes] = [heads[start:end] for start, end in zip(head_offsets, head_offsets[1:])]
+        self.nbytes = (sys.getsizeof(self._blob) + self._offsets.itemsize * len(self._offsets)
+                       + sys.getsizeof(self._heads) + sum(sys.getsizeof(h) for h in self._heads))
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, key: object) -> bool:
+        if not isinstance(key, str):
+            return False
+        target = key.encode('utf-8')
+        block = bisect_right(self._heads, target) - 1
+        if block < 0:
+            return False
+        previous = self._heads[block]
+        if previous == target:
+            return True
+
+        # Entries are sorted, so the scan can stop at the first one past the target.
+        blob = self._blob
+        pos, end = self._offsets[block], self._offsets[block + 1]
+        while pos < end:
+            # Both lengths nearly always fit in a single byte.
+            common = blob[pos]
+            length = blob[pos + 1]
+            if common < 0x80 and length < 0x80:
+                pos += 2
+            else:
+                common, pos = _read_varint(blob, pos)
+                length, pos = _read_varint(blob, pos)
+            current = previous[:common] + blob[pos:pos + length]
+            pos += length
+            if current >= target:
+                return current == target
+            previous = current
+        return False
+
+    def _iter_block(self, block: int) -> Iterator[bytes]:
+        blob = self._blob
+        previous = self._heads[block]
+        yield previous
+        pos, end = self._offsets[block], self._offsets[block + 1]
+        while pos < end:
+            common, pos = _read_varint(blob, pos)
+            length, pos = _read_varint(blob, pos)
+            previous = previous[:common] + blob[pos:pos + length]
+            pos += length
+            yield previous
+
+    def __iter__(self) -> Iterator[str]:
+        for block in range(len(self._heads)):
+            for value in self._iter_block(block):
+                yield value.decode('utf-8')
+
+    def iter_prefix(self, prefix: str) -> Iterator[str]:
+        """Yields, in sorted order, every string of the set that starts with `prefix`."""
+        target = prefix.encode('utf-8')
+        for block in range(max(bisect_right(self._heads, target) - 1, 0), len(self._heads)):
+            for value in self._iter_block(block):
+                if value.startswith(target):
+                    yield value.decode('utf-8')
+                elif value > target:
+                    return
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+CKB Bijar Spellchecker - Runtime Options
+Optional tuning switches read from the environment (.env). Every option has a
+default that keeps the standard behaviour, so none of them need to be set.
+"""
+
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# The 'src' directory, used to resolve the default locations of generated files.
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def _get_int(name: str, default: int) -> int:
+    """Reads an integer option, falling back to the default if it is missing or invalid."""
+    try:
+        return int(os.getenv(name, default))
+    except (TypeError, ValueError):
+        print(f"WARNING: Invalid value for {name}; using the default ({default}).")
+        return default
+
+def _get_choice(name: str, default: str, choices: tuple) -> str:
+    """Reads an option that must be one of `choices`, falling back to the default otherwise."""
+    value = os.getenv(name, default).strip().lower()
+    if value not in choices:
+        print(f"WARNING: Invalid value for {name} (expected one of {', '.join(choices)}); using the default ({default}).")
+        return default
+    return value
+
+# --- Word Validation ---
+# How many suffixes may be stacked on a stem (e.g. stem + 'ەکان' + 'یش').
+# 1 only accepts the single stem+suffix combinations listed in the database.
+SUFFIX_STACK_DEPTH = max(1, _get_int('SUFFIX_STACK_DEPTH', 1))
+
+# How the conjugated verb forms are kept in memory when loading from the database:
+# 'set' (plain Python sets, fastest lookups), 'compact' (sorted front-coded blocks,
+# a fraction of the memory at the cost of slightly slower lookups) or 'recognizer'
+# (nothing is conjugated up front; forms are parsed against the verb stems on lookup).
+VERB_FORMS_STORAGE = _get_choice('VERB_FORMS_STORAGE', 'set', ('set', 'compact', 'recognizer'))
+
+# --- Caches ---
+# All caches drop their least recently used entries first. A size of 0 disables a cache.
+# Suggestion results (word|limit|distance -> suggestions). Besides the entry limit, an
+# optional memory budget in MB and an optional lifetime in seconds (0 = none).
+SUGGESTION_CACHE_SIZE = max(0, _get_int('SUGGESTION_CACHE_SIZE', 10000))
+SUGGESTION_CACHE_MAX_MB = max(0, _get_int('SUGGESTION_CACHE_MAX_MB', 0))
+SUGGESTION_CACHE_TTL = max(0, _get_int('SUGGESTION_CACHE_TTL', 0))
+
+# An optional suggestion cache in a local SQLite file, shared by all worker processes
+# and kept across restarts. Empty (the default) disables it.
+SHARED_CACHE_PATH = os.getenv('SHARED_CACHE_PATH', '')
+SHARED_CACHE_SIZE = max(1, _get_int('SHARED_CACHE_SIZE', 200000))
+
+# Suggestions of the most frequent misspellings, computed offline with
+# `python run.py precompute_suggestions` and served before any cache. Empty disables it.
+PRECOMPUTED_SUGGESTIONS_PATH = os.getenv('PRECOMPUTED_SUGGESTIONS_PATH', os.path.join(SRC_DIR, 'data', 'precomputed_suggestions.json'))
+
+# Checked paragraphs (paragraph hash -> problematic words), for incremental re-checks.
+PARAGRAPH_CACHE_SIZE = max(0, _get_int('PARAGRAPH_CACHE_SIZE', 10000))
+
+# Validated words (word -> correct/bad), shared by all check_text_block requests.
+VALIDATION_CACHE_SIZE = max(0, _get_int('VALIDATION_CACHE_SIZE', 200000))
+
+# --- Database Connections ---
+# Request-time database connections are kept in a pool of up to this many per worker
+# process instead of being opened for every request. 0 opens a new connection each time.
+DB_POOL_SIZE = max(0, _get_int('DB_POOL_SIZE', 5))
+# Pooled connections are replaced after this many seconds (keep it below the server's wait_timeout).
+DB_POOL_MAX_LIFETIME = max(1, _get_int('DB_POOL_MAX_LIFETIME', 3600))
+# How long a request waits for a free connection when all of them are in use, in seconds.
+DB_POOL_TIMEOUT = max(1, _get_int('DB_POOL_TIMEOUT', 10))
+
+# --- New-Word Requests ---
+# Write new-word requests to the database in the background, in batches, every N seconds
+# (or as soon as WORD_REQUEST_BATCH_SIZE are waiting) and answer the user right away.
+# 0 (the default) writes every request to the database before answering.
+WORD_REQUEST_FLUSH_INTERVAL = max(0, _get_int('WORD_REQUEST_FLUSH_INTERVAL', 0))
+WORD_REQUEST_BATCH_SIZE = max(1, _get_int('WORD_REQUEST_BATCH_SIZE', 100))
+# Requests waiting to be written are also appended to a journal file in this directory, so they
+# survive a restart or a crash: the next process that starts writes them.
+WORD_REQUEST_JOURNAL_DIR = os.getenv('WORD_REQUEST_JOURNAL_DIR', os.path.join(SRC_DIR, 'data', 'word_requests'))
+# New requests are refused (503) while this many are waiting, e.g. when the database is down.
+WORD_REQUEST_MAX_PENDING = max(1, _get_int('WORD_REQUEST_MAX_PENDING', 10000))
+
+# --- Profiling ---
+# A secret that lets trusted callers profile a request with `?profile=1` (sent in the X-Profile-Token
+# header): the response gets a Server-Timing header with the duration of each phase. Empty (the
+# default) disables profiling.
+PROFILE_TOKEN = os.getenv('PROFILE_TOKEN', '')
+# With a directory, profiled requests also run under cProfile and their statistics are written
+# there as .pstats files. Empty (the default) only sends the Server-Timing header.
+PROFILE_DUMP_DIR = os.getenv('PROFILE_DUMP_DIR', '')
+
+# --- Reloading ---
+# A secret that authorizes POST /api/admin/reload (sent in the X-Admin-Token header), which
+# reloads the dictionary without a restart. Empty (the default) disables the endpoint.
+ADMIN_TOKEN = os.getenv('ADMIN_TOKEN', '')
+
+# Check the database for dictionary changes every N seconds and reload them in the background.
+# Only changed tables are fetched again, but each check (CHECKSUM TABLE) reads every row of
+# every table, and every worker process checks on its own: keep it long, e.g. 3600.
+# 0 (the default) disables it.
+RELOAD_INTERVAL = max(0, _get_int('RELOAD_INTERVAL', 0))
+
+# --- Startup ---
+# A prebuilt, memory-mapped dictionary snapshot (see `python run.py build_snapshot`).
+# If the file exists, workers load it instead of querying the database at startup.
+# Set to an empty value to always load from the database.
+SNAPSHOT_PATH = os.getenv('SNAPSHOT_PATH', os.path.join(SRC_DIR, 'data', 'linguistic_data.snapshot'))
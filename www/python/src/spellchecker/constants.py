@@ -10,3 +10,21 @@ from typing import Set
 GROUP_1_PRONOUNS: Set[str] = {'م', 'مان', 'ت', 'تان', 'ی', 'یان'}
 GROUP_2_PRONOUNS: Set[str] = {'م', 'ین', 'یت', 'ن', ''}
 GROUP_3_PRONOUNS: Set[str] = {'م', 'ین', 'یت', 'ن', 'ات', 'ێت'}
+
+# --- Server-side validation limits for suggestions ---
+MAX_SUGGESTION_LIMIT = 10
+MAX_LEVENSHTEIN_DISTANCE = 3
+DEFAULT_SUGGESTION_LIMIT = 5
+DEFAULT_LEVENSHTEIN_DISTANCE = 2
+# Max number of distinct words accepted by one batch suggestion request
+MAX_BATCH_SUGGESTION_WORDS = 500
+# How check_text_block reads the text: as plain text, or as wikitext whose markup is skipped
+TEXT_MODES = ('text', 'wikitext')
+# Max number of paragraphs accepted by one paragraph-mode check request
+MAX_PARAGRAPHS_PER_REQUEST = 5000
+# Max number of requested words returned per page by get_requested_words
+MAX_REQUESTED_WORDS_PAGE_SIZE = 100
+
+# --- Streaming responses ---
+# Problematic words sent per NDJSON chunk when check_text_block streams its results
+STREAM_CHUNK_WORDS = 20
@@ -7,36 +7,88 @@ unique word sets for use by other parts of the application.
 """
 from __future__ import annotations
 
-from typing import Any, Dict, Set
+import hashlib
+import sys
+from collections import Counter
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, Optional, Set, Tuple
+import pymysql
 from pymysql.connections import Connection
 from pymysql.cursors import DictCursor
 from .verb_engine import Verb
+from .verb_recognizer import VerbRecognizer
+from .compact_sets import FrontCodedSet
+from .config import VERB_FORMS_STORAGE
 
 # --- Main Data Loading Function ---
 
-def load_linguistic_data(db_conn: Connection[DictCursor]) -> Dict[str, Any]:
+# The tables the linguistic data is built from, and the query that loads each of them.
+TABLE_QUERIES: Dict[str, str] = {
+    'verb_prefixes': "SELECT prefix, id FROM verb_prefixes",
+    'verbs': "SELECT id, infinitive, past_stem, present_stem, is_transitive FROM verbs",
+    'verb_prefix_link': "SELECT verb_id, prefix_id FROM verb_prefix_link",
+    'stems': "SELECT word, sound_type, is_bad FROM stems",
+    'suffixes': "SELECT suffix, applies_to_sound FROM suffixes",
+    'particles': "SELECT word FROM particles",
+}
+
+def load_linguistic_data(db_conn: Connection[DictCursor], verb_forms_storage: str = VERB_FORMS_STORAGE,
+                         with_checksums: bool = False) -> Dict[str, Any]:
     """
     Connects to the DB and loads all raw linguistic rules.
     Word set generation is deferred to be run on-demand.
+    `verb_forms_storage` selects how verb forms are kept ('set', 'compact' or 'recognizer').
+    `with_checksums` also records the table checksums, which only a later reload uses (to skip
+    unchanged tables). Computing them reads every row of every table, so it is off by default.
     """
-    linguistic_data: Dict[str, Any] = {}
+    checksums = fetch_table_checksums(db_conn) if with_checksums else {}
+    linguistic_data = build_linguistic_data(fetch_tables(db_conn, TABLE_QUERIES), verb_forms_storage)
+    linguistic_data['table_checksums'] = checksums
+    print("✅ Linguistic data loaded into memory.")
+    return linguistic_data
+
+def fetch_tables(db_conn: Connection[DictCursor], tables: Iterable[str]) -> Dict[str, List[Dict[str, Any]]]:
+    """Runs the query of each given table and returns its rows."""
     cursor: DictCursor = db_conn.cursor()
-    
-    # --- 1. Load Raw Data from Database ---
-    cursor.execute("SELECT prefix, id FROM verb_prefixes")
-    all_prefixes_data = cursor.fetchall()
-    cursor.execute("SELECT id, infinitive, past_stem, present_stem, is_transitive FROM verbs")
-    verbs_from_db = cursor.fetchall()
-    cursor.execute("SELECT verb_id, prefix_id FROM verb_prefix_link")
-    prefix_links = cursor.fetchall()
-    cursor.execute("SELECT word, sound_type, is_bad FROM stems")
-    all_stems_data = cursor.fetchall()
-    cursor.execute("SELECT suffix, applies_to_sound FROM suffixes")
-    all_suffixes = cursor.fetchall()
-    cursor.execute("SELECT word FROM particles")
-    particles_set = {row['word'] for row in cursor.fetchall()}
-
-    # --- 2. Process Data and Generate Verb Sets ---
+    try:
+        rows: Dict[str, List[Dict[str, Any]]] = {}
+        for table in tables:
+            cursor.execute(TABLE_QUERIES[table])
+            rows[table] = list(cursor.fetchall())
+        return rows
+    finally:
+        cursor.close()
+
+def fetch_table_checksums(db_conn: Connection[DictCursor]) -> Dict[str, int]:
+    """
+    Returns the server's checksum of every table, used to skip unchanged tables on reload.
+    Returns an empty dict if the server can't compute them (every table then counts as changed).
+    Unless a table keeps a live checksum (InnoDB tables don't), the server reads all of its rows.
+    """
+    cursor: DictCursor = db_conn.cursor()
+    try:
+        cursor.execute(f"CHECKSUM TABLE {', '.join(TABLE_QUERIES)}")
+        # The 'Table' column is qualified with the database name.
+        checksums = {row['Table'].rsplit('.', 1)[-1]: row['Checksum'] for row in cursor.fetchall()}
+    except pymysql.MySQLError as e:
+        print(f"WARNING: Could not read the table checksums ({e}).")
+        return {}
+    finally:
+        cursor.close()
+    return {table: checksum for table, checksum in checksums.items() if checksum is not None}
+
+def build_linguistic_data(tables: Dict[str, List[Dict[str, Any]]], verb_forms_storage: str = VERB_FORMS_STORAGE,
+                          previous: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Builds the linguistic data from the rows of every table (see `TABLE_QUERIES`).
+    If `previous` data built from earlier rows is given, only the verbs that changed since are conjugated,
+    and a 'changes' summary of the words added and removed is included.
+    """
+    linguistic_data: Dict[str, Any] = {}
+    all_prefixes_data, verbs_from_db, prefix_links = tables['verb_prefixes'], tables['verbs'], tables['verb_prefix_link']
+    all_stems_data, all_suffixes, particles_rows = tables['stems'], tables['suffixes'], tables['particles']
+    particles_set = {row['word'] for row in particles_rows}
+
+    # --- Process Data and Generate Verb Sets ---
     stems_map = {s['word']: s for s in all_stems_data}
     bad_words_set = {s['word'] for s in all_stems_data if s['is_bad']}
     
@@ -50,32 +102,172 @@ def load_linguistic_data(db_conn: Connection[DictCursor]) -> Dict[str, Any]:
             valid_prefixes_map.setdefault(verb['infinitive'], set()).add(prefix)
 
     verb_objects = [Verb(v['infinitive'], v['past_stem'], v['present_stem'], v['is_transitive'], valid_prefixes_map.get(v['infinitive'], set())) for v in verbs_from_db]
-    all_generated_forms: Set[str] = {form for verb in verb_objects for form in verb.generate_all_conjugations()}
 
-    # --- 3. Store the raw rules and base sets needed for on-demand generation
+    # --- Store the raw rules and base sets needed for on-demand generation
     linguistic_data['stems_map'] = stems_map
     linguistic_data['bad_words_set'] = bad_words_set
     linguistic_data['suffixes_list'] = all_suffixes
-    linguistic_data['single_word_verb_forms'] = {f for f in all_generated_forms if " " not in f}
-    linguistic_data['multi_word_verb_phrases'] = {f for f in all_generated_forms if " " in f}
+    linguistic_data['verbs'] = verb_objects
+    if previous is not None:
+        linguistic_data.update(_update_verb_forms(previous, verb_objects, verb_forms_storage))
+    else:
+        linguistic_data.update(_build_verb_forms(verb_objects, verb_forms_storage))
     linguistic_data['verb_infinitives'] = {v['infinitive'] for v in verbs_from_db}
     linguistic_data['particles_set'] = particles_set
     linguistic_data['all_prefixes'] = {p['prefix'] for p in all_prefixes_data}
+
+    # A fingerprint of the raw rows, so derived files (e.g. snapshots) can tell which data they belong to.
+    linguistic_data['data_version'] = _fingerprint_tables(*(tables[table] for table in TABLE_QUERIES))
+    # The rows themselves (mostly shared with the structures above), so a reload can reuse unchanged tables.
+    linguistic_data['source_tables'] = tables
     
     # Empty cache for word_counts; filled on first API call
     linguistic_data['word_counts'] = None
 
-
-    print("✅ Linguistic data loaded into memory.")
-    cursor.close()
+    if previous is not None:
+        linguistic_data['changes'] = _summarize_changes(previous, linguistic_data)
     return linguistic_data
 
+def _fingerprint_tables(*tables: Iterable[Dict[str, Any]]) -> str:
+    """Returns a short, order-independent hash of the given table rows."""
+    digest = hashlib.sha256()
+    for rows in tables:
+        for row_repr in sorted(repr(sorted(row.items())) for row in rows):
+            digest.update(row_repr.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()[:16]
+
+def _build_verb_forms(verb_objects: List[Verb], storage: str) -> Dict[str, Any]:
+    """
+    Builds `single_word_verb_forms` and `multi_word_verb_phrases` with the requested storage,
+    along with a `verb_forms_storage` summary of the memory they take.
+    """
+    if storage == 'recognizer':
+        return _recognizer_verb_forms(VerbRecognizer(verb_objects))
+
+    all_generated_forms: Set[str] = {form for verb in verb_objects for form in verb.generate_all_conjugations()}
+    single_word_forms = {f for f in all_generated_forms if " " not in f}
+    multi_word_phrases = {f for f in all_generated_forms if " " in f}
+    del all_generated_forms
+    return _store_verb_forms(single_word_forms, multi_word_phrases, storage)
+
+def _recognizer_verb_forms(recognizer: VerbRecognizer) -> Dict[str, Any]:
+    # Nothing is conjugated up front; forms are parsed against the verbs' stems on lookup.
+    return {
+        'single_word_verb_forms': recognizer.single_word_forms,
+        'multi_word_verb_phrases': recognizer.multi_word_phrases,
+        'verb_forms_storage': {'storage': 'recognizer', 'bytes': recognizer.approx_size_bytes()},
+    }
+
+def _store_verb_forms(single_word_forms: Set[str], multi_word_phrases: Set[str], storage: str) -> Dict[str, Any]:
+    """Converts the generated forms to the requested storage ('set' or 'compact') and summarizes their memory."""
+    summary = {
+        'storage': storage,
+        'count': len(single_word_forms) + len(multi_word_phrases),
+        'set_bytes': _approx_set_size_bytes(single_word_forms) + _approx_set_size_bytes(multi_word_phrases),
+    }
+    if storage == 'compact':
+        single_word_forms = FrontCodedSet(single_word_forms)
+        multi_word_phrases = FrontCodedSet(multi_word_phrases)
+        summary['bytes'] = single_word_forms.nbytes + multi_word_phrases.nbytes
+    else:
+        summary['bytes'] = summary['set_bytes']
+    return {
+        'single_word_verb_forms': single_word_forms,
+        'multi_word_verb_phrases': multi_word_phrases,
+        'verb_forms_storage': summary,
+    }
+
+def _verb_signature(verb: Verb) -> Tuple[str, str, str, bool, FrozenSet[str]]:
+    return verb.infinitive, verb.past_stem, verb.present_stem, verb.is_transitive, frozenset(verb.valid_prefixes)
+
+def _update_verb_forms(previous: Dict[str, Any], verb_objects: List[Verb], storage: str) -> Dict[str, Any]:
+    """
+    Like `_build_verb_forms`, but only conjugates the verbs that were added or changed since `previous`
+    was built and patches its forms. Also returns the 'verb_form_changes' as (added, removed) forms.
+    """
+    old_verbs = {_verb_signature(v): v for v in previous['verbs']}
+    new_verbs = {_verb_signature(v): v for v in verb_objects}
+    stale = [v for signature, v in old_verbs.items() if signature not in new_verbs]
+    fresh = [v for signature, v in new_verbs.items() if signature not in old_verbs]
+
+    old_single, old_multi = previous['single_word_verb_forms'], previous['multi_word_verb_phrases']
+    if not stale and not fresh and previous['verb_forms_storage']['storage'] == storage:
+        # The forms are never modified once built, so they can be shared with the previous data.
+        return {
+            'single_word_verb_forms': old_single,
+            'multi_word_verb_phrases': old_multi,
+            'verb_forms_storage': previous['verb_forms_storage'],
+            'verb_form_changes': (set(), set()),
+        }
+
+    # A form of a stale verb is only gone if no other verb generates it too; the recognizer
+    # (which indexes every verb's stems without conjugating them) answers that exactly.
+    recognizer = VerbRecognizer(verb_objects)
+    stale_forms: Set[str] = {form for verb in stale for form in verb.generate_all_conjugations()}
+    fresh_forms: Set[str] = {form for verb in fresh for form in verb.generate_all_conjugations()}
+    added = {f for f in fresh_forms if f not in (old_multi if " " in f else old_single)}
+    removed = {f for f in stale_forms - fresh_forms
+               if f not in (recognizer.multi_word_phrases if " " in f else recognizer.single_word_forms)}
+    print(f"Re-conjugated {len(fresh):,} changed verb(s): {len(added):,} forms added, {len(removed):,} removed.")
+
+    if storage == 'recognizer':
+        verb_forms = _recognizer_verb_forms(recognizer)
+    else:
+        single_word_forms = set(old_single)
+        multi_word_phrases = set(old_multi)
+        for form in removed:
+            (multi_word_phrases if " " in form else single_word_forms).discard(form)
+        for form in added:
+            (multi_word_phrases if " " in form else single_word_forms).add(form)
+        verb_forms = _store_verb_forms(single_word_forms, multi_word_phrases, storage)
+    verb_forms['verb_form_changes'] = (added, removed)
+    return verb_forms
+
+def _summarize_changes(previous: Dict[str, Any], data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Lists what changed between two builds of the data: the words added to and removed from the
+    dictionary (stems, infinitives, single-word verb forms and particles), the stems, the multi-word
+    verb phrases, and whether the suffix rules changed.
+    """
+    added_forms, removed_forms = data.pop('verb_form_changes')
+    old_stems, new_stems = previous['stems_map'], data['stems_map']
+    added_stems = new_stems.keys() - old_stems.keys()
+    removed_stems = old_stems.keys() - new_stems.keys()
+    retyped_stems = {w for w in new_stems.keys() & old_stems.keys() if new_stems[w]['sound_type'] != old_stems[w]['sound_type']}
+
+    candidates_added = (added_stems | {f for f in added_forms if " " not in f}
+                        | (data['verb_infinitives'] - previous['verb_infinitives']) | (data['particles_set'] - previous['particles_set']))
+    candidates_removed = (removed_stems | {f for f in removed_forms if " " not in f}
+                          | (previous['verb_infinitives'] - data['verb_infinitives']) | (previous['particles_set'] - data['particles_set']))
+    return {
+        'added_words': {w for w in candidates_added if not is_base_word(previous, w)},
+        'removed_words': {w for w in candidates_removed if not is_base_word(data, w)},
+        'added_stems': added_stems,
+        'removed_stems': removed_stems,
+        'retyped_stems': retyped_stems,
+        'added_phrases': {f for f in added_forms if " " in f},
+        'removed_phrases': {f for f in removed_forms if " " in f},
+        'suffixes_changed': _fingerprint_tables(previous['suffixes_list']) != _fingerprint_tables(data['suffixes_list']),
+    }
+
+def is_base_word(data: Dict[str, Any], word: str) -> bool:
+    """Whether the word is one of the dictionary words the suggestion index searches directly."""
+    return (word in data['stems_map'] or word in data['verb_infinitives']
+            or word in data['single_word_verb_forms'] or word in data['particles_set'])
+
+def _approx_set_size_bytes(strings: Set[str]) -> int:
+    """Approximates the memory held by a set of strings (the set itself plus every string object)."""
+    return sys.getsizeof(strings) + sum(sys.getsizeof(s) for s in strings)
+
 # --- On-Demand Generation and Calculation Functions ---
 
 def generate_all_word_sets(data: Dict[str, Any]) -> Dict[str, Set[str]]:
     """
     The single source of truth for generating all categories
     of unique word sets from the loaded linguistic rules.
+    Holds every word in memory; see `iter_derived_words` and `count_words` for callers
+    that only need to go through the words once, or only need how many there are.
     """
     print("Generating all unique word sets from rules...")
     
@@ -84,7 +276,7 @@ def generate_all_word_sets(data: Dict[str, Any]) -> Dict[str, Set[str]]:
     stems_set = set(stems_map.keys())
 
     # Verbs
-    verbs_set = data.get('single_word_verb_forms', set()).union(
+    verbs_set = set(data.get('single_word_verb_forms', set())).union(
         data.get('multi_word_verb_phrases', set())
     )
     
@@ -92,17 +284,7 @@ def generate_all_word_sets(data: Dict[str, Any]) -> Dict[str, Set[str]]:
     particles_set = data.get('particles_set', set())
     
     # Derived Words (the expensive part)
-    suffixes_list = data.get('suffixes_list', [])
-    derived_words_set: Set[str] = set()
-    # This loop is very fast as it's all in-memory.
-    for stem_word, stem_info in stems_map.items():
-        for suffix_info in suffixes_list:
-            # Check if the stem's sound type is allowed by the suffix.
-            if stem_info['sound_type'] in suffix_info.get('applies_to_sound', ''):
-                # Apply the special rule.
-                suffix = suffix_info.get('suffix', '')
-                if not (stem_word.endswith('ە') and suffix.startswith(('ا', 'ە'))):
-                    derived_words_set.add(stem_word + suffix)
+    derived_words_set: Set[str] = set(iter_derived_words(data))
 
     return {
         "stems": stems_set,
@@ -111,23 +293,138 @@ def generate_all_word_sets(data: Dict[str, Any]) -> Dict[str, Set[str]]:
         "particles": particles_set
     }
 
-def calculate_and_cache_word_counts(data: Dict[str, Any]):
+def iter_derived_words(data: Dict[str, Any]) -> Iterator[str]:
     """
-    Performs the one-time calculation for the API and caches it.
-    It now uses the authoritative `generate_all_word_sets` function.
+    Yields every distinct derived word (stem + suffix) once, without keeping them in memory.
+    A word that several stem + suffix pairs produce is only yielded for the pair with the
+    shortest stem, and only stems that start with another stem can have such a shorter pair.
     """
-    # 1. Get all the unique word sets.
-    all_sets = generate_all_word_sets(data)
+    derivations = _Derivations(data)
+    for stem, info in derivations.stems_map.items():
+        suffixes = derivations.suffixes_for(stem, info['sound_type'])
+        produced_before = derivations.produced_by_shorter_stems(stem)
+        for suffix in suffixes:
+            if suffix not in produced_before:
+                yield stem + suffix
 
-    # 2. Calculate the final, de-duplicated total.
-    total_unique = len(all_sets['stems'].union(all_sets['derived'], all_sets['verbs'], all_sets['particles']))
+def count_words(data: Dict[str, Any]) -> Dict[str, int]:
+    """
+    Counts the words of every category and the de-duplicated total exactly, like
+    `generate_all_word_sets` would, without generating the derived words: the stems are
+    grouped by the suffixes that apply to them, and only the few stems that start with
+    another stem are checked for words produced twice.
+    """
+    derivations = _Derivations(data)
+    stems_map = derivations.stems_map
+    particles = data.get('particles_set', set())
+    single_word_forms = data.get('single_word_verb_forms', set())
+    multi_word_phrases = data.get('multi_word_verb_phrases', set())
+
+    # Derived words: stems with the same sound type (and ending) take the same suffixes.
+    stems_per_group: Counter = Counter()
+    derived = 0
+    for stem, info in stems_map.items():
+        produced_before = derivations.produced_by_shorter_stems(stem)
+        if not produced_before:
+            stems_per_group[derivations.group_of(stem, info['sound_type'])] += 1
+        else:
+            derived += len(derivations.suffixes_for(stem, info['sound_type']) - produced_before)
+    derived += sum(count * len(derivations.suffixes_of_group(group)) for group, count in stems_per_group.items())
 
-    # 3. Store the final counts back into the main data dictionary.
-    data['word_counts'] = {
-        "stems": len(all_sets['stems']),
-        "derived": len(all_sets['derived']),
-        "verbs": len(all_sets['verbs']),
-        "particles": len(all_sets['particles']),
-        "total": total_unique
+    # The other categories are held in memory already: each of their words is counted once
+    # (in the first category it appears in), minus the ones that are also derived words.
+    other_words = 0
+    also_derived = 0
+    for words, earlier in ((stems_map, ()), (particles, (stems_map,)), (single_word_forms, (stems_map, particles)),
+                           (multi_word_phrases, (stems_map, particles))):
+        for word in words:
+            if not any(word in category for category in earlier):
+                other_words += 1
+                if derivations.is_derived(word):
+                    also_derived += 1
+
+    return {
+        "stems": len(stems_map),
+        "derived": derived,
+        "verbs": len(single_word_forms) + len(multi_word_phrases),
+        "particles": len(particles),
+        "total": derived + other_words - also_derived,
     }
+
+class _Derivations:
+    """The stem + suffix rules, with the applicable suffixes grouped by the stems' sound type."""
+    def __init__(self, data: Dict[str, Any]):
+        self.stems_map = data.get('stems_map', {})
+        self.suffixes_list = data.get('suffixes_list', [])
+        self._suffixes_by_group: Dict[Tuple[str, bool], FrozenSet[str]] = {}
+        # (group, rest) -> the suffixes y for which rest + y is a suffix of the group.
+        self._continuations: Dict[Tuple[Tuple[str, bool], str], FrozenSet[str]] = {}
+        self._suffix_lengths = sorted({len(s.get('suffix', '')) for s in self.suffixes_list})
+        self._max_suffix_length = self._suffix_lengths[-1] if self._suffix_lengths else 0
+        # Everything a suffix can start with.
+        self._suffix_starts = {s.get('suffix', '')[:i] for s in self.suffixes_list for i in range(1, len(s.get('suffix', '')) + 1)}
+
+    @staticmethod
+    def group_of(stem: str, sound_type: str) -> Tuple[str, bool]:
+        # Stems ending in 'ە' don't take suffixes starting with 'ا' or 'ە'.
+        return sound_type, stem.endswith('ە')
+
+    def suffixes_of_group(self, group: Tuple[str, bool]) -> FrozenSet[str]:
+        suffixes = self._suffixes_by_group.get(group)
+        if suffixes is None:
+            sound_type, ends_with_e = group
+            suffixes = self._suffixes_by_group[group] = frozenset(
+                suffix_info.get('suffix', '') for suffix_info in self.suffixes_list
+                # Check if the stem's sound type is allowed by the suffix.
+                if sound_type in suffix_info.get('applies_to_sound', '')
+                # Apply the special rule.
+                and not (ends_with_e and suffix_info.get('suffix', '').startswith(('ا', 'ە')))
+            )
+        return suffixes
+
+    def suffixes_for(self, stem: str, sound_type: str) -> FrozenSet[str]:
+        """The distinct suffixes the stem takes."""
+        return self.suffixes_of_group(self.group_of(stem, sound_type))
+
+    def produced_by_shorter_stems(self, stem: str) -> Set[str]:
+        """
+        The suffixes y for which stem + y is also produced by a shorter stem: one that `stem`
+        starts with (stem = shorter + rest), and that takes the suffix rest + y.
+        """
+        stems_map = self.stems_map
+        produced: Set[str] = set()
+        # The rest must be the start of a suffix, so only the last few shorter stems qualify.
+        for i in range(max(1, len(stem) - self._max_suffix_length), len(stem)):
+            if stem[i:] not in self._suffix_starts:
+                continue
+            info = stems_map.get(stem[:i])
+            if info is None:
+                continue
+            key = (self.group_of(stem[:i], info['sound_type']), stem[i:])
+            continuations = self._continuations.get(key)
+            if continuations is None:
+                group, rest = key
+                continuations = self._continuations[key] = frozenset(
+                    suffix[len(rest):] for suffix in self.suffixes_of_group(group) if suffix.startswith(rest))
+            produced.update(continuations)
+        return produced
+
+    def is_derived(self, word: str) -> bool:
+        """Whether some stem + suffix pair produces `word`."""
+        stems_map = self.stems_map
+        for length in self._suffix_lengths:
+            if length >= len(word):
+                break
+            stem = word[:len(word) - length]
+            info = stems_map.get(stem)
+            if info is not None and word[len(stem):] in self.suffixes_for(stem, info['sound_type']):
+                return True
+        return False
+
+def calculate_and_cache_word_counts(data: Dict[str, Any]):
+    """
+    Performs the one-time calculation for the API and caches it.
+    The counts are exact, but the words themselves are never generated (see `count_words`).
+    """
+    data['word_counts'] = count_words(data)
     print("Word counts calculated and cached for future requests.")
@@ -8,13 +8,18 @@ configurations using the PyMySQL library.
 from __future__ import annotations
 
 import os
+import threading
+import time
+from collections import deque
 from contextlib import contextmanager
-from typing import Generator, Dict, Any, cast
+from typing import Callable, Deque, Generator, Dict, Any, Optional, Tuple, cast
 from dotenv import load_dotenv
 import pymysql
 from pymysql.connections import Connection
 from pymysql.cursors import DictCursor
 
+from .config import DB_POOL_MAX_LIFETIME, DB_POOL_SIZE, DB_POOL_TIMEOUT
+
 load_dotenv()
 
 # --- Configuration Switch based on FLASK_ENV ---
@@ -43,11 +48,178 @@ else:
         "cursorclass": DictCursor
     }
 
+class PoolTimeoutError(Exception):
+    """Raised when no pooled connection becomes free within the pool's timeout."""
+
+class ConnectionPool:
+    """
+    A bounded, thread-safe pool of database connections. Idle connections are reused
+    (most recently used first), checked with a ping if they sat idle for a while,
+    and replaced once they are older than `max_lifetime` seconds or turn out broken.
+    `connect` creates a new connection, so the pool can be used with any stand-in.
+    """
+    def __init__(self, connect: Callable[[], Connection[DictCursor]], max_size: int, max_lifetime: float = 3600,
+                 timeout: float = 10, ping_after_idle: float = 30):
+        self._connect = connect
+        self.max_size = max_size
+        self.max_lifetime = max_lifetime
+        self.timeout = timeout
+        self.ping_after_idle = ping_after_idle
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_size)
+        # Idle connections as (connection, created at, last used at), most recently used last.
+        self._idle: Deque[Tuple[Connection[DictCursor], float, float]] = deque()
+        self._pid = os.getpid()
+        self.in_use = 0
+        self.creates = self.reuses = self.waits = self.timeouts = self.discards = self.failed_pings = 0
+        self.wait_seconds = 0.0
+
+    @contextmanager
+    def connection(self) -> Generator[Connection[DictCursor], None, None]:
+        """Lends a connection for the duration of the block, then returns it to the pool."""
+        conn, created_at = self._acquire()
+        pid = os.getpid()
+        broken = False
+        try:
+            yield conn
+        except (pymysql.err.OperationalError, pymysql.err.InterfaceError):
+            # Lost connections and the like: don't hand this connection out again.
+            broken = True
+            raise
+        finally:
+            if pid == os.getpid():
+                self._release(conn, created_at, broken)
+
+    def _acquire(self) -> Tuple[Connection[DictCursor], float]:
+        self._check_fork()
+        if not self._slots.acquire(blocking=False):
+            start_time = time.perf_counter()
+            acquired = self._slots.acquire(timeout=self.timeout)
+            with self._lock:
+                self.waits += 1
+                self.wait_seconds += time.perf_counter() - start_time
+                if not acquired:
+                    self.timeouts += 1
+            if not acquired:
+                raise PoolTimeoutError(f"No database connection became free within {self.timeout} s "
+                                       f"(all {self.max_size} are in use).")
+        try:
+            conn, created_at = self._take_idle() or (self._create(), time.monotonic())
+        except BaseException:
+            self._slots.release()
+            raise
+        with self._lock:
+            self.in_use += 1
+        return conn, created_at
+
+    def _take_idle(self) -> Optional[Tuple[Connection[DictCursor], float]]:
+        """Returns a usable idle connection, discarding the expired or broken ones it finds on the way."""
+        while True:
+            with self._lock:
+                if not self._idle:
+                    return None
+                conn, created_at, last_used_at = self._idle.pop()
+            now = time.monotonic()
+            if now - created_at >= self.max_lifetime:
+                self._discard(conn)
+                continue
+            if now - last_used_at >= self.ping_after_idle:
+                try:
+                    conn.ping(reconnect=False)
+                except pymysql.MySQLError:
+                    with self._lock:
+                        self.failed_pings += 1
+                    self._discard(conn)
+                    continue
+            with self._lock:
+                self.reuses += 1
+            return conn, created_at
+
+    def _create(self) -> Connection[DictCursor]:
+        conn = self._connect()
+        with self._lock:
+            self.creates += 1
+        return conn
+
+    def _release(self, conn: Connection[DictCursor], created_at: float, broken: bool):
+        with self._lock:
+            self.in_use -= 1
+        try:
+            if broken:
+                self._discard(conn)
+                return
+            # End any open transaction, so the next user neither inherits uncommitted
+            # changes nor keeps reading from this one's snapshot.
+            try:
+                conn.rollback()
+            except pymysql.MySQLError:
+                self._discard(conn)
+                return
+            with self._lock:
+                self._idle.append((conn, created_at, time.monotonic()))
+        finally:
+            self._slots.release()
+
+    def _discard(self, conn: Connection[DictCursor]):
+        with self._lock:
+            self.discards += 1
+        try:
+            conn.close()
+        except Exception:  # The connection is being thrown away; it may already be broken or closed.
+            pass
+
+    def _check_fork(self):
+        """Connections must not be shared with a parent process (e.g. the data loaded before workers fork)."""
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    # Drop them without closing: closing would end the parent's session on the shared socket.
+                    self._idle.clear()
+                    self._slots = threading.BoundedSemaphore(self.max_size)
+                    self.in_use = 0
+                    self._pid = os.getpid()
+
+    def close_all(self):
+        """Closes the idle connections (connections in use are closed when they are returned)."""
+        with self._lock:
+            idle, self._idle = list(self._idle), deque()
+        for conn, _, _ in idle:
+            self._discard(conn)
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the pool's size and cumulative counters."""
+        return {
+            "max_size": self.max_size,
+            "in_use": self.in_use,
+            "idle": len(self._idle),
+            "creates": self.creates,
+            "reuses": self.reuses,
+            "waits": self.waits,
+            "wait_seconds": round(self.wait_seconds, 3),
+            "timeouts": self.timeouts,
+            "discards": self.discards,
+            "failed_pings": self.failed_pings,
+        }
+
+def _connect() -> Connection[DictCursor]:
+    # Use a string literal in 'cast' to satisfy the type checker without a runtime error.
+    return cast("Connection[DictCursor]", pymysql.connect(**db_config))
+
+# The connection pool shared by all requests of this process (None when DB_POOL_SIZE is 0).
+pool: Optional[ConnectionPool] = (
+    ConnectionPool(_connect, DB_POOL_SIZE, max_lifetime=DB_POOL_MAX_LIFETIME, timeout=DB_POOL_TIMEOUT)
+    if DB_POOL_SIZE > 0 else None
+)
+
 @contextmanager
 def get_db_connection() -> Generator[Connection[DictCursor], None, None]:
-    """Provides a PyMySQL database connection, ensuring it's closed."""
-    # Use a string literal in 'cast' to satisfy the type checker without a runtime error.
-    db_conn = cast("Connection[DictCursor]", pymysql.connect(**db_config))
+    """Provides a PyMySQL database connection from the pool, or a new one that is closed afterwards."""
+    if pool is not None:
+        with pool.connection() as db_conn:
+            yield db_conn
+        return
+
+    db_conn = _connect()
     try:
         yield db_conn
     finally:
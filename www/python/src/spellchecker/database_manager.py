@@ -7,25 +7,30 @@ such as writing new data or fetching dynamic lists.
 from __future__ import annotations
 
 import hashlib
+from collections import Counter
 from datetime import datetime
-from typing import Dict, List, Any
+from typing import Any, Dict, List, Optional, Tuple
 from pymysql.connections import Connection
 from pymysql.cursors import DictCursor
 
+def submission_hash(word: str, user_hash: str) -> str:
+    """The anonymous key of one user's request for one word, used to reject repeated requests."""
+    return hashlib.sha256(f"{word}-{user_hash}".encode('utf-8')).hexdigest()
+
 def add_new_word_request(word: str, user_hash: str, db_conn: Connection[DictCursor]) -> Dict[str, str]:
     """
     Adds a user's request for a new word to the database using an anonymous hash.
     It checks for duplicate requests from the same user for the same word.
     """
     # Use the client’s anonymous hash for defense-in-depth
-    submission_hash = hashlib.sha256(f"{word}-{user_hash}".encode('utf-8')).hexdigest()
+    submission = submission_hash(word, user_hash)
     cursor: DictCursor = db_conn.cursor()
     try:
-        cursor.execute("SELECT 1 FROM requested_words_log WHERE submission_hash = %s", (submission_hash,))
+        cursor.execute("SELECT 1 FROM requested_words_log WHERE submission_hash = %s", (submission,))
         if cursor.fetchone():
             return {"status": "success", "message": "پێشتر داواکاریت بۆ ئەم وشەیە ناردووە."}
         
-        cursor.execute("INSERT INTO requested_words_log (submission_hash) VALUES (%s)", (submission_hash,))
+        cursor.execute("INSERT INTO requested_words_log (submission_hash) VALUES (%s)", (submission,))
         
         sql = """
             INSERT INTO requested_words (word, request_count, status, first_seen, last_updated) 
@@ -40,18 +45,59 @@ def add_new_word_request(word: str, user_hash: str, db_conn: Connection[DictCurs
     finally:
         cursor.close()
 
+def add_new_word_requests(requests: Dict[str, str], db_conn: Connection[DictCursor]) -> Tuple[int, int]:
+    """
+    Writes a batch of new-word requests ({submission hash: word}) in one transaction, skipping
+    the submissions already in the log. Requests for the same word are added up into one row.
+    Returns the number of requests written and the number skipped as duplicates.
+    """
+    if not requests:
+        return 0, 0
+    cursor: DictCursor = db_conn.cursor()
+    try:
+        hashes = list(requests)
+        placeholders = ', '.join(['%s'] * len(hashes))
+        cursor.execute(f"SELECT submission_hash FROM requested_words_log WHERE submission_hash IN ({placeholders})", hashes)
+        known = {row['submission_hash'] for row in cursor.fetchall()}
+        new = [h for h in hashes if h not in known]
+        if not new:
+            return 0, len(known)
+
+        # PyMySQL sends an INSERT ... VALUES run through executemany as a single multi-row statement.
+        cursor.executemany("INSERT INTO requested_words_log (submission_hash) VALUES (%s)", [(h,) for h in new])
+        now = datetime.now()
+        counts = Counter(requests[h] for h in new)
+        cursor.executemany("""
+            INSERT INTO requested_words (word, request_count, status, first_seen, last_updated)
+            VALUES (%s, %s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE request_count = request_count + VALUES(request_count), last_updated = VALUES(last_updated)
+        """, [(word, count, 'pending', now, now) for word, count in counts.items()])
+        db_conn.commit()
+        return len(new), len(known)
+    except Exception:
+        db_conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+# The columns the review list can be sorted by. Every sort also orders by word, which is unique,
+# so a page can continue exactly after the last row of the previous one (keyset pagination).
+REQUESTED_WORDS_SORT_COLUMNS = ('word', 'request_count', 'status', 'first_seen', 'last_updated')
+# The statuses, in the order they are reviewed in (which is also how `sort=status` orders them).
+REQUESTED_WORDS_STATUSES = ('pending', 'approved', 'rejected')
+
+# A dictionary for translations
+STATUS_TRANSLATIONS = {
+    'pending': 'ھەڵواسراو',
+    'approved': 'پەسەندکراو',
+    'rejected': 'ڕەتکرایەوە'
+}
+
 def get_all_requested_words(db_conn: Connection[DictCursor]) -> List[Dict[str, Any]]:
     """
     Fetches and formats the list of all user-suggested words from the database,
     ordered by status and requests count for easy review.
     """
-    # A dictionary for translations
-    status_translations = {
-        'pending': 'ھەڵواسراو',
-        'approved': 'پەسەندکراو',
-        'rejected': 'ڕەتکرایەوە'
-    }
-
     cursor: DictCursor = db_conn.cursor()
     try:
         query = """
@@ -60,18 +106,121 @@ def get_all_requested_words(db_conn: Connection[DictCursor]) -> List[Dict[str, A
             ORDER BY FIELD(status, 'pending', 'approved', 'rejected'), request_count DESC
         """
         cursor.execute(query)
-        review_list = list(cursor.fetchall())
-        
-        for item in review_list:
-            # Convert datetime objects to a JSON-serializable format (ISO string)
-            item['first_seen'] = item['first_seen'].isoformat()
-            item['last_updated'] = item['last_updated'].isoformat()
-            
-            # Add the translated status using the original 'status' value as a key
-            # .get() is used safely in case there's an unexpected status value
-            item['status_kurdish'] = status_translations.get(item['status'], item['status'])
-            
-        return review_list
+        return [_format_requested_word(item) for item in cursor.fetchall()]
     finally:
         cursor.close()
-        
\ No newline at end of file
+
+def get_requested_words_version(db_conn: Connection[DictCursor]) -> Tuple[Optional[datetime], int]:
+    """
+    Returns the latest `last_updated` and the number of requested words. Both are read from
+    indexes, so callers can cheaply tell whether the list changed before fetching any of it.
+    """
+    cursor: DictCursor = db_conn.cursor()
+    try:
+        cursor.execute("SELECT MAX(last_updated) AS last_updated, COUNT(*) AS total FROM requested_words")
+        row = cursor.fetchone()
+        return row['last_updated'], row['total']
+    finally:
+        cursor.close()
+
+def get_requested_words_page(db_conn: Connection[DictCursor], limit: int, sort: str = 'request_count', descending: bool = True,
+                             status: Optional[str] = None, search: str = '', after: Optional[Tuple[Any, str]] = None) -> Dict[str, Any]:
+    """
+    Fetches one page of the requested words, filtered by status and/or a substring of the word
+    and sorted by one of `REQUESTED_WORDS_SORT_COLUMNS`. `after` is the (sort value, word) of the
+    last row of the previous page. Returns the rows, the number of matching words, and the
+    (sort value, word) to pass as `after` for the next page (None on the last page).
+    Statuses are sorted in review order (`REQUESTED_WORDS_STATUSES`), not alphabetically.
+    """
+    if sort not in REQUESTED_WORDS_SORT_COLUMNS:
+        raise ValueError(f"Cannot sort by '{sort}'")
+
+    conditions: List[str] = []
+    params: List[Any] = []
+    if status:
+        conditions.append("status = %s")
+        params.append(status)
+    search_conditions: List[str] = []
+    search_params: List[Any] = []
+    if search:
+        search_conditions.append("word LIKE %s")
+        search_params.append('%' + search.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%')
+    conditions += search_conditions
+    params += search_params
+    filter_sql = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+    page_conditions, page_params = list(conditions), list(params)
+    direction, comparison = ("DESC", "<") if descending else ("ASC", ">")
+    if after is not None:
+        if sort == 'word':
+            page_conditions.append(f"word {comparison} %s")
+            page_params.append(after[1])
+        else:
+            page_conditions.append(f"({sort} {comparison} %s OR ({sort} = %s AND word {comparison} %s))")
+            page_params.extend((after[0], after[0], after[1]))
+    page_sql = f"WHERE {' AND '.join(page_conditions)}" if page_conditions else ""
+    order_sql = f"ORDER BY word {direction}" if sort == 'word' else f"ORDER BY {sort} {direction}, word {direction}"
+
+    cursor: DictCursor = db_conn.cursor()
+    try:
+        cursor.execute(f"SELECT COUNT(*) AS total FROM requested_words {filter_sql}", params)
+        total = cursor.fetchone()['total']
+        # One extra row tells whether there is a next page.
+        if sort == 'status':
+            rows = _requested_words_by_status(cursor, limit + 1, descending, status, search_conditions, search_params, after)
+        else:
+            cursor.execute(f"""
+                SELECT word, request_count, status, first_seen, last_updated
+                FROM requested_words {page_sql} {order_sql} LIMIT %s
+            """, page_params + [limit + 1])
+            rows = list(cursor.fetchall())
+    finally:
+        cursor.close()
+
+    next_after = (rows[limit - 1][sort], rows[limit - 1]['word']) if len(rows) > limit else None
+    return {
+        "items": [_format_requested_word(item) for item in rows[:limit]],
+        "total": total,
+        "next_after": next_after,
+    }
+
+def _requested_words_by_status(cursor: DictCursor, limit: int, descending: bool, status: Optional[str],
+                               search_conditions: List[str], search_params: List[Any],
+                               after: Optional[Tuple[Any, str]]) -> List[Dict[str, Any]]:
+    """
+    Up to `limit` rows sorted by status in review order, then by word. Each status is read
+    on its own (with the (status, word) index), continuing after `after` in its status.
+    """
+    statuses = [s for s in REQUESTED_WORDS_STATUSES if status is None or s == status]
+    if descending:
+        statuses.reverse()
+    if after is not None:
+        statuses = statuses[statuses.index(after[0]):] if after[0] in statuses else []
+    direction, comparison = ("DESC", "<") if descending else ("ASC", ">")
+
+    rows: List[Dict[str, Any]] = []
+    for page_status in statuses:
+        conditions = ["status = %s"] + search_conditions
+        params = [page_status] + search_params
+        if after is not None and page_status == after[0]:
+            conditions.append(f"word {comparison} %s")
+            params.append(after[1])
+        cursor.execute(f"""
+            SELECT word, request_count, status, first_seen, last_updated
+            FROM requested_words WHERE {' AND '.join(conditions)} ORDER BY word {direction} LIMIT %s
+        """, params + [limit - len(rows)])
+        rows.extend(cursor.fetchall())
+        if len(rows) >= limit:
+            break
+    return rows
+
+def _format_requested_word(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Makes a requested_words row JSON-serializable and adds its translated status."""
+    # Convert datetime objects to a JSON-serializable format (ISO string)
+    item['first_seen'] = item['first_seen'].isoformat()
+    item['last_updated'] = item['last_updated'].isoformat()
+
+    # Add the translated status using the original 'status' value as a key
+    # .get() is used safely in case there's an unexpected status value
+    item['status_kurdish'] = STATUS_TRANSLATIONS.get(item['status'], item['status'])
+    return item
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""
+CKB Bijar Spellchecker - Deletion Index
+This module contains a SymSpell-style deletion-neighbourhood index. Every
+dictionary word is reduced to its deletion variants once at load time, so a
+lookup only has to generate the variants of the misspelled word and verify
+the few candidates that share one of them.
+"""
+
+from __future__ import annotations
+
+import sys
+from typing import Dict, Iterable, Iterator, List, Mapping, Sequence, Set, Tuple
+import Levenshtein
+
+# Only the first N characters of a word are used to build its deletion variants.
+# This keeps the index small; candidates are always verified against the full word.
+DEFAULT_PREFIX_LENGTH = 6
+
+def generate_deletes(word: str, max_distance: int) -> Set[str]:
+    """Returns the word itself and every string reachable by deleting up to `max_distance` characters."""
+    deletes: Set[str] = {word}
+    frontier: Set[str] = {word}
+    for _ in range(max_distance):
+        next_frontier: Set[str] = set()
+        for item in frontier:
+            for i in range(len(item)):
+                variant = item[:i] + item[i + 1:]
+                if variant not in deletes:
+                    deletes.add(variant)
+                    next_frontier.add(variant)
+        if not next_frontier:
+            break
+        frontier = next_frontier
+    return deletes
+
+class DeletionIndex:
+    """
+    Maps the deletion variants of every word prefix to the prefixes that produce them.
+    Words sharing a prefix share its index entries, which keeps memory proportional
+    to the number of distinct prefixes rather than the number of words.
+    """
+    def __init__(self, words: Iterable[str], max_distance: int, prefix_length: int = DEFAULT_PREFIX_LENGTH):
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+
+        words_by_prefix: Dict[str, List[str]] = {}
+        for word in set(words):
+            words_by_prefix.setdefault(word[:prefix_length], []).append(word)
+        self._words_by_prefix: Dict[str, Tuple[str, ...]] = {p: tuple(w) for p, w in words_by_prefix.items()}
+
+        deletes_map: Dict[str, List[str]] = {}
+        for prefix in self._words_by_prefix:
+            for variant in generate_deletes(prefix, max_distance):
+                deletes_map.setdefault(variant, []).append(prefix)
+        self._prefixes_by_delete: Dict[str, Tuple[str, ...]] = {d: tuple(p) for d, p in deletes_map.items()}
+        self._word_count = sum(len(words) for words in self._words_by_prefix.values())
+
+    @classmethod
+    def from_tables(cls, words_by_prefix: Mapping[str, Sequence[str]], prefixes_by_delete: Mapping[str, Sequence[str]],
+                    max_distance: int, prefix_length: int, word_count: int) -> DeletionIndex:
+        """Wraps already built tables (e.g. memory-mapped from a snapshot) without rebuilding them."""
+        index = cls.__new__(cls)
+        index.max_distance = max_distance
+        index.prefix_length = prefix_length
+        index._words_by_prefix = words_by_prefix
+        index._prefixes_by_delete = prefixes_by_delete
+        index._word_count = word_count
+        return index
+
+    def with_changes(self, added: Iterable[str], removed: Iterable[str]) -> DeletionIndex:
+        """
+        Returns a copy of the index with words added and removed, leaving this index untouched
+        (it may still be in use). Only the entries of the affected prefixes are recomputed.
+        """
+        words_by_prefix: Dict[str, Tuple[str, ...]] = dict(self._words_by_prefix)
+        prefixes_by_delete: Dict[str, Tuple[str, ...]] = dict(self._prefixes_by_delete)
+
+        changes_by_prefix: Dict[str, Tuple[Set[str], Set[str]]] = {}
+        for word in added:
+            changes_by_prefix.setdefault(word[:self.prefix_length], (set(), set()))[0].add(word)
+        for word in removed:
+            changes_by_prefix.setdefault(word[:self.prefix_length], (set(), set()))[1].add(word)
+
+        for prefix, (added_words, removed_words) in changes_by_prefix.items():
+            old_words = words_by_prefix.get(prefix, ())
+            new_words = (set(old_words) - removed_words) | added_words
+            if new_words:
+                words_by_prefix[prefix] = tuple(new_words)
+            else:
+                words_by_prefix.pop(prefix, None)
+
+            if new_words and not old_words:
+                for variant in generate_deletes(prefix, self.max_distance):
+                    prefixes_by_delete[variant] = prefixes_by_delete.get(variant, ()) + (prefix,)
+            elif old_words and not new_words:
+                for variant in generate_deletes(prefix, self.max_distance):
+                    remaining = tuple(p for p in prefixes_by_delete.get(variant, ()) if p != prefix)
+                    if remaining:
+                        prefixes_by_delete[variant] = remaining
+                    else:
+                        prefixes_by_delete.pop(variant, None)
+
+        return DeletionIndex.from_tables(words_by_prefix, prefixes_by_delete, self.max_distance, self.prefix_length,
+                                         sum(len(words) for words in words_by_prefix.values()))
+
+    def tables(self) -> Tuple[Mapping[str, Sequence[str]], Mapping[str, Sequence[str]]]:
+        """Returns the (prefix -> words) and (deletion variant -> prefixes) tables."""
+        return self._words_by_prefix, self._prefixes_by_delete
+
+    def __len__(self) -> int:
+        """Returns the number of distinct words in the index."""
+        return self._word_count
+
+    def __iter__(self) -> Iterator[str]:
+        for words in self._words_by_prefix.values():
+            yield from words
+
+    def approx_size_bytes(self) -> int:
+        """Estimates the memory held by the index (containers and keys; words are shared)."""
+        if not isinstance(self._words_by_prefix, dict):
+            # Tables that live outside the Python heap report their own size.
+            return getattr(self._words_by_prefix, 'nbytes', 0) + getattr(self._prefixes_by_delete, 'nbytes', 0)
+        size = sys.getsizeof(self._words_by_prefix) + sys.getsizeof(self._prefixes_by_delete)
+        size += sum(sys.getsizeof(p) + sys.getsizeof(w) for p, w in self._words_by_prefix.items())
+        size += sum(sys.getsizeof(d) + sys.getsizeof(p) for d, p in self._prefixes_by_delete.items())
+        return size
+
+    def lookup(self, word: str, max_distance: int) -> Iterator[Tuple[str, int]]:
+        """Yields every indexed word within `max_distance` of `word`, with its exact distance."""
+        if max_distance > self.max_distance:
+            raise ValueError(f"Index was built for a maximum distance of {self.max_distance}, got {max_distance}.")
+
+        seen_prefixes: Set[str] = set()
+        for variant in generate_deletes(word[:self.prefix_length], max_distance):
+            for prefix in self._prefixes_by_delete.get(variant, ()):
+                # The index holds variants up to the build distance; skip the ones that
+                # needed more deletions on the dictionary side than this lookup allows.
+                if prefix in seen_prefixes or len(prefix) - len(variant) > max_distance:
+                    continue
+                seen_prefixes.add(prefix)
+
+                for candidate in self._words_by_prefix[prefix]:
+                    if abs(len(word) - len(candidate)) > max_distance:
+                        continue
+                    dist = Levenshtein.distance(word, candidate, score_cutoff=max_distance)
+                    if dist <= max_distance:
+                        yield candidate, dist
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""
+CKB Bijar Spellchecker - Offline Dump Checking
+Streams the pages of a MediaWiki XML dump (plain or .bz2) and checks them with the
+loaded linguistic data, in forked worker processes that share it with the parent.
+Used by `python run.py check_dump`.
+"""
+from __future__ import annotations
+
+import bz2
+import functools
+import multiprocessing
+import threading
+import xml.etree.ElementTree as ET
+from collections import Counter
+from typing import Container, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from . import spellchecker_logic as logic
+
+class PageResult(NamedTuple):
+    """The problematic words found on one page (word -> occurrences)."""
+    title: str
+    misspelled: Counter
+    bad: Counter
+
+def open_dump(path: str):
+    """Opens a dump for streaming, decompressing .bz2 files on the fly."""
+    return bz2.open(path, 'rb') if path.endswith('.bz2') else open(path, 'rb')
+
+def iter_dump_pages(path: str, namespaces: Optional[Container[int]] = (0,)) -> Iterator[Tuple[str, str]]:
+    """
+    Yields the (title, wikitext) of every page of the dump in `namespaces` (all if None),
+    skipping redirects. Pages are discarded once read, so memory use stays flat.
+    """
+    with open_dump(path) as f:
+        events = ET.iterparse(f, events=('start', 'end'))
+        _, root = next(events)
+        for event, elem in events:
+            if event != 'end' or _local_name(elem.tag) != 'page':
+                continue
+            title = ns = text = None
+            is_redirect = False
+            for child in elem.iter():
+                name = _local_name(child.tag)
+                if name == 'title':
+                    title = child.text
+                elif name == 'ns':
+                    ns = int(child.text or 0)
+                elif name == 'redirect':
+                    is_redirect = True
+                elif name == 'text':
+                    text = child.text
+            # Drop the page (and the references the root keeps to it) before moving on.
+            root.clear()
+            if is_redirect or not text or (namespaces is not None and ns not in namespaces):
+                continue
+            yield title or '', text
+
+def _local_name(tag: str) -> str:
+    """The tag without the export schema's namespace, which changes with every dump version."""
+    return tag.rsplit('}', 1)[-1]
+
+def check_page(title: str, text: str, mode: str = 'wikitext') -> PageResult:
+    """Counts the misspelled and bad words of one page (its markup skipped, unless `mode` is 'text')."""
+    result = PageResult(title, Counter(), Counter())
+    for problem in logic.iter_problematic_words(text, mode):
+        (result.misspelled if problem['type'] == 'misspelled' else result.bad)[problem['word']] += 1
+    return result
+
+def _check_batch(pages: List[Tuple[str, str]], mode: str) -> List[PageResult]:
+    return [check_page(title, text, mode) for title, text in pages]
+
+def _batched(pages: Iterable[Tuple[str, str]], size: int, slots: threading.Semaphore) -> Iterator[List[Tuple[str, str]]]:
+    """Groups pages into batches, waiting for a free slot before reading the next one from the dump."""
+    batch: List[Tuple[str, str]] = []
+    for page in pages:
+        batch.append(page)
+        if len(batch) == size:
+            slots.acquire()
+            yield batch
+            batch = []
+    if batch:
+        slots.acquire()
+        yield batch
+
+def check_pages_in_parallel(pages: Iterable[Tuple[str, str]], workers: int, batch_size: int = 32,
+                            mode: str = 'wikitext') -> Iterator[PageResult]:
+    """
+    Yields the result of every page (in completion order). The pages are checked in forked
+    worker processes, which share the parent's loaded `linguistic_data` instead of a copy.
+    """
+    if workers > 1 and 'fork' in multiprocessing.get_all_start_methods():
+        # A pool reads its input as fast as it can; only let a few batches per worker be in flight
+        # so that a multi-gigabyte dump never ends up queued in memory.
+        slots = threading.Semaphore(workers * 4)
+        with multiprocessing.get_context('fork').Pool(workers) as pool:
+            for results in pool.imap_unordered(functools.partial(_check_batch, mode=mode), _batched(pages, batch_size, slots)):
+                slots.release()
+                yield from results
+    else:
+        if workers > 1:
+            print("Note: Worker processes need 'fork' (not available here); checking in a single process.")
+        for title, text in pages:
+            yield check_page(title, text, mode)
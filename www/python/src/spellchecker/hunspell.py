@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+"""
+CKB Bijar Spellchecker - Hunspell Export
+Writes the linguistic data as a Hunspell dictionary (.dic + .aff) that keeps the rules,
+instead of every word they produce:
+  - each stem is listed once, flagged with its sound type. The flag's suffix rules are the
+    suffixes that apply to the sound type; the ones starting with 'ا' or 'ە' have the
+    condition that the stem doesn't end in 'ە';
+  - each verb is listed by the few forms its conjugations are built on. Its prefixes are
+    prefix rules, and the pronoun endings of each tense are suffix rules. The forms that
+    are not words themselves (e.g. 'دەگر') have the NEEDAFFIX flag;
+  - particles are listed as they are.
+Hunspell checks one word at a time, so the multi-word verb phrases (e.g. 'ھەڵم گرت') can't
+be listed as phrases: each of their words is accepted on its own instead.
+
+The verb rules follow `Verb.generate_all_conjugations`. Expanding the dictionary (e.g. with
+Hunspell's `unmunch`) gives back the words of `generate_all_word_sets`, with the phrases
+split into words.
+"""
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, Hashable, List, NamedTuple, Optional, Set, Tuple
+
+from .constants import GROUP_1_PRONOUNS, GROUP_2_PRONOUNS, GROUP_3_PRONOUNS
+from .tokenizer import KURDISH_LETTERS, LETTER_VARIANTS, ZWNJ
+from .verb_engine import INVALID_PRONOUN_PAIRS, Verb
+
+# A rule: (what is stripped from the word, what is added, the condition on the word), as in the .aff file.
+Rule = Tuple[str, str, str]
+
+NEEDAFFIX_FLAG = 1
+
+# The subject endings of the past tenses in the phrases of transitive verbs (e.g. 'ھەڵم گرتیت'):
+# those that go with at least one of the pronouns after the prefix.
+_PHRASE_SUBJECT_ENDINGS = sorted(
+    g2p for g2p in GROUP_2_PRONOUNS if any((g1p, g2p) not in INVALID_PRONOUN_PAIRS for g1p in GROUP_1_PRONOUNS))
+
+class HunspellDictionary(NamedTuple):
+    """The lines of the .aff and .dic files."""
+    aff_lines: List[str]
+    dic_lines: List[str]
+    affix_classes: int
+    affix_rules: int
+
+class _AffixClasses:
+    """The affix classes of the dictionary, numbered (FLAG num) in the order they are first needed."""
+    def __init__(self):
+        self._flags: Dict[Hashable, Optional[int]] = {}
+        # (flag, 'PFX' or 'SFX', comment, rules), in flag order.
+        self.classes: List[Tuple[int, str, str, List[Rule]]] = []
+
+    def flag(self, key: Hashable, kind: str, comment: str, make_rules: Callable[[], List[Rule]]) -> Optional[int]:
+        """The flag of the class `key`, created on first use. None if the class has no rules."""
+        if key in self._flags:
+            return self._flags[key]
+        rules = make_rules()
+        flag = None
+        if rules:
+            flag = NEEDAFFIX_FLAG + 1 + len(self.classes)
+            self.classes.append((flag, kind, comment, rules))
+        self._flags[key] = flag
+        return flag
+
+    def aff_lines(self) -> List[str]:
+        lines: List[str] = []
+        for flag, kind, comment, rules in self.classes:
+            lines.append('')
+            lines.append(f"# {comment}")
+            lines.append(f"{kind} {flag} N {len(rules)}")
+            lines.extend(f"{kind} {flag} {strip or '0'} {add} {condition}" for strip, add, condition in rules)
+        return lines
+
+def build_hunspell_dictionary(data: Dict[str, Any]) -> HunspellDictionary:
+    """Builds the .aff and .dic files for the linguistic data."""
+    classes = _AffixClasses()
+    words: Dict[str, Set[int]] = {}  # word -> its flags
+    bases: Dict[str, Set[int]] = {}  # forms that are only used to build words -> their flags
+
+    suffixes_list = data.get('suffixes_list', [])
+    for stem, info in data.get('stems_map', {}).items():
+        sound_type = info['sound_type']
+        _add(words, stem, classes.flag(
+            ('stem', sound_type), 'SFX', f"The suffixes of the stems that sound '{sound_type}'.",
+            lambda: _stem_suffix_rules(suffixes_list, sound_type)))
+
+    for particle in data.get('particles_set', set()):
+        _add(words, particle)
+
+    for verb in data.get('verbs', []):
+        _add_verb(verb, classes, words, bases)
+
+    dic_lines: List[str] = []
+    for word in sorted(words.keys() | bases.keys()):
+        if word in words:
+            # A base that is also a word can just take the base's affixes too.
+            flags = words[word] | bases.get(word, set())
+        else:
+            flags = bases[word] | {NEEDAFFIX_FLAG}
+        dic_lines.append(f"{word}/{','.join(map(str, sorted(flags)))}" if flags else word)
+    dic_lines.insert(0, str(len(dic_lines)))
+
+    aff_lines = [
+        "# Central Kurdish (Sorani) dictionary exported by the CKB Bijar Spellchecker.",
+        "SET UTF-8",
+        "FLAG num",
+        f"NEEDAFFIX {NEEDAFFIX_FLAG}",
+        f"TRY {KURDISH_LETTERS}",
+        "",
+        "# The Arabic letters and the legacy 'ه' + ZWNJ that are commonly typed for the Kurdish ones.",
+        f"ICONV {len(LETTER_VARIANTS) + 1}",
+    ]
+    aff_lines.extend(f"ICONV {variant} {letter}" for variant, letter in LETTER_VARIANTS.items())
+    aff_lines.append(f"ICONV ه{ZWNJ} ە")
+    aff_lines.extend(classes.aff_lines())
+    return HunspellDictionary(aff_lines, dic_lines, len(classes.classes), sum(len(rules) for *_, rules in classes.classes))
+
+def write_hunspell_dictionary(data: Dict[str, Any], dic_path: str, aff_path: str) -> Dict[str, int]:
+    """Writes the .dic and .aff files. Returns how many entries, affix classes and rules they have."""
+    dictionary = build_hunspell_dictionary(data)
+    for path, lines in ((aff_path, dictionary.aff_lines), (dic_path, dictionary.dic_lines)):
+        with open(path, "w", encoding="utf-8") as f:
+            for line in lines:
+                f.write(line + "\n")
+    return {
+        'entries': len(dictionary.dic_lines) - 1,
+        'affix_classes': dictionary.affix_classes,
+        'affix_rules': dictionary.affix_rules,
+    }
+
+def _add(entries: Dict[str, Set[int]], word: str, *flags: Optional[int]):
+    entry = entries.setdefault(word, set())
+    entry.update(flag for flag in flags if flag is not None)
+
+def _stem_suffix_rules(suffixes_list: List[Dict[str, Any]], sound_type: str) -> List[Rule]:
+    # The same rules as data_loader's _Derivations, with the 'ە' rule as a condition on the stem.
+    suffixes = {s.get('suffix', '') for s in suffixes_list if sound_type in s.get('applies_to_sound', '')}
+    return [('', suffix, '[^ە]' if suffix.startswith(('ا', 'ە')) else '.') for suffix in sorted(suffixes) if suffix]
+
+def _present_rules() -> List[Rule]:
+    # Appended to 'دە' + the present stem; see Verb.present_forms.
+    rules = [('', p, '.') for p in sorted(GROUP_3_PRONOUNS) if p not in ('ات', 'ێت')]
+    rules += [('ە', 'ات', 'ە'), ('ۆ', 'وات', 'ۆ'), ('', 'ت', 'ێ'), ('', 'ێت', '[^ەۆێ]')]
+    return rules
+
+def _add_verb(verb: Verb, classes: _AffixClasses, words: Dict[str, Set[int]], bases: Dict[str, Set[int]]):
+    """Lists the forms of a verb with the flags that build the rest of its conjugations."""
+    transitivity = 'transitive' if verb.is_transitive else 'intransitive'
+    past_pronouns = sorted(p for p in verb.past_pronouns if p)
+    prefix_flags = [
+        classes.flag(('prefix', prefix), 'PFX', f"The verb prefix '{prefix}'.", lambda: [('', prefix, '.')])
+        for prefix in sorted(verb.valid_prefixes)
+    ]
+    past_flag = classes.flag(
+        ('past', verb.is_transitive), 'SFX', f"The pronouns of the past tenses of {transitivity} verbs.",
+        lambda: [('', p, '.') for p in past_pronouns])
+    perfect_flag = classes.flag(
+        ('perfect', verb.is_transitive), 'SFX', f"The pronouns of the perfect tense of {transitivity} verbs (before the final 'ە').",
+        lambda: [('ە', p + 'ە', 'ە') for p in past_pronouns])
+    present_flag = classes.flag(('present',), 'SFX', "The endings of the present tense, after 'دە' + the present stem.", _present_rules)
+
+    past_far_base = verb.past_stem + 'بوو'
+    _add(words, verb.infinitive, *prefix_flags)
+    _add(words, verb.past_stem, past_flag, *prefix_flags)
+    _add(words, past_far_base, past_flag, *prefix_flags)
+    _add(words, verb.perfect_base_stem + 'ە', perfect_flag, *prefix_flags)
+    _add(bases, 'دە' + verb.present_stem, present_flag)
+    if not verb.is_transitive:
+        return
+
+    continuous_flag = classes.flag(
+        ('past_continuous',), 'PFX', "'دە' + the pronouns of the past continuous of transitive verbs.",
+        lambda: [('', 'دە' + p, '.') for p in sorted(GROUP_1_PRONOUNS)])
+    _add(words, verb.past_stem, continuous_flag)
+    _add(words, 'دە' + verb.past_stem, *prefix_flags)
+    if not verb.valid_prefixes:
+        return
+
+    # The words of the phrases: the prefix with a pronoun, then the verb (with the subject's ending).
+    subject_flag = classes.flag(
+        ('phrase_subject',), 'SFX', "The subject endings of the past tenses in the phrases of transitive verbs.",
+        lambda: [('', p, '.') for p in _PHRASE_SUBJECT_ENDINGS if p])
+    for form in (verb.past_stem, 'دە' + verb.past_stem, past_far_base):
+        _add(words, form, subject_flag)
+    pronoun_flag = classes.flag(
+        ('phrase_pronoun',), 'SFX', "The pronouns after a verb prefix, as the first word of a phrase.",
+        lambda: [('', also + p, '.') for also in ('', 'یش') for p in sorted(GROUP_1_PRONOUNS)])
+    for prefix in verb.valid_prefixes:
+        _add(bases, prefix, pronoun_flag)
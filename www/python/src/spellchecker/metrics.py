@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""
+CKB Bijar Spellchecker - Runtime Metrics
+Counters and histograms updated while requests are served, rendered by /api/metrics
+in the Prometheus text format (https://prometheus.io/docs/instrumenting/exposition_formats/).
+Recording a value only takes a lock and an addition, so they can be used on the hot path.
+
+Every worker process keeps its own metrics: a scrape sees the worker that answered it
+(`bijar_process_start_time_seconds` tells the workers and their restarts apart).
+"""
+from __future__ import annotations
+
+import bisect
+import threading
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple
+
+# (labels, value) samples of a metric family collected at scrape time.
+Samples = Iterable[Tuple[Dict[str, str], float]]
+
+# Request latencies range from well under a millisecond (cached suggestions) to seconds (long texts).
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Every Counter and Histogram, in the order they are rendered.
+_registry: List = []
+
+class Counter:
+    """A monotonically increasing value per combination of label values."""
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def inc(self, amount: float = 1, labels: Tuple[str, ...] = ()):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> Iterator[str]:
+        yield from _header(self.name, 'counter', self.documentation)
+        with self._lock:
+            values = sorted(self._values.items())
+        for labels, value in values:
+            yield f"{self.name}{_format_labels(dict(zip(self.label_names, labels)))} {_format_value(value)}"
+
+class Histogram:
+    """Counts observations (e.g. durations in seconds) in cumulative buckets, per combination of label values."""
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [count per bucket (the last one is +Inf), sum of the observations]
+        self._values: Dict[Tuple[str, ...], List] = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def observe(self, value: float, labels: Tuple[str, ...] = ()):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                entry = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][index] += 1
+            entry[1] += value
+
+    def render(self) -> Iterator[str]:
+        yield from _header(self.name, 'histogram', self.documentation)
+        with self._lock:
+            values = sorted((labels, (list(counts), total)) for labels, (counts, total) in self._values.items())
+        for labels, (counts, total) in values:
+            label_dict = dict(zip(self.label_names, labels))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                yield f"{self.name}_bucket{_format_labels({**label_dict, 'le': le})} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(label_dict)} {_format_value(total)}"
+            yield f"{self.name}_count{_format_labels(label_dict)} {cumulative}"
+
+def render_family(name: str, metric_type: str, documentation: str, samples: Samples) -> Iterator[str]:
+    """Renders a metric family whose values are collected at scrape time (e.g. cache sizes)."""
+    yield from _header(name, metric_type, documentation)
+    for labels, value in samples:
+        yield f"{name}{_format_labels(labels)} {_format_value(value)}"
+
+def render(collected: Iterable[Iterator[str]] = ()) -> str:
+    """Renders every recorded metric, followed by the families collected for this scrape."""
+    lines: List[str] = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    for family in collected:
+        lines.extend(family)
+    return '\n'.join(lines) + '\n'
+
+def _header(name: str, metric_type: str, documentation: str) -> Iterator[str]:
+    yield f"# HELP {name} {documentation}"
+    yield f"# TYPE {name} {metric_type}"
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(str(value))}"' for key, value in labels.items()) + '}'
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _format_value(value: float) -> str:
+    return str(value) if isinstance(value, int) else repr(float(value))
+
+# --- Metrics recorded by the webservice ---
+http_requests = Counter('bijar_http_requests_total', "HTTP requests answered, by endpoint, method and status.",
+                        ('endpoint', 'method', 'status'))
+http_request_duration = Histogram('bijar_http_request_duration_seconds',
+                                  "Time to build the response, by endpoint (streamed bodies excluded).", ('endpoint',))
+check_text_tokens = Counter('bijar_check_text_tokens_total', "Words tokenized by check_text_block.")
+check_text_problems = Counter('bijar_check_text_problems_total', "Problematic words found by check_text_block, by type.", ('type',))
+suggestion_searches = Histogram('bijar_suggestion_search_duration_seconds',
+                                "Duration of the suggestion searches run on cache misses, by distance.", ('distance',))
+suggestion_hypothesis_seconds = Counter('bijar_suggestion_hypothesis_seconds_total',
+                                        "Time spent in each step of the suggestion search.", ('hypothesis',))
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""
+CKB Bijar Spellchecker - Precomputed Suggestions
+This module reads and writes the table produced by `run.py precompute_suggestions`:
+the suggestions of the most frequent misspellings, computed offline for every
+distance at the maximum limit. Smaller limits are served by slicing, since the
+ranking does not depend on the limit. The table is only used when it was built
+from the same dictionary data (`data_version`) as the one currently loaded.
+"""
+from __future__ import annotations
+
+import json
+import multiprocessing
+import os
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from .constants import MAX_LEVENSHTEIN_DISTANCE, MAX_SUGGESTION_LIMIT
+from .suggestion_engine import SuggestionFinder, SuggestionIndex
+
+PRECOMPUTED_FORMAT_VERSION = 1
+
+# The index forked worker processes compute with; set by the parent before the pool starts.
+_worker_index: Optional[SuggestionIndex] = None
+
+class PrecomputedSuggestions:
+    """A read-only table of word -> suggestions per distance (index 0 is distance 1)."""
+    def __init__(self, table: Dict[str, List[List[str]]], max_limit: int, info: Dict[str, Any]):
+        self._table = table
+        self.max_limit = max_limit
+        self.info = info
+        self.hits = self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+    def get(self, word: str, limit: int, max_distance: int) -> Optional[List[str]]:
+        """Returns the precomputed suggestions, or None if the word (or this limit/distance) isn't covered."""
+        per_distance = self._table.get(word)
+        if per_distance is None or limit > self.max_limit or max_distance > len(per_distance):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return per_distance[max_distance - 1][:limit]
+
+    def items(self) -> Iterator[Tuple[str, List[List[str]]]]:
+        return iter(self._table.items())
+
+    def without(self, words: Set[str], data_version: str) -> PrecomputedSuggestions:
+        """Returns a copy of the table without the given words, for data that changed only in ways that don't affect the rest."""
+        table = {word: per_distance for word, per_distance in self._table.items() if word not in words}
+        return PrecomputedSuggestions(table, self.max_limit, dict(self.info, data_version=data_version))
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "name": "precomputed_suggestions",
+            "entries": len(self._table),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            "created_at": self.info.get('created_at'),
+        }
+
+def compute_all_distances(word: str, index: SuggestionIndex) -> List[List[str]]:
+    """Computes the suggestions of a word at the maximum limit, for every distance."""
+    return [SuggestionFinder(word, MAX_SUGGESTION_LIMIT, distance, index).get_suggestions()
+            for distance in range(1, MAX_LEVENSHTEIN_DISTANCE + 1)]
+
+def _compute_in_worker(word: str) -> Tuple[str, List[List[str]]]:
+    return word, compute_all_distances(word, _worker_index)
+
+def compute_in_parallel(words: List[str], index: SuggestionIndex, workers: int) -> Iterator[Tuple[str, List[List[str]]]]:
+    """
+    Yields (word, suggestions per distance) as they are computed. The work is fanned out to
+    forked worker processes, which share the parent's loaded index instead of receiving a copy.
+    """
+    global _worker_index
+    if workers > 1 and 'fork' in multiprocessing.get_all_start_methods():
+        _worker_index = index
+        try:
+            with multiprocessing.get_context('fork').Pool(workers) as pool:
+                yield from pool.imap_unordered(_compute_in_worker, words, chunksize=16)
+        finally:
+            _worker_index = None
+    else:
+        if workers > 1:
+            print("Note: Worker processes need 'fork' (not available here); computing in a single process.")
+        for word in words:
+            yield word, compute_all_distances(word, index)
+
+def write_precomputed_suggestions(path: str, table: Dict[str, List[List[str]]], max_limit: int,
+                                  data_version: str, source: str):
+    """Writes the table atomically, so a running webservice never reads a half-written file."""
+    document = {
+        'format_version': PRECOMPUTED_FORMAT_VERSION,
+        'data_version': data_version,
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'source': source,
+        'max_limit': max_limit,
+        'suggestions': table,
+    }
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(document, f, ensure_ascii=False, separators=(',', ':'))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+def load_precomputed_suggestions(path: str, data_version: str) -> Optional[PrecomputedSuggestions]:
+    """Loads the table if it exists and matches the loaded data. Returns None otherwise."""
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            document = json.load(f)
+        if document.get('format_version') != PRECOMPUTED_FORMAT_VERSION:
+            print(f"WARNING: Ignoring precomputed suggestions '{path}' (unsupported format).")
+            return None
+        if document.get('data_version') != data_version:
+            print(f"WARNING: Ignoring precomputed suggestions '{path}': they were built from different data. "
+                  "Re-run 'python run.py precompute_suggestions'.")
+            return None
+        info = {k: v for k, v in document.items() if k != 'suggestions'}
+        precomputed = PrecomputedSuggestions(document['suggestions'], document['max_limit'], info)
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        print(f"WARNING: Could not load precomputed suggestions '{path}' ({e}).")
+        return None
+    print(f"✅ {len(precomputed):,} precomputed suggestion entries loaded (built {info.get('created_at')}).")
+    return precomputed
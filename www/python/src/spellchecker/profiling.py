@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+CKB Bijar Spellchecker - Per-Request Profiling
+While a request is profiled (`?profile=1`, see PROFILE_TOKEN), the suggestion search and the
+text check record how long each of their phases took and how many candidates or words it
+handled. The routes send this back in a Server-Timing header
+(https://www.w3.org/TR/server-timing/), which browsers show in their network panel.
+With PROFILE_DUMP_DIR set, the request also runs under cProfile and its statistics are
+written to a .pstats file (open it with `python -m pstats` or snakeviz).
+
+Requests that are not profiled only pay for one context variable lookup per phase group.
+"""
+from __future__ import annotations
+
+import cProfile
+import itertools
+import os
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+class RequestProfile:
+    """The phases of one request: their total duration in seconds and the number of items they handled."""
+    def __init__(self):
+        # phase -> [seconds, items, unit of the items]; in the order the phases first ran.
+        self.phases: Dict[str, List] = {}
+        self.total_seconds: Optional[float] = None
+        self.dump_path: Optional[str] = None
+
+    def record(self, phase: str, seconds: float, items: Optional[int] = None, unit: str = ''):
+        """Adds to a phase (phases that run several times, e.g. once per word of a batch, are summed)."""
+        entry = self.phases.get(phase)
+        if entry is None:
+            entry = self.phases[phase] = [0.0, None, unit]
+        entry[0] += seconds
+        if items is not None:
+            entry[1] = (entry[1] or 0) + items
+
+    def server_timing(self) -> str:
+        """The phases as a Server-Timing header value, e.g. 'simple_word;dur=0.42;desc="37 candidates"'."""
+        parts = []
+        for phase, (seconds, items, unit) in self.phases.items():
+            part = f"{phase};dur={seconds * 1000:.3f}"
+            if items is not None:
+                part += f';desc="{items} {unit}"'
+            parts.append(part)
+        if self.total_seconds is not None:
+            parts.append(f"total;dur={self.total_seconds * 1000:.3f}")
+        return ', '.join(parts)
+
+_current_profile: ContextVar[Optional[RequestProfile]] = ContextVar('request_profile', default=None)
+
+# Numbers the dumps of this process, so that requests within the same second don't overwrite each other.
+_dump_counter = itertools.count(1)
+
+def current_profile() -> Optional[RequestProfile]:
+    """The profile of the request being handled, or None if it isn't profiled."""
+    return _current_profile.get()
+
+@contextmanager
+def profile_request(name: str, dump_dir: str = '') -> Iterator[RequestProfile]:
+    """
+    Profiles the code run in the block. With a `dump_dir`, it also runs under cProfile and
+    the statistics are written to '<dump_dir>/<time>-<name>-<pid>-<n>.pstats'.
+    """
+    profile = RequestProfile()
+    token = _current_profile.set(profile)
+    profiler = cProfile.Profile() if dump_dir else None
+    start_time = time.perf_counter()
+    try:
+        if profiler is not None:
+            profiler.enable()
+        try:
+            yield profile
+        finally:
+            if profiler is not None:
+                profiler.disable()
+    finally:
+        profile.total_seconds = time.perf_counter() - start_time
+        _current_profile.reset(token)
+
+    if profiler is not None:
+        safe_name = re.sub(r'[^\w.-]', '_', name)
+        path = os.path.join(dump_dir, f"{datetime.now():%Y%m%d-%H%M%S}-{safe_name}-{os.getpid()}-{next(_dump_counter)}.pstats")
+        try:
+            os.makedirs(dump_dir, exist_ok=True)
+            profiler.dump_stats(path)
+            profile.dump_path = path
+        except OSError as e:
+            print(f"WARNING: Could not write the profile of '{name}' to '{path}': {e}")
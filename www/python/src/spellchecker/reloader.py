@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""
+CKB Bijar Spellchecker - Background Reloads
+This module runs `spellchecker_logic.reload_all_data` off the request path, either
+on demand (POST /api/admin/reload) or periodically (RELOAD_INTERVAL). Requests keep
+being served from the current data until the new data is swapped in.
+
+Every worker process holds its own copy of the data and reloads it separately: with
+several workers, use the periodic reload, which each of them runs on its own.
+Each check runs CHECKSUM TABLE on every table, which reads all of their rows (InnoDB keeps
+no live checksums). With N workers, the database does N such scans per interval, so keep
+RELOAD_INTERVAL long (an hour or more) unless the tables are small.
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from contextlib import AbstractContextManager
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+from . import spellchecker_logic as logic
+from .database import get_db_connection
+
+class BackgroundReloader:
+    """Runs at most one reload at a time in a background thread and remembers how the last one went."""
+    def __init__(self, connect: Callable[[], AbstractContextManager] = get_db_connection):
+        self._connect = connect
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._periodic_pid: Optional[int] = None
+        self.last_result: Optional[Dict[str, Any]] = None
+        self.last_error: Optional[str] = None
+        self.last_started_at: Optional[datetime] = None
+        self.last_finished_at: Optional[datetime] = None
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def trigger(self) -> bool:
+        """Starts a reload in the background. Returns False if one is already running."""
+        with self._lock:
+            if self.is_running():
+                return False
+            self._thread = threading.Thread(target=self._run, name='linguistic-data-reload', daemon=True)
+            self._thread.start()
+            return True
+
+    def wait(self, timeout: Optional[float] = None):
+        """Waits for the running reload (if any) to finish."""
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def start_periodic(self, interval_seconds: int):
+        """
+        Starts checking for changes every `interval_seconds` in this process. Safe to call on
+        every request: threads don't survive a fork, so each worker starts its own on first use.
+        """
+        with self._lock:
+            if self._periodic_pid == os.getpid():
+                return
+            self._periodic_pid = os.getpid()
+        threading.Thread(target=self._run_periodically, args=(interval_seconds,), name='linguistic-data-reload-timer',
+                         daemon=True).start()
+
+    def _run_periodically(self, interval_seconds: int):
+        while True:
+            time.sleep(interval_seconds)
+            # Only tables whose checksum changed are fetched, but computing the checksums reads
+            # every row of every table, and every worker runs this check on its own timer.
+            self._run()
+
+    def _run(self):
+        self.last_started_at = datetime.now()
+        try:
+            with self._connect() as conn:
+                self.last_result = logic.reload_all_data(conn)
+            self.last_error = None
+        except Exception as e:  # Keep serving the current data (and keep the timer alive) whatever went wrong.
+            self.last_error = f"{type(e).__name__}: {e}"
+            print(f"WARNING: Reloading the linguistic data failed ({self.last_error}). Still serving the previous data.")
+        finally:
+            self.last_finished_at = datetime.now()
+
+    def status(self) -> Dict[str, Any]:
+        """Returns whether a reload is running and the outcome of the last one."""
+        return {
+            "running": self.is_running(),
+            "data_version": logic.linguistic_data.get('data_version'),
+            "last_started_at": self.last_started_at.isoformat(timespec='seconds') if self.last_started_at else None,
+            "last_finished_at": self.last_finished_at.isoformat(timespec='seconds') if self.last_finished_at else None,
+            "last_result": self.last_result,
+            "last_error": self.last_error,
+        }
+
+# The reloader of this process, shared by the admin endpoint and the periodic reload.
+reloader = BackgroundReloader()
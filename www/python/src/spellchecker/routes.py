@@ -4,19 +4,30 @@ CKB Bijar Spellchecker - API Routes
 This file defines all the API endpoints for the Flask application using a Blueprint.
 """
 
-from flask import Blueprint, jsonify, request, render_template
-from typing import Any, Dict, List
+import base64
+import functools
+import hashlib
+import hmac
+import json
+import os
+import time
+from datetime import datetime, timezone
+import psutil
+from flask import Blueprint, Response, g, jsonify, make_response, request, render_template
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
 from . import spellchecker_logic as logic
-from . import database_manager
+from . import database, database_manager, metrics, profiling
 from . import __version__
 from .database import get_db_connection
-
-# --- SERVER-SIDE VALIDATION CONSTANTS ---
-MAX_SUGGESTION_LIMIT = 10
-MAX_LEVENSHTEIN_DISTANCE = 3
-DEFAULT_SUGGESTION_LIMIT = 5
-DEFAULT_LEVENSHTEIN_DISTANCE = 2
+from .reloader import reloader
+from .word_requests import WordRequestQueueError, word_request_queue
+from .config import ADMIN_TOKEN, PROFILE_DUMP_DIR, PROFILE_TOKEN, RELOAD_INTERVAL
+from .constants import (
+    MAX_SUGGESTION_LIMIT, MAX_LEVENSHTEIN_DISTANCE,
+    DEFAULT_SUGGESTION_LIMIT, DEFAULT_LEVENSHTEIN_DISTANCE,
+    MAX_BATCH_SUGGESTION_WORDS, MAX_PARAGRAPHS_PER_REQUEST, MAX_REQUESTED_WORDS_PAGE_SIZE, STREAM_CHUNK_WORDS, TEXT_MODES
+)
 
 # Create a Blueprint
 api_blueprint = Blueprint('api', __name__)
@@ -31,6 +42,48 @@ def inject_nav_links():
     ]
     return dict(nav_links=nav_links, app_version=__version__)
     
+@api_blueprint.before_app_request
+def start_periodic_reload():
+    """Starts the periodic reload in this worker process, if one is configured."""
+    if RELOAD_INTERVAL:
+        reloader.start_periodic(RELOAD_INTERVAL)
+
+@api_blueprint.before_app_request
+def start_request_timer():
+    g.request_start_time = time.perf_counter()
+
+@api_blueprint.after_app_request
+def record_request_metrics(response: Response) -> Response:
+    """Counts the request and records how long it took, per endpoint (see /api/metrics)."""
+    start_time = g.get('request_start_time')
+    endpoint = request.endpoint or 'unmatched'
+    metrics.http_requests.inc(1, (endpoint, request.method, str(response.status_code)))
+    if start_time is not None:
+        metrics.http_request_duration.observe(time.perf_counter() - start_time, (endpoint,))
+    return response
+
+def _profiled(view: Callable) -> Callable:
+    """
+    Lets trusted callers profile a request with `?profile=1` and the PROFILE_TOKEN in the
+    X-Profile-Token header: the response gets a Server-Timing header with the duration of each
+    phase and, with PROFILE_DUMP_DIR set, the name of the written .pstats file in X-Profile-Dump.
+    Streamed responses are checked after the header is sent, so they only report the total.
+    """
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        if not PROFILE_TOKEN or request.args.get('profile') not in ('1', 'true'):
+            return view(*args, **kwargs)
+        if not hmac.compare_digest(request.headers.get('X-Profile-Token', '').encode('utf-8'), PROFILE_TOKEN.encode('utf-8')):
+            return jsonify({"error": "Invalid profile token"}), 403
+
+        with profiling.profile_request(request.endpoint or view.__name__, PROFILE_DUMP_DIR) as profile:
+            response = make_response(view(*args, **kwargs))
+        response.headers['Server-Timing'] = profile.server_timing()
+        if profile.dump_path:
+            response.headers['X-Profile-Dump'] = os.path.basename(profile.dump_path)
+        return response
+    return wrapper
+
 # --- TEMPLATE-RENDERING VIEWS ---
 @api_blueprint.route('/')
 def index():
@@ -46,10 +99,29 @@ def requested_words():
 
 # --- API ENDPOINTS ---
 @api_blueprint.route('/api/check_text_block', methods=['POST'])
+@_profiled
 def check_text_block():
-    """Receives a block of text and returns a list of problematic words."""
-    text = request.get_json().get('text', '')
-    problematic_words: List[Dict[str, Any]] = logic.check_text_block(text)
+    """
+    Receives a block of text and returns a list of problematic words.
+    With `"stream": true` in the body (or `?stream=1`), the words are instead streamed
+    as NDJSON (one JSON object per line) while the text is still being checked.
+    With `"paragraphs"` instead of `"text"`, only paragraphs the server hasn't seen are checked.
+    With `"mode": "wikitext"` (or `?mode=wikitext`), templates, references, link targets, URLs and
+    other markup are skipped; the offsets still refer to the text as sent.
+    """
+    data = request.get_json()
+    mode = data.get('mode') or request.args.get('mode') or 'text'
+    if mode not in TEXT_MODES:
+        return jsonify({"error": f"'mode' must be one of {', '.join(TEXT_MODES)}"}), 400
+    if 'paragraphs' in data:
+        return _check_paragraphs(data['paragraphs'], mode)
+
+    text = data.get('text', '')
+    if data.get('stream') is True or request.args.get('stream') in ('1', 'true'):
+        return Response(_iter_ndjson(logic.iter_problematic_words(text, mode)),
+                        content_type='application/x-ndjson; charset=utf-8')
+
+    problematic_words: List[Dict[str, Any]] = logic.check_text_block(text, mode)
     return jsonify(problematic_words)
 
 # --- Add a new endpoint to provide the live word count ---
@@ -60,25 +132,14 @@ def get_word_counts():
     return jsonify(logic.linguistic_data.get('word_counts', {}))
 
 @api_blueprint.route('/api/get_suggestions', methods=['GET'])
+@_profiled
 def get_suggestions():
     """Provides spelling suggestions for a given word, enforcing server-side limits."""
     word = request.args.get('word')
     if not word:
         return jsonify({"error": "No word provided"}), 400
     
-    # Gracefully handle and validate user input
-    try:
-        # Get user-provided values, falling back to defaults if they are not integers.
-        user_limit = int(request.args.get('limit', DEFAULT_SUGGESTION_LIMIT))
-        user_distance = int(request.args.get('distance', DEFAULT_LEVENSHTEIN_DISTANCE))
-    except (ValueError, TypeError):
-        # If the user provides non-numeric input (e.g., ?limit=abc), use defaults.
-        user_limit = DEFAULT_SUGGESTION_LIMIT
-        user_distance = DEFAULT_LEVENSHTEIN_DISTANCE
-
-    # Clamp the values to the allowed server-side range
-    limit = max(1, min(user_limit, MAX_SUGGESTION_LIMIT))
-    distance = max(1, min(user_distance, MAX_LEVENSHTEIN_DISTANCE))
+    limit, distance = _clamp_suggestion_params(request.args.get('limit'), request.args.get('distance'))
     
     suggestions = logic.get_combined_suggestions(word, limit, distance)
     
@@ -90,6 +151,80 @@ def get_suggestions():
         "distance_used": distance
     })
 
+@api_blueprint.route('/api/get_suggestions_batch', methods=['POST'])
+@_profiled
+def get_suggestions_batch():
+    """
+    Provides spelling suggestions for several words in one request (e.g. every
+    misspelling found by check_text_block), with the same limits as get_suggestions.
+    """
+    data = request.get_json(silent=True) or {}
+    words = data.get('words')
+    if not isinstance(words, list) or not all(isinstance(w, str) for w in words):
+        return jsonify({"error": "'words' must be a list of strings"}), 400
+
+    words = [w for w in words if w]
+    if not words:
+        return jsonify({"error": "No words provided"}), 400
+    if len(set(words)) > MAX_BATCH_SUGGESTION_WORDS:
+        return jsonify({"error": f"Too many words (max {MAX_BATCH_SUGGESTION_WORDS} distinct words per request)"}), 400
+
+    limit, distance = _clamp_suggestion_params(data.get('limit'), data.get('distance'))
+    suggestions = logic.get_batch_suggestions(words, limit, distance)
+
+    return jsonify({
+        "suggestions": suggestions,
+        "limit_used": limit,
+        "distance_used": distance
+    })
+
+@api_blueprint.route('/api/cache_stats', methods=['GET'])
+def get_cache_stats():
+    """Returns the size and cumulative hit/miss/eviction counters of the in-memory caches."""
+    return jsonify(logic.get_cache_stats())
+
+@api_blueprint.route('/api/metrics', methods=['GET'])
+def get_metrics():
+    """Returns this worker's request, cache, check and memory metrics in the Prometheus text format."""
+    return Response(metrics.render(_collect_runtime_metrics()), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+@api_blueprint.route('/api/db_pool_stats', methods=['GET'])
+def get_db_pool_stats():
+    """Returns the size and cumulative counters (creates, reuses, waits, ...) of this worker's database connection pool."""
+    if database.pool is None:
+        return jsonify({"error": "Connection pooling is disabled (DB_POOL_SIZE=0)"}), 404
+    return jsonify(database.pool.stats())
+
+@api_blueprint.route('/api/word_request_stats', methods=['GET'])
+def get_word_request_stats():
+    """Returns the number of new-word requests waiting to be written and cumulative counters of this worker's queue."""
+    if word_request_queue is None:
+        return jsonify({"error": "Background writing of new-word requests is disabled (WORD_REQUEST_FLUSH_INTERVAL=0)"}), 404
+    return jsonify(word_request_queue.stats())
+
+@api_blueprint.route('/api/admin/reload', methods=['GET', 'POST'])
+def reload_data():
+    """
+    POST reloads the linguistic data from the database in the background (with `?wait=1`,
+    it waits until the new data is in use); GET reports the outcome of the last reload.
+    Requires the ADMIN_TOKEN in the X-Admin-Token header.
+    """
+    if not ADMIN_TOKEN:
+        return jsonify({"error": "Reloading is disabled (ADMIN_TOKEN is not set)"}), 404
+    if not hmac.compare_digest(request.headers.get('X-Admin-Token', '').encode('utf-8'), ADMIN_TOKEN.encode('utf-8')):
+        return jsonify({"error": "Invalid admin token"}), 403
+
+    if request.method == 'GET':
+        return jsonify(reloader.status())
+
+    started = reloader.trigger()
+    wait = request.args.get('wait') in ('1', 'true')
+    if wait:
+        reloader.wait()
+    status = reloader.status()
+    status['started'] = started
+    return jsonify(status), 200 if wait else 202
+
 @api_blueprint.route('/api/request_new_word', methods=['POST'])
 def request_new_word():
     """Allows a logged-in user to request that a new word be added to the dictionary."""
@@ -99,6 +234,13 @@ def request_new_word():
 
     if not all([word, user_hash]):
         return jsonify({"status": "error", "message": "Missing 'word' or 'user_hash'"}), 400
+
+    if word_request_queue is not None:
+        # Acknowledge right away; the request is written with the next batch.
+        try:
+            return jsonify(word_request_queue.submit(word, user_hash))
+        except WordRequestQueueError as e:
+            return jsonify({"status": "error", "message": str(e)}), 503
     
     with get_db_connection() as db_conn:
         # Pass the hash to the database manager.
@@ -108,12 +250,175 @@ def request_new_word():
 
 @api_blueprint.route('/api/get_requested_words', methods=['GET'])
 def get_requested_words():
-    """Returns the complete list of user-requested words for the review page."""
+    """
+    Returns the user-requested words for the review page: all of them, or one page with `limit`
+    (plus optional `status`, `q` to search the words, `sort`, `order` and the `cursor` returned for
+    the previous page). Unchanged lists are answered with 304 Not Modified (ETag / Last-Modified).
+    """
+    args = request.args
+    paginated = 'limit' in args
+    if paginated:
+        try:
+            page_params = _parse_requested_words_params(args)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
     with get_db_connection() as db_conn:
-        review_list = database_manager.get_all_requested_words(db_conn)
-    return jsonify(review_list)
+        # The list can only have changed if a word was added or updated, so check that first.
+        last_updated, total = database_manager.get_requested_words_version(db_conn)
+        etag = hashlib.sha1(f"{last_updated}|{total}|{sorted(args.items(multi=True))}".encode('utf-8')).hexdigest()
+        # DATETIME columns have no zone; the database runs in UTC (as on Toolforge), so say so
+        # rather than let astimezone() read the value as this host's local time.
+        last_modified = last_updated.replace(tzinfo=timezone.utc) if last_updated else None
+        if _is_not_modified(etag, last_modified):
+            response = Response(status=304)
+        elif paginated:
+            page = database_manager.get_requested_words_page(db_conn, **page_params)
+            next_after = page.pop('next_after')
+            page['next_cursor'] = _encode_cursor(next_after) if next_after else None
+            response = jsonify(page)
+        else:
+            response = jsonify(database_manager.get_all_requested_words(db_conn))
+
+    response.set_etag(etag)
+    if last_modified:
+        response.last_modified = last_modified
+    # Browsers may keep the list, but must ask whether it changed before using it.
+    response.cache_control.no_cache = True
+    return response
 
 @api_blueprint.route('/api/version', methods=['GET'])
 def get_version():
     """Returns the current version of the webservice."""
-    return jsonify({"version": __version__})
\ No newline at end of file
+    return jsonify({"version": __version__})
+
+# --- HELPERS ---
+def _collect_runtime_metrics() -> List[Iterator[str]]:
+    """The metric families read at scrape time: caches, memory and the loaded data."""
+    cache_stats = logic.get_cache_stats()
+    process = psutil.Process()
+    data_version = logic.linguistic_data.get('data_version')
+    families = [
+        metrics.render_family('bijar_cache_entries', 'gauge', "Entries in each cache.",
+                              (({'cache': c['name']}, c['entries']) for c in cache_stats if c.get('entries') is not None)),
+    ]
+    for counter in ('hits', 'misses', 'evictions'):
+        families.append(metrics.render_family(f'bijar_cache_{counter}_total', 'counter', f"Cache {counter}, per cache.",
+                                              [({'cache': c['name']}, c[counter]) for c in cache_stats if c.get(counter) is not None]))
+    families += [
+        metrics.render_family('bijar_process_resident_memory_bytes', 'gauge', "Resident memory of this worker process.",
+                              [({}, process.memory_info().rss)]),
+        metrics.render_family('bijar_process_start_time_seconds', 'gauge', "Start time of this worker process (Unix time).",
+                              [({'pid': str(process.pid)}, process.create_time())]),
+        metrics.render_family('bijar_linguistic_data_bytes', 'gauge', "Approximate memory of each structure of the linguistic data.",
+                              (({'structure': name}, size) for name, size in logic.get_data_structure_sizes().items())),
+        metrics.render_family('bijar_linguistic_data_info', 'gauge', "The version of the loaded linguistic data.",
+                              [({'data_version': data_version or ''}, 1)]),
+    ]
+    return families
+
+def _check_paragraphs(paragraphs: Any, mode: str):
+    """
+    Paragraph mode of check_text_block. `paragraphs` is a list of {"hash": ..., "text": ...},
+    where "hash" is the SHA-256 hex digest of the paragraph's UTF-8 text and "text" may be left
+    out for paragraphs sent before. The response maps each hash to its problematic words
+    (offsets relative to the paragraph) and lists the hashes the server needs the text for.
+    """
+    if not isinstance(paragraphs, list) or not all(isinstance(p, dict) and isinstance(p.get('hash'), str) for p in paragraphs):
+        return jsonify({"error": "'paragraphs' must be a list of objects with a 'hash'"}), 400
+    if len(paragraphs) > MAX_PARAGRAPHS_PER_REQUEST:
+        return jsonify({"error": f"Too many paragraphs (max {MAX_PARAGRAPHS_PER_REQUEST} per request)"}), 400
+
+    parsed: List[Tuple[str, Any]] = []
+    for paragraph in paragraphs:
+        digest, text = paragraph['hash'].lower(), paragraph.get('text')
+        if text is not None:
+            # Never cache results under a hash that doesn't belong to the text.
+            if not isinstance(text, str) or logic.paragraph_hash(text) != digest:
+                return jsonify({"error": f"Hash mismatch for paragraph '{paragraph['hash']}'"}), 400
+        parsed.append((digest, text))
+
+    results, missing = logic.check_paragraphs(parsed, mode)
+    return jsonify({"results": results, "missing": missing})
+
+def _iter_ndjson(items: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    """Serialises items as NDJSON lines, sent in small chunks to keep per-write overhead low."""
+    lines: List[str] = []
+    for item in items:
+        lines.append(json.dumps(item, ensure_ascii=False))
+        if len(lines) >= STREAM_CHUNK_WORDS:
+            yield '\n'.join(lines) + '\n'
+            lines.clear()
+    if lines:
+        yield '\n'.join(lines) + '\n'
+
+def _parse_requested_words_params(args: Any) -> Dict[str, Any]:
+    """Validates the paging, filtering and sorting parameters of get_requested_words."""
+    try:
+        limit = int(args.get('limit'))
+    except (TypeError, ValueError):
+        raise ValueError("'limit' must be a number")
+    sort = args.get('sort', 'request_count')
+    if sort not in database_manager.REQUESTED_WORDS_SORT_COLUMNS:
+        raise ValueError(f"'sort' must be one of {', '.join(database_manager.REQUESTED_WORDS_SORT_COLUMNS)}")
+    status = args.get('status') or None
+    if status is not None and status not in database_manager.REQUESTED_WORDS_STATUSES:
+        raise ValueError(f"'status' must be one of {', '.join(database_manager.REQUESTED_WORDS_STATUSES)}")
+    return {
+        "limit": max(1, min(limit, MAX_REQUESTED_WORDS_PAGE_SIZE)),
+        "sort": sort,
+        "descending": args.get('order', 'desc') != 'asc',
+        "status": status,
+        "search": args.get('q', '').strip(),
+        "after": _decode_cursor(args['cursor'], sort) if args.get('cursor') else None,
+    }
+
+def _encode_cursor(after: Tuple[Any, str]) -> str:
+    """Encodes the (sort value, word) a page ends with as an opaque, URL-safe cursor."""
+    value, word = after
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    return base64.urlsafe_b64encode(json.dumps([value, word], ensure_ascii=False).encode('utf-8')).decode('ascii')
+
+def _decode_cursor(cursor: str, sort: str) -> Tuple[Any, str]:
+    try:
+        value, word = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8'))
+        if sort in ('first_seen', 'last_updated'):
+            value = datetime.fromisoformat(value)
+        # The value goes to the database as a query parameter: only accept the column's type.
+        elif sort == 'request_count':
+            if not isinstance(value, int) or isinstance(value, bool):
+                raise ValueError
+        elif not isinstance(value, str) or (sort == 'status' and value not in database_manager.REQUESTED_WORDS_STATUSES):
+            raise ValueError
+        if not isinstance(word, str):
+            raise ValueError
+    except (ValueError, TypeError, UnicodeError):
+        raise ValueError("Invalid 'cursor'")
+    return value, word
+
+def _is_not_modified(etag: str, last_modified: Optional[datetime]) -> bool:
+    """Whether the client's cached copy (per If-None-Match, or else If-Modified-Since) is still current."""
+    if request.if_none_match:
+        return request.if_none_match.contains(etag)
+    if request.if_modified_since and last_modified:
+        # HTTP dates have no fractions of a second.
+        return last_modified.replace(microsecond=0) <= request.if_modified_since
+    return False
+
+def _clamp_suggestion_params(raw_limit: Any, raw_distance: Any) -> Tuple[int, int]:
+    """Validates the user-provided limit and distance and clamps them to the server-side range."""
+    # Gracefully handle and validate user input
+    try:
+        # Get user-provided values, falling back to defaults if they are missing or not integers.
+        user_limit = int(raw_limit if raw_limit is not None else DEFAULT_SUGGESTION_LIMIT)
+        user_distance = int(raw_distance if raw_distance is not None else DEFAULT_LEVENSHTEIN_DISTANCE)
+    except (ValueError, TypeError):
+        # If the user provides non-numeric input (e.g., ?limit=abc), use defaults.
+        user_limit = DEFAULT_SUGGESTION_LIMIT
+        user_distance = DEFAULT_LEVENSHTEIN_DISTANCE
+
+    # Clamp the values to the allowed server-side range
+    limit = max(1, min(user_limit, MAX_SUGGESTION_LIMIT))
+    distance = max(1, min(user_distance, MAX_LEVENSHTEIN_DISTANCE))
+    return limit, distance
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+CKB Bijar Spellchecker - Shared Suggestion Cache
+This module provides an optional second-level suggestion cache stored in a
+local SQLite file, so every worker process (and every restart) can reuse the
+suggestions any of them has already computed. It needs no external service:
+SQLite's WAL mode lets many readers work alongside one writer, and a busy
+timeout makes concurrent writers wait instead of failing.
+
+Entries are namespaced by the dictionary's `data_version`, so suggestions
+computed from older data are never served; they simply age out.
+"""
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+# Only refresh an entry's last-used time this often, to avoid a write on every hit.
+_TOUCH_INTERVAL_SECONDS = 60
+# How many writes a process makes (at most) between checks of the entry limit.
+_EVICTION_CHECK_INTERVAL = 200
+
+class SharedSuggestionCache:
+    """A size-bounded, approximately-LRU suggestion cache in a SQLite file shared between processes."""
+    def __init__(self, path: str, max_entries: int, data_version: str, busy_timeout_ms: int = 2000):
+        self.path = path
+        self.max_entries = max_entries
+        self.data_version = data_version
+        self.busy_timeout_ms = busy_timeout_ms
+        self._local = threading.local()
+        self._writes_since_check = 0
+        self._eviction_check_interval = max(1, min(_EVICTION_CHECK_INTERVAL, max_entries // 10))
+        self.hits = self.misses = self.errors = 0
+        self._connect().close()  # Create the file and table now, so a bad path fails at startup.
+
+    def _connect(self) -> sqlite3.Connection:
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=self.busy_timeout_ms / 1000, isolation_level=None)
+        conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}")
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS suggestions ("
+            " key TEXT PRIMARY KEY, suggestions TEXT NOT NULL, last_used INTEGER NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_suggestions_last_used ON suggestions (last_used)")
+        return conn
+
+    def _connection(self) -> sqlite3.Connection:
+        """One connection per thread and process; connections must not be shared across a fork."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = self._local.conn = self._connect()
+            self._local.pid = os.getpid()
+        return conn
+
+    def _key(self, key: str) -> str:
+        return f"{self.data_version}|{key}"
+
+    def get(self, key: str) -> Optional[List[str]]:
+        """Returns the cached suggestions, or None if they are missing or the cache can't be read."""
+        try:
+            conn = self._connection()
+            row = conn.execute("SELECT suggestions, last_used FROM suggestions WHERE key = ?", (self._key(key),)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            now = int(time.time())
+            if now - row[1] >= _TOUCH_INTERVAL_SECONDS:
+                conn.execute("UPDATE suggestions SET last_used = ? WHERE key = ?", (now, self._key(key)))
+        except sqlite3.Error as e:
+            self._report_error(e)
+            return None
+        self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, suggestions: List[str]):
+        """Stores suggestions, occasionally evicting the least recently used entries over the limit."""
+        try:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO suggestions (key, suggestions, last_used) VALUES (?, ?, ?)",
+                (self._key(key), json.dumps(suggestions, ensure_ascii=False), int(time.time()))
+            )
+            self._writes_since_check += 1
+            if self._writes_since_check >= self._eviction_check_interval:
+                self._writes_since_check = 0
+                self._evict(conn)
+        except sqlite3.Error as e:
+            self._report_error(e)
+
+    def _evict(self, conn: sqlite3.Connection):
+        (count,) = conn.execute("SELECT COUNT(*) FROM suggestions").fetchone()
+        excess = count - self.max_entries
+        if excess > 0:
+            conn.execute(
+                "DELETE FROM suggestions WHERE key IN (SELECT key FROM suggestions ORDER BY last_used LIMIT ?)",
+                (excess,)
+            )
+
+    def _report_error(self, error: sqlite3.Error):
+        # The cache is only an optimisation: failures count as misses and are logged sparingly.
+        self.errors += 1
+        if self.errors == 1 or self.errors % 1000 == 0:
+            print(f"WARNING: Shared suggestion cache error ({error}); {self.errors} error(s) so far.")
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns this process's counters and the number of entries in the shared file."""
+        try:
+            (entries,) = self._connection().execute("SELECT COUNT(*) FROM suggestions").fetchone()
+        except sqlite3.Error:
+            entries = None
+        lookups = self.hits + self.misses
+        return {
+            "name": "shared_suggestions",
+            "path": self.path,
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+        }
@@ -0,0 +1,377 @@
+# -*- coding: utf-8 -*-
+"""
+CKB Bijar Spellchecker - Dictionary Snapshot
+This module writes everything `linguistic_data` needs, including the prebuilt
+suggestion indexes, into one versioned binary file, and loads it back by
+memory-mapping it read-only. Lookups read the mapped pages directly, so every
+worker process that opens the same snapshot shares its physical memory, and
+startup no longer needs the database.
+
+File layout (all offsets are absolute, arrays use the native byte order):
+    MAGIC (8 bytes) | format version (uint32) | header offset (uint64) | header length (uint64)
+    sections...     | header (JSON: metadata and the section table)
+"""
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+from collections.abc import ItemsView, Mapping, Sequence, Set, ValuesView
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+from .deletion_index import DeletionIndex
+
+SNAPSHOT_MAGIC = b'BIJARSNP'
+SNAPSHOT_FORMAT_VERSION = 1
+_PREAMBLE = struct.Struct('<8sIQQ')
+_ALIGNMENT = 8
+
+class SnapshotError(Exception):
+    """Raised when a snapshot file is corrupt or was written by an incompatible version."""
+
+# --- Memory-mapped containers ---
+
+class StringTable(Sequence):
+    """
+    A sorted table of UTF-8 strings, stored as an offsets array and a single blob.
+    An open-addressing hash table of positions (CRC32, linear probing) makes
+    membership tests cost about one string comparison instead of a binary search.
+    """
+    def __init__(self, buffer: mmap.mmap, offsets: memoryview, blob_start: int, slots: memoryview):
+        self._buffer = buffer
+        self._offsets = offsets
+        self._blob_start = blob_start
+        self._slots = slots
+        self._mask = len(slots) - 1
+        self._count = len(offsets) - 1
+        self.nbytes = offsets.nbytes + offsets[self._count] + slots.nbytes
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, i: int) -> str:
+        if not 0 <= i < self._count:
+            raise IndexError(i)
+        start = self._blob_start
+        return self._buffer[start + self._offsets[i]:start + self._offsets[i + 1]].decode('utf-8')
+
+    def __iter__(self) -> Iterator[str]:
+        for i in range(self._count):
+            yield self[i]
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and self.find(key) >= 0
+
+    def find(self, key: str) -> int:
+        """Returns the position of `key` in the table, or -1."""
+        target = key.encode('utf-8')
+        buffer, offsets, start, slots, mask = self._buffer, self._offsets, self._blob_start, self._slots, self._mask
+        slot = zlib.crc32(target) & mask
+        while True:
+            # Slots hold position + 1, so 0 marks an empty slot.
+            position = slots[slot] - 1
+            if position < 0:
+                return -1
+            if buffer[start + offsets[position]:start + offsets[position + 1]] == target:
+                return position
+            slot = (slot + 1) & mask
+
+class MappedStringSet(Set):
+    """A read-only set of strings backed by a StringTable."""
+    def __init__(self, table: StringTable):
+        self._table = table
+        self.nbytes = table.nbytes
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._table
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._table)
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+class MappedStemsMap(Mapping):
+    """A read-only `stems_map` (word -> {'word', 'sound_type', 'is_bad'}) backed by parallel arrays."""
+    def __init__(self, table: StringTable, sound_type_ids: memoryview, is_bad: memoryview, sound_types: List[str]):
+        self._table = table
+        self._sound_type_ids = sound_type_ids
+        self._is_bad = is_bad
+        self._sound_types = sound_types
+        self.nbytes = table.nbytes + sound_type_ids.nbytes + is_bad.nbytes
+
+    def _row(self, i: int, word: str) -> Dict[str, Any]:
+        return {'word': word, 'sound_type': self._sound_types[self._sound_type_ids[i]], 'is_bad': self._is_bad[i]}
+
+    def __getitem__(self, word: str) -> Dict[str, Any]:
+        i = self._table.find(word) if isinstance(word, str) else -1
+        if i < 0:
+            raise KeyError(word)
+        return self._row(i, word)
+
+    def __contains__(self, word: object) -> bool:
+        return word in self._table
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._table)
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+    # Walk the arrays in order instead of binary-searching every key.
+    def items(self) -> ItemsView:
+        return _SequentialItemsView(self)
+
+    def values(self) -> ValuesView:
+        return _SequentialValuesView(self)
+
+class _SequentialItemsView(ItemsView):
+    def __iter__(self):
+        stems: MappedStemsMap = self._mapping
+        for i, word in enumerate(stems._table):
+            yield word, stems._row(i, word)
+
+class _SequentialValuesView(ValuesView):
+    def __iter__(self):
+        stems: MappedStemsMap = self._mapping
+        for i, word in enumerate(stems._table):
+            yield stems._row(i, word)
+
+class MappedMultiMap(Mapping):
+    """A read-only map of string -> tuple of strings, stored as ranges of ids into a target table."""
+    def __init__(self, keys: StringTable, ranges: memoryview, ids: memoryview, target: StringTable):
+        self._keys = keys
+        self._ranges = ranges
+        self._ids = ids
+        self._target = target
+        self.nbytes = keys.nbytes + ranges.nbytes + ids.nbytes
+
+    def __getitem__(self, key: str) -> Tuple[str, ...]:
+        i = self._keys.find(key) if isinstance(key, str) else -1
+        if i < 0:
+            raise KeyError(key)
+        target, ids = self._target, self._ids
+        return tuple(target[ids[j]] for j in range(self._ranges[i], self._ranges[i + 1]))
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._keys
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+# --- Writing ---
+
+class _SectionWriter:
+    """Appends aligned sections to an open file and records them in a section table."""
+    def __init__(self, f):
+        self._f = f
+        self.sections: Dict[str, List[Any]] = {}
+
+    def add_array(self, name: str, values: array):
+        padding = -self._f.tell() % _ALIGNMENT
+        self._f.write(b'\0' * padding)
+        self.sections[name] = [self._f.tell(), len(values) * values.itemsize, values.typecode]
+        values.tofile(self._f)
+
+    def add_strings(self, name: str, encoded: List[bytes]) -> int:
+        """Writes already sorted, UTF-8 encoded strings as a string table. Returns the count."""
+        offsets = array('I', [0])
+        for value in encoded:
+            offsets.append(offsets[-1] + len(value))
+        self.add_array(f'{name}.offsets', offsets)
+        self.sections[f'{name}.blob'] = [self._f.tell(), offsets[-1], 'B']
+        self._f.write(b''.join(encoded))
+
+        # Keep the hash table at most half full so probe chains stay short.
+        size = 1
+        while size < 2 * len(encoded):
+            size *= 2
+        slots = array('I', [0]) * size
+        mask = size - 1
+        for position, value in enumerate(encoded):
+            slot = zlib.crc32(value) & mask
+            while slots[slot]:
+                slot = (slot + 1) & mask
+            slots[slot] = position + 1
+        self.add_array(f'{name}.slots', slots)
+        return len(encoded)
+
+def _sorted_utf8(strings: Iterable[str]) -> List[bytes]:
+    """The distinct strings, UTF-8 encoded. UTF-8 byte order equals code point order, so a table iterates like `sorted()` on the strings."""
+    return sorted({s.encode('utf-8') for s in strings})
+
+def _write_deletion_index(writer: _SectionWriter, name: str, index: DeletionIndex) -> Dict[str, int]:
+    words_by_prefix, prefixes_by_delete = index.tables()
+
+    words = _sorted_utf8(index)
+    word_ids = {w.decode('utf-8'): i for i, w in enumerate(words)}
+    writer.add_strings(f'{name}.words', words)
+
+    prefixes = _sorted_utf8(words_by_prefix)
+    writer.add_strings(f'{name}.prefixes', prefixes)
+    ranges, ids = array('I', [0]), array('I')
+    for prefix in prefixes:
+        ids.extend(sorted(word_ids[w] for w in words_by_prefix[prefix.decode('utf-8')]))
+        ranges.append(len(ids))
+    writer.add_array(f'{name}.prefixes.ranges', ranges)
+    writer.add_array(f'{name}.prefixes.ids', ids)
+    del word_ids
+
+    prefix_ids = {p.decode('utf-8'): i for i, p in enumerate(prefixes)}
+    deletes = _sorted_utf8(prefixes_by_delete)
+    writer.add_strings(f'{name}.deletes', deletes)
+    ranges, ids = array('I', [0]), array('I')
+    for variant in deletes:
+        ids.extend(sorted(prefix_ids[p] for p in prefixes_by_delete[variant.decode('utf-8')]))
+        ranges.append(len(ids))
+    writer.add_array(f'{name}.deletes.ranges', ranges)
+    writer.add_array(f'{name}.deletes.ids', ids)
+
+    return {'max_distance': index.max_distance, 'prefix_length': index.prefix_length, 'word_count': len(index)}
+
+def write_snapshot(path: str, data: Dict[str, Any], deletion_index: DeletionIndex, stem_index: DeletionIndex) -> int:
+    """
+    Writes the linguistic data and the prebuilt suggestion indexes to `path`.
+    The file is written next to the target and renamed into place, so readers
+    never see a partial snapshot. Returns the size of the file in bytes.
+    """
+    stems_map: Dict[str, Any] = data['stems_map']
+    sound_types = sorted({info['sound_type'] for info in stems_map.values()})
+    sound_type_ids = {t: i for i, t in enumerate(sound_types)}
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(b'\0' * _PREAMBLE.size)
+        writer = _SectionWriter(f)
+
+        stems = _sorted_utf8(stems_map)
+        writer.add_strings('stems', stems)
+        stem_rows = [stems_map[s.decode('utf-8')] for s in stems]
+        writer.add_array('stems.sound_type_ids', array('H', (sound_type_ids[r['sound_type']] for r in stem_rows)))
+        writer.add_array('stems.is_bad', array('B', (1 if r['is_bad'] else 0 for r in stem_rows)))
+        del stem_rows
+
+        writer.add_strings('single_word_verb_forms', _sorted_utf8(data['single_word_verb_forms']))
+        writer.add_strings('multi_word_verb_phrases', _sorted_utf8(data['multi_word_verb_phrases']))
+        index_meta = {
+            'deletion_index': _write_deletion_index(writer, 'deletion_index', deletion_index),
+            'stem_index': _write_deletion_index(writer, 'stem_index', stem_index)
+        }
+
+        header = {
+            'data_version': data.get('data_version'),
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'byteorder': sys.byteorder,
+            'uint32_itemsize': array('I').itemsize,
+            'sound_types': sound_types,
+            'suffixes_list': [{'suffix': s['suffix'], 'applies_to_sound': s['applies_to_sound']} for s in data['suffixes_list']],
+            'bad_words': sorted(data['bad_words_set']),
+            'verb_infinitives': sorted(data['verb_infinitives']),
+            'particles': sorted(data['particles_set']),
+            'prefixes': sorted(data['all_prefixes']),
+            'indexes': index_meta,
+            'sections': writer.sections
+        }
+        header_bytes = json.dumps(header, ensure_ascii=False).encode('utf-8')
+        header_offset = f.tell()
+        f.write(header_bytes)
+
+        f.seek(0)
+        f.write(_PREAMBLE.pack(SNAPSHOT_MAGIC, SNAPSHOT_FORMAT_VERSION, header_offset, len(header_bytes)))
+        f.flush()
+        os.fsync(f.fileno())
+
+    os.replace(tmp_path, path)
+    return os.path.getsize(path)
+
+# --- Loading ---
+
+class _SnapshotReader:
+    """Validates a mapped snapshot and builds views over its sections."""
+    def __init__(self, path: str):
+        with open(path, 'rb') as f:
+            # The mapping stays valid after the file is closed.
+            self.buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.buffer) < _PREAMBLE.size:
+            raise SnapshotError("file is too small to be a snapshot")
+
+        magic, version, header_offset, header_length = _PREAMBLE.unpack_from(self.buffer, 0)
+        if magic != SNAPSHOT_MAGIC:
+            raise SnapshotError("not a Bijar snapshot file")
+        if version != SNAPSHOT_FORMAT_VERSION:
+            raise SnapshotError(f"format version {version} is not supported (expected {SNAPSHOT_FORMAT_VERSION})")
+        if header_offset + header_length > len(self.buffer):
+            raise SnapshotError("file is truncated")
+
+        self.header: Dict[str, Any] = json.loads(self.buffer[header_offset:header_offset + header_length].decode('utf-8'))
+        if self.header['byteorder'] != sys.byteorder or self.header['uint32_itemsize'] != array('I').itemsize:
+            raise SnapshotError("snapshot was built on a platform with a different byte order or integer size")
+        self._view = memoryview(self.buffer)
+
+    def array(self, name: str) -> memoryview:
+        offset, nbytes, typecode = self.header['sections'][name]
+        return self._view[offset:offset + nbytes].cast(typecode)
+
+    def strings(self, name: str) -> StringTable:
+        return StringTable(self.buffer, self.array(f'{name}.offsets'), self.header['sections'][f'{name}.blob'][0],
+                           self.array(f'{name}.slots'))
+
+    def deletion_index(self, name: str) -> DeletionIndex:
+        words = self.strings(f'{name}.words')
+        prefixes = self.strings(f'{name}.prefixes')
+        words_by_prefix = MappedMultiMap(prefixes, self.array(f'{name}.prefixes.ranges'), self.array(f'{name}.prefixes.ids'), words)
+        prefixes_by_delete = MappedMultiMap(self.strings(f'{name}.deletes'), self.array(f'{name}.deletes.ranges'),
+                                            self.array(f'{name}.deletes.ids'), prefixes)
+        meta = self.header['indexes'][name]
+        return DeletionIndex.from_tables(words_by_prefix, prefixes_by_delete,
+                                         meta['max_distance'], meta['prefix_length'], meta['word_count'])
+
+def load_snapshot(path: str) -> Dict[str, Any]:
+    """
+    Memory-maps a snapshot and returns a `linguistic_data` dictionary with the same
+    keys as `load_linguistic_data`, plus the prebuilt 'deletion_index' and 'stem_index'.
+    """
+    reader = _SnapshotReader(path)
+    header = reader.header
+
+    linguistic_data: Dict[str, Any] = {}
+    linguistic_data['stems_map'] = MappedStemsMap(reader.strings('stems'), reader.array('stems.sound_type_ids'),
+                                                  reader.array('stems.is_bad'), header['sound_types'])
+    linguistic_data['bad_words_set'] = set(header['bad_words'])
+    linguistic_data['suffixes_list'] = header['suffixes_list']
+    linguistic_data['single_word_verb_forms'] = MappedStringSet(reader.strings('single_word_verb_forms'))
+    linguistic_data['multi_word_verb_phrases'] = MappedStringSet(reader.strings('multi_word_verb_phrases'))
+    linguistic_data['verb_infinitives'] = set(header['verb_infinitives'])
+    linguistic_data['particles_set'] = set(header['particles'])
+    linguistic_data['all_prefixes'] = set(header['prefixes'])
+    linguistic_data['data_version'] = header['data_version']
+    linguistic_data['word_counts'] = None
+
+    linguistic_data['deletion_index'] = reader.deletion_index('deletion_index')
+    linguistic_data['stem_index'] = reader.deletion_index('stem_index')
+    linguistic_data['snapshot_info'] = {'path': path, 'created_at': header['created_at'], 'size_bytes': len(reader.buffer)}
+
+    # Nothing checks the snapshot against the database: show which data it holds, and how old it is.
+    print(f"✅ Linguistic data mapped from snapshot '{path}' (data version {header['data_version']}, "
+          f"built {header['created_at']}, {_age(header['created_at'])} ago). "
+          f"Rebuild it with `python run.py build_snapshot` after any change to the data.")
+    return linguistic_data
+
+def _age(created_at: str) -> str:
+    try:
+        seconds = max(0.0, (datetime.now() - datetime.fromisoformat(created_at)).total_seconds())
+    except (TypeError, ValueError):
+        return 'an unknown time'
+    if seconds < 2 * 3600:
+        return f"{seconds / 60:.0f} minutes"
+    if seconds < 2 * 86400:
+        return f"{seconds / 3600:.0f} hours"
+    return f"{seconds / 86400:.0f} days"
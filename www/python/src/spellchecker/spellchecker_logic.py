@@ -6,17 +6,33 @@ text checking and suggestion generation by delegating to the specialized engines
 """
 from __future__ import annotations
 
-import re
+import hashlib
+import os
+import sqlite3
 import sys
+import threading
 import time
-from datetime import datetime
-from typing import Any, Dict, List, NamedTuple
+from typing import Any, Callable, Dict, FrozenSet, Iterable, Iterator, List, NamedTuple, Optional, Tuple
 from pymysql.connections import Connection
 from pymysql.cursors import DictCursor
 
 # --- Import from our new, clean modules ---
-from .data_loader import load_linguistic_data
-from .suggestion_engine import SuggestionFinder
+from .data_loader import TABLE_QUERIES, build_linguistic_data, fetch_table_checksums, fetch_tables, is_base_word, load_linguistic_data
+from .suggestion_engine import SuggestionFinder, SuggestionIndex
+from .deletion_index import DeletionIndex
+from .suffix_trie import SuffixTrie
+from .tokenizer import normalize_word, tokenize
+from .wikitext import mask_markup
+from .snapshot import SnapshotError, load_snapshot
+from .cache import LRUCache
+from . import metrics, profiling
+from .shared_cache import SharedSuggestionCache
+from .precomputed import PrecomputedSuggestions, load_precomputed_suggestions
+from .constants import MAX_LEVENSHTEIN_DISTANCE
+from .config import (
+    ADMIN_TOKEN, PARAGRAPH_CACHE_SIZE, PRECOMPUTED_SUGGESTIONS_PATH, SHARED_CACHE_PATH, SHARED_CACHE_SIZE, SUFFIX_STACK_DEPTH, SUGGESTION_CACHE_MAX_MB,
+    SUGGESTION_CACHE_SIZE, SUGGESTION_CACHE_TTL, VALIDATION_CACHE_SIZE, VERB_FORMS_STORAGE, RELOAD_INTERVAL
+)
 
 # --- DATA STRUCTURES ---
 class ValidationResult(NamedTuple):
@@ -24,130 +40,477 @@ class ValidationResult(NamedTuple):
     is_bad: bool = False
 
 # Global cache to hold ALL data for high performance.
+# A reload replaces it as a whole (see `reload_all_data`) instead of updating it in place, so each
+# request reads it once and works with one consistent version even if a reload swaps it meanwhile.
 linguistic_data: Dict[str, Any] = {}
 
+# Only one reload may build new data at a time.
+_reload_lock = threading.Lock()
+
 # --- INITIALIZATION ---
-def load_all_data_into_memory(db_conn: Connection[DictCursor]):
-    """Initializes the spellchecker by loading all data into the global cache."""
+def load_all_data_into_memory(db_conn: Connection[DictCursor], verb_forms_storage: Optional[str] = None):
+    """
+    Initializes the spellchecker by loading all data into the global cache.
+    `verb_forms_storage` overrides the configured VERB_FORMS_STORAGE.
+    """
+    global linguistic_data
+    # The table checksums are only worth their full table scans if the data can be reloaded.
+    data = load_linguistic_data(db_conn, verb_forms_storage or VERB_FORMS_STORAGE, with_checksums=bool(ADMIN_TOKEN or RELOAD_INTERVAL))
+    linguistic_data = _prepare_linguistic_data(data)
+
+def load_all_data_from_snapshot(snapshot_path: str) -> bool:
+    """
+    Initializes the spellchecker from a prebuilt snapshot file (see `run.py build_snapshot`).
+    Returns False if the snapshot is missing or unusable, so the caller can fall back to the database.
+    """
+    global linguistic_data
+    if not snapshot_path or not os.path.exists(snapshot_path):
+        return False
+    try:
+        data = load_snapshot(snapshot_path)
+    except (OSError, ValueError, KeyError, SnapshotError) as e:
+        print(f"WARNING: Could not load the snapshot '{snapshot_path}' ({e}). Falling back to the database.")
+        return False
+    linguistic_data = _prepare_linguistic_data(data)
+    return True
+
+def reload_all_data(db_conn: Connection[DictCursor]) -> Dict[str, Any]:
+    """
+    Reloads the linguistic data from the database while the current data keeps serving requests,
+    then swaps the new data in with a single assignment. Tables whose checksum hasn't changed are
+    not fetched again, only added or changed verbs are conjugated, the suggestion indexes are
+    patched rather than rebuilt, and only the cached suggestions the changes may affect are dropped.
+    Returns a summary of the reload.
+    """
     global linguistic_data
-    linguistic_data = load_linguistic_data(db_conn)
+    with _reload_lock:
+        start_time = time.perf_counter()
+        previous = linguistic_data
+        checksums = fetch_table_checksums(db_conn)
+
+        known_checksums = previous.get('table_checksums') or {}
+        changed_tables = [table for table in TABLE_QUERIES
+                          if table not in checksums or checksums[table] != known_checksums.get(table)]
+        # Data mapped from a snapshot has no source rows to reuse, so it is rebuilt from scratch.
+        incremental = previous.get('source_tables') is not None
+        summary: Dict[str, Any] = {"status": "unchanged", "changed_tables": changed_tables, "incremental": incremental}
+        if not changed_tables:
+            summary.update(data_version=previous['data_version'], seconds=round(time.perf_counter() - start_time, 3))
+            return summary
+
+        tables = dict(previous['source_tables']) if incremental else {}
+        tables.update(fetch_tables(db_conn, changed_tables if incremental else TABLE_QUERIES))
+        data = build_linguistic_data(tables, VERB_FORMS_STORAGE, previous if incremental else None)
+        data['table_checksums'] = checksums
+        if data['data_version'] == previous.get('data_version'):
+            # The rows are the same (e.g. a table was rewritten unchanged): keep serving the current
+            # data, and remember the checksums so the next reload doesn't fetch the tables again.
+            previous['table_checksums'] = checksums
+            summary.update(data_version=previous['data_version'], seconds=round(time.perf_counter() - start_time, 3))
+            return summary
+
+        data = _prepare_linguistic_data(data, previous)
+        data['word_counts'] = previous.get('word_counts')
+        linguistic_data = data
+
+        summary.update(status="reloaded", data_version=data['data_version'], previous_data_version=previous.get('data_version'),
+                       seconds=round(time.perf_counter() - start_time, 3))
+        changes = data.get('changes')
+        if changes is not None:
+            summary['changes'] = {name: len(value) for name, value in changes.items() if isinstance(value, (set, frozenset))}
+            summary['changes']['suffixes_changed'] = changes['suffixes_changed']
+        summary['kept_cached_suggestions'] = len(data['suggestion_cache'])
+        print(f"✅ Linguistic data reloaded ({', '.join(changed_tables)} changed) in {summary['seconds']:.2f} s; "
+              f"data version {data['data_version']}.")
+        return summary
+
+def _prepare_linguistic_data(data: Dict[str, Any], previous: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Builds the search structures and empty caches on top of freshly loaded data.
+    When `previous` data is being replaced and the changes between the two are known,
+    its suggestion indexes are patched and its unaffected cached suggestions are kept.
+    """
+    changes: Optional[Dict[str, Any]] = data.get('changes') if previous is not None else None
+    if changes is not None:
+        previous_index: SuggestionIndex = previous['suggestion_index']
+        data['stem_index'] = previous_index.stem_index.with_changes(changes['added_stems'], changes['removed_stems'])
+        data['deletion_index'] = previous_index.deletion_index.with_changes(changes['added_words'], changes['removed_words'])
+    data['suggestion_index'] = SuggestionIndex.build(data)
+    data['phrase_first_words'] = _phrase_first_words(data.get('multi_word_verb_phrases', set()))
+    data['suffix_trie'] = SuffixTrie(data['suffixes_list'], data['stems_map'])
+
+    data['suggestion_cache'] = LRUCache('suggestions', SUGGESTION_CACHE_SIZE,
+                                        max_bytes=SUGGESTION_CACHE_MAX_MB * 1024 * 1024, ttl_seconds=SUGGESTION_CACHE_TTL)
+    if previous is None:
+        data['precomputed_suggestions'] = load_precomputed_suggestions(PRECOMPUTED_SUGGESTIONS_PATH, data.get('data_version', ''))
+    else:
+        data['precomputed_suggestions'] = None
+    data['shared_suggestion_cache'] = _open_shared_cache(data.get('data_version', ''))
+    data['paragraph_cache'] = LRUCache('paragraphs', PARAGRAPH_CACHE_SIZE)
+    data['validation_cache'] = LRUCache('validations', VALIDATION_CACHE_SIZE)
 
-    linguistic_data['suggestion_cache'] = {}
-    linguistic_data['suggestion_cache_created_at'] = datetime.now()
+    if changes is not None:
+        _carry_over_suggestions(previous, data, changes)
+    return data
+
+def _phrase_first_words(phrases: Iterable[str]) -> FrozenSet[str]:
+    """The words multi-word verb phrases start with: a token can only start a phrase if it is one of them."""
+    first_words = getattr(phrases, 'first_words', None)
+    if first_words is not None:  # Recognized phrases aren't stored; they know their first words.
+        return frozenset(first_words())
+    return frozenset(phrase.split(' ', 1)[0] for phrase in phrases)
+
+def _carry_over_suggestions(previous: Dict[str, Any], data: Dict[str, Any], changes: Dict[str, Any]):
+    """Copies the cached and precomputed suggestions the changes cannot have affected into the new data."""
+    if changes['suffixes_changed']:
+        # Any stem+suffix suggestion may differ now.
+        return
+    is_affected = _suggestion_change_detector(data, changes)
+
+    for key, suggestions in previous['suggestion_cache'].items():
+        word, _, max_distance = key.rsplit('|', 2)
+        if not is_affected(word, int(max_distance), suggestions):
+            data['suggestion_cache'].put(key, suggestions)
+
+    precomputed: Optional[PrecomputedSuggestions] = previous.get('precomputed_suggestions')
+    if precomputed is not None:
+        affected = {word for word, per_distance in precomputed.items()
+                    if is_affected(word, len(per_distance), [s for suggestions in per_distance for s in suggestions])}
+        data['precomputed_suggestions'] = precomputed.without(affected, data['data_version'])
+
+def _suggestion_change_detector(data: Dict[str, Any], changes: Dict[str, Any]) -> Callable[[str, int, List[str]], bool]:
+    """
+    Returns a check of whether the suggestions cached for a word (at a max distance) may differ
+    after the given changes: a new word or stem lies within that distance of the word (or of
+    one of its stem splits), a new verb phrase matches it, or one of its suggestions is gone.
+    """
+    added_words = DeletionIndex(changes['added_words'], MAX_LEVENSHTEIN_DISTANCE)
+    added_stems = DeletionIndex(changes['added_stems'] | changes['retyped_stems'], MAX_LEVENSHTEIN_DISTANCE)
+    # The spellings the structural fixes turn into the new phrases (e.g. "ھەڵمگرت" and "ھەڵمئەگرت").
+    added_phrase_spellings = {p.replace(' ', '') for p in changes['added_phrases']}
+    added_phrase_spellings |= {p.replace(' دە', 'ئە', 1) for p in changes['added_phrases']}
+    something_removed = any(changes[name] for name in ('removed_words', 'removed_stems', 'retyped_stems', 'removed_phrases'))
+
+    def is_affected(word: str, max_distance: int, suggestions: List[str]) -> bool:
+        if word in added_phrase_spellings:
+            return True
+        if len(added_words) and next(added_words.lookup(word, max_distance), None) is not None:
+            return True
+        if len(added_stems) and any(next(added_stems.lookup(word[:i], max_distance), None) is not None for i in range(2, len(word))):
+            return True
+        return something_removed and not all(_is_suggestible(s, data) for s in suggestions)
+    return is_affected
+
+def _is_suggestible(candidate: str, data: Dict[str, Any]) -> bool:
+    """Whether a suggestion is still a dictionary word, stem+suffix combination or verb phrase."""
+    if " " in candidate:
+        return candidate in data['multi_word_verb_phrases']
+    return is_base_word(data, candidate) or _check_suffixes_in_memory(candidate, 1, data) is not None
+
+def _open_shared_cache(data_version: str) -> Optional[SharedSuggestionCache]:
+    """Opens the shared suggestion cache if one is configured. Any problem just disables it."""
+    if not SHARED_CACHE_PATH:
+        return None
+    try:
+        return SharedSuggestionCache(SHARED_CACHE_PATH, SHARED_CACHE_SIZE, data_version)
+    except (OSError, sqlite3.Error) as e:
+        print(f"WARNING: Could not open the shared suggestion cache '{SHARED_CACHE_PATH}' ({e}). Continuing without it.")
+        return None
 
 # --- CORE PUBLIC FUNCTIONS ---
 
-def check_text_block(text_block: str) -> List[Dict[str, Any]]:
+def check_text_block(text_block: str, mode: str = 'text') -> List[Dict[str, Any]]:
     """Analyzes a block of text and identifies problematic words."""
-    problematic_words: List[Dict[str, Any]] = []
-    words = list(re.finditer(r'\b[ئابپتجچحخدرڕزژسشعغفڤقکگلڵمنوۆھهەیێ]+\b', text_block))
-    
-    multi_word_phrases = linguistic_data.get('multi_word_verb_phrases', set())
-    i = 0
-    while i < len(words):
-        match1 = words[i]
-        word1 = match1.group(0)
-        
-        # Lookahead check for two-word verb phrases
-        if i + 1 < len(words):
-            match2 = words[i + 1]
-            two_word_phrase = f"{word1} {match2.group(0)}"
-            if two_word_phrase in multi_word_phrases:
-                i += 2; continue
-
-        if len(word1) <= 1:
-            i += 1; continue
-
-        validation = _is_word_correct_in_memory(word1)
-        if not validation.is_correct:
-            problematic_words.append({"word": word1, "start": match1.start(), "end": match1.end(), "type": "misspelled"})
-        elif validation.is_bad:
-            problematic_words.append({"word": word1, "start": match1.start(), "end": match1.end(), "type": "bad"})
-        
-        i += 1
-        
-    return problematic_words
+    return list(iter_problematic_words(text_block, mode))
+
+def iter_problematic_words(text_block: str, mode: str = 'text') -> Iterator[Dict[str, Any]]:
+    """
+    Lazily tokenises a block of text and yields its problematic words in order,
+    so callers can stream them while the rest of the text is still being checked.
+    Words are checked in their normalized spelling (see tokenizer.py) and reported as written.
+    In 'wikitext' mode, the markup is skipped (see wikitext.py); the offsets still refer to the text.
+    """
+    profile = profiling.current_profile()
+    if mode == 'wikitext':
+        start_time = time.perf_counter()
+        words = tokenize(mask_markup(text_block))
+        if profile is not None:
+            profile.record('mask_markup', time.perf_counter() - start_time, len(text_block), 'chars')
+    else:
+        words = tokenize(text_block)
+
+    data = linguistic_data
+    multi_word_phrases = data.get('multi_word_verb_phrases', set())
+    phrase_first_words = data.get('phrase_first_words', frozenset())
+    # Tokens repeat a lot within a text: each distinct one is normalized and validated once.
+    known_tokens: Dict[str, Tuple[str, Optional[ValidationResult]]] = {}
+    # Counted locally and recorded once, when the text is done (or the caller stops reading).
+    tokens = misspelled = bad = 0
+    validation_totals = [0.0, 0]  # Seconds spent validating, and the number of validations (when profiled).
+    validate = _validate_word if profile is None else _timed(_validate_word, validation_totals)
+    start_time = time.perf_counter()
+    try:
+        match1 = next(words, None)
+        while match1 is not None:
+            tokens += 1
+            token1 = match1.group(0)
+            known = known_tokens.get(token1)
+            if known is None:
+                word1 = normalize_word(token1)
+                known = known_tokens[token1] = (word1, validate(word1, data) if len(word1) > 1 else None)
+            word1, validation = known
+            match2 = next(words, None)
+
+            # Lookahead check for two-word verb phrases (only if the word can start one)
+            if match2 is not None and word1 in phrase_first_words:
+                token2 = match2.group(0)
+                word2 = known_tokens[token2][0] if token2 in known_tokens else normalize_word(token2)
+                if f"{word1} {word2}" in multi_word_phrases:
+                    tokens += 1
+                    match1 = next(words, None); continue
+
+            if validation is not None:
+                # The word as written (the token has its letter variants replaced).
+                if not validation.is_correct:
+                    misspelled += 1
+                    start, end = match1.span()
+                    yield {"word": text_block[start:end], "start": start, "end": end, "type": "misspelled"}
+                elif validation.is_bad:
+                    bad += 1
+                    start, end = match1.span()
+                    yield {"word": text_block[start:end], "start": start, "end": end, "type": "bad"}
+
+            match1 = match2
+    finally:
+        metrics.check_text_tokens.inc(tokens)
+        metrics.check_text_problems.inc(misspelled, ('misspelled',))
+        metrics.check_text_problems.inc(bad, ('bad',))
+        if profile is not None:
+            validation_seconds, validations = validation_totals
+            profile.record('tokenize', time.perf_counter() - start_time - validation_seconds, tokens, 'tokens')
+            profile.record('validate', validation_seconds, validations, 'words')
+
+def paragraph_hash(text: str) -> str:
+    """The content hash paragraphs are cached under: the SHA-256 of their UTF-8 text, in hex."""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+def check_paragraphs(paragraphs: Iterable[Tuple[str, Optional[str]]], mode: str = 'text') -> Tuple[Dict[str, List[Dict[str, Any]]], List[str]]:
+    """
+    Checks a text sent as (hash, text) paragraphs, where text may be None for paragraphs the
+    client expects the server to have seen before. Only paragraphs missing from the cache are
+    checked; offsets in the results are relative to each paragraph, and two-word verb phrases
+    are not matched across paragraph breaks. In 'wikitext' mode each paragraph is masked on its
+    own, so markup that spans paragraphs (e.g. a multi-line template) is only skipped if sent whole.
+    Returns the problematic words per hash, and the hashes that were neither cached nor sent.
+    """
+    cache: LRUCache = linguistic_data['paragraph_cache']
+    results: Dict[str, List[Dict[str, Any]]] = {}
+    missing: List[str] = []
+
+    for digest, text in paragraphs:
+        if digest in results:
+            continue
+        # The same paragraph checked as wikitext has different results.
+        cache_key = digest if mode == 'text' else f"{digest}|{mode}"
+        cached = cache.get(cache_key)
+        if cached is not None:
+            results[digest] = cached
+        elif text is None:
+            missing.append(digest)
+        else:
+            results[digest] = check_text_block(text, mode)
+            cache.put(cache_key, results[digest])
+    return results, missing
 
 def get_combined_suggestions(word: str, limit: int, max_distance: int) -> List[str]:
     """Generates suggestions for a single misspelled word, using caching for performance."""
-    cache = linguistic_data.get('suggestion_cache', {})
-    cache_key = f"{word}|{limit}|{max_distance}"
+    data = linguistic_data
+    profile = profiling.current_profile()
+    start_time = time.perf_counter()
+    suggestions = _get_cached_suggestions(word, limit, max_distance, data)
+    if profile is not None:
+        profile.record('cache_lookup', time.perf_counter() - start_time, int(suggestions is not None), 'hits')
+    if suggestions is not None:
+        return suggestions
+    return _compute_suggestions(word, limit, max_distance, data)
 
-    if cache_key in cache:
-        return cache[cache_key]
+def get_batch_suggestions(words: Iterable[str], limit: int, max_distance: int) -> Dict[str, List[str]]:
+    """
+    Generates suggestions for several words at once. Each distinct word is looked up once,
+    and words already in the suggestion cache are answered before any new search runs.
+    """
+    unique_words = list(dict.fromkeys(words))
+    data = linguistic_data
 
+    results: Dict[str, List[str]] = {}
+    misses: List[str] = []
+    profile = profiling.current_profile()
     start_time = time.perf_counter()
-    finder = SuggestionFinder(word, limit, max_distance, linguistic_data)
-    suggestions = finder.get_suggestions()
-    end_time = time.perf_counter()
-    duration_ms = (end_time - start_time) * 1000
-    print(f"💡 Suggestion generation for '{word}' took {duration_ms:.2f} ms. (First time)")
+    for word in unique_words:
+        cached = _get_cached_suggestions(word, limit, max_distance, data)
+        if cached is None:
+            misses.append(word)
+        else:
+            results[word] = cached
+    if profile is not None:
+        profile.record('cache_lookup', time.perf_counter() - start_time, len(results), 'hits')
 
-    cache[cache_key] = suggestions
-    
-    # Delegate the cache management to a dedicated helper function.
-    new_creation_time = _manage_suggestion_cache(cache, linguistic_data['suggestion_cache_created_at'])
-    linguistic_data['suggestion_cache_created_at'] = new_creation_time
+    for word in misses:
+        results[word] = _compute_suggestions(word, limit, max_distance, data)
+    return results
 
-    return suggestions
+def get_cache_stats() -> List[Dict[str, Any]]:
+    """Returns the size, limits and hit/miss/eviction counters of every cache."""
+    data = linguistic_data
+    caches = [data[name] for name in ('suggestion_cache', 'paragraph_cache', 'validation_cache')]
+    for optional_cache in ('precomputed_suggestions', 'shared_suggestion_cache'):
+        if data.get(optional_cache) is not None:
+            caches.append(data[optional_cache])
+    return [cache.stats() for cache in caches]
+
+def get_data_structure_sizes() -> Dict[str, int]:
+    """
+    Returns the approximate memory (bytes) of each structure of the linguistic data. Measuring
+    walks the structures, so it is done once per loaded version of the data and remembered.
+    """
+    global _structure_sizes
+    data = linguistic_data
+    if _structure_sizes[0] is data:
+        return _structure_sizes[1]
+
+    sizes = {name: _approx_structure_bytes(data[name])
+             for name in ('stems_map', 'bad_words_set', 'suffixes_list', 'verb_infinitives', 'particles_set', 'all_prefixes')
+             if name in data}
+    if data.get('verb_forms_storage'):
+        sizes['verb_forms'] = data['verb_forms_storage']['bytes']
+    else:  # Mapped from a snapshot.
+        sizes['verb_forms'] = sum(_approx_structure_bytes(data[name]) for name in ('single_word_verb_forms', 'multi_word_verb_phrases')
+                                  if name in data)
+    sizes['suggestion_index'] = data['suggestion_index'].size_bytes
+    if 'source_tables' in data:
+        # The rows kept for reloads (their values are mostly shared with the structures above).
+        sizes['source_tables'] = sum(_approx_structure_bytes(rows) for rows in data['source_tables'].values())
+    _structure_sizes = (data, sizes)
+    return sizes
+
+# The data whose structure sizes were measured last, and the sizes.
+_structure_sizes: Tuple[Optional[Dict[str, Any]], Dict[str, int]] = (None, {})
 
 # --- INTERNAL HELPER FUNCTIONS ---
 
-def _manage_suggestion_cache(cache: Dict[str, List[str]], creation_time: datetime) -> datetime:
+def _approx_structure_bytes(value: Any) -> int:
+    """Approximates the memory held by a container and its items (one level deep)."""
+    if hasattr(value, 'nbytes'):  # Structures that live outside the Python heap (compact sets, snapshots).
+        return value.nbytes
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(sys.getsizeof(k) + sys.getsizeof(v) for k, v in value.items())
+    if isinstance(value, (set, frozenset, list, tuple)):
+        return sys.getsizeof(value) + sum(sys.getsizeof(item) for item in value)
+    return sys.getsizeof(value)
+
+def _timed(function: Callable, totals: List) -> Callable:
+    """Wraps a function to add its duration and one call to `totals` ([seconds, calls]) on every call."""
+    def timed(*args):
+        start_time = time.perf_counter()
+        try:
+            return function(*args)
+        finally:
+            totals[0] += time.perf_counter() - start_time
+            totals[1] += 1
+    return timed
+
+def _suggestion_cache_key(word: str, limit: int, max_distance: int) -> str:
+    return f"{word}|{limit}|{max_distance}"
+
+def _get_cached_suggestions(word: str, limit: int, max_distance: int, data: Dict[str, Any]) -> Optional[List[str]]:
     """
-    Checks the cache size and clears it if it exceeds the limit, logging details.
-    Returns the new creation timestamp for the cache.
+    Looks suggestions up in the precomputed table, then in this process's cache,
+    then in the shared cache (the last two if enabled).
     """
-    CACHE_LIMIT = 10000 # Your real limit would be 10000
-    if len(cache) <= CACHE_LIMIT:
-        return creation_time
+    precomputed: Optional[PrecomputedSuggestions] = data.get('precomputed_suggestions')
+    if precomputed is not None:
+        suggestions = precomputed.get(word, limit, max_distance)
+        if suggestions is not None:
+            return suggestions
 
-    deletion_time = datetime.now()
-    lifetime = deletion_time - creation_time
-    
-    creation_str = creation_time.strftime('%Y-%m-%d %H:%M:%S')
-    deletion_str = deletion_time.strftime('%Y-%m-%d %H:%M:%S')
+    cache_key = _suggestion_cache_key(word, limit, max_distance)
+    suggestions = data['suggestion_cache'].get(cache_key)
+    shared_cache: Optional[SharedSuggestionCache] = data.get('shared_suggestion_cache')
+    if suggestions is None and shared_cache is not None:
+        suggestions = shared_cache.get(cache_key)
+        if suggestions is not None:
+            data['suggestion_cache'].put(cache_key, suggestions)
+    return suggestions
 
-    cache_size_bytes = sys.getsizeof(cache) + sum(sys.getsizeof(k) + sys.getsizeof(v) for k, v in cache.items())
-    
-    # --- Smart Unit Display ---
-    # Display in KB if the size is less than a megabyte, otherwise display in MB.
-    if cache_size_bytes < (1024 * 1024):
-        size_str = f"{cache_size_bytes / 1024:.2f} KB"
-    else:
-        size_str = f"{cache_size_bytes / (1024 * 1024):.2f} MB"
-    
-    print(f"ℹ️ Suggestion cache cleared. Freed approx. {size_str}. "
-          f"Lifetime: {str(lifetime).split('.')[0]}. "
-          f"(Created: {creation_str}, Deleted: {deletion_str})")
-    
-    cache.clear()
-    return datetime.now()
-
-def _is_word_correct_in_memory(word_to_check: str) -> ValidationResult:
+def _compute_suggestions(word: str, limit: int, max_distance: int, data: Dict[str, Any]) -> List[str]:
+    """Runs the suggestion search for a word that isn't cached, and caches the result."""
+    start_time = time.perf_counter()
+    finder = SuggestionFinder(word, limit, max_distance, data['suggestion_index'])
+    suggestions = finder.get_suggestions()
+    end_time = time.perf_counter()
+    metrics.suggestion_searches.observe(end_time - start_time, (str(max_distance),))
+    duration_ms = (end_time - start_time) * 1000
+    print(f"💡 Suggestion generation for '{word}' took {duration_ms:.2f} ms. (First time)")
+
+    cache_key = _suggestion_cache_key(word, limit, max_distance)
+    data['suggestion_cache'].put(cache_key, suggestions)
+    if data.get('shared_suggestion_cache') is not None:
+        data['shared_suggestion_cache'].put(cache_key, suggestions)
+    return suggestions
+
+def _validate_word(word: str, data: Dict[str, Any]) -> ValidationResult:
+    """Validates a word, remembering the result since the same tokens repeat across requests."""
+    cache: LRUCache = data['validation_cache']
+    validation = cache.get(word)
+    if validation is None:
+        validation = _is_word_correct_in_memory(word, data)
+        cache.put(word, validation)
+    return validation
+
+def _is_word_correct_in_memory(word_to_check: str, data: Dict[str, Any]) -> ValidationResult:
     """Checks a single word against the cached linguistic rules."""
-    if word_to_check in linguistic_data.get('particles_set', set()):
+    if word_to_check in data.get('particles_set', set()):
         return ValidationResult(is_correct=True)
-    if word_to_check in linguistic_data.get('single_word_verb_forms', set()):
+    if word_to_check in data.get('single_word_verb_forms', set()):
         return ValidationResult(is_correct=True)
 
-    stems_map = linguistic_data.get('stems_map', {})
+    stems_map = data.get('stems_map', {})
     if word_to_check in stems_map:
-        return ValidationResult(is_correct=True, is_bad=word_to_check in linguistic_data.get('bad_words_set', set()))
-
-    for suffix_info in linguistic_data.get('suffixes_list', []):
-        suffix = suffix_info['suffix']
-        if word_to_check.endswith(suffix):
-            stem_part = word_to_check[:-len(suffix)]
-            
-            if stem_part in stems_map:
-                if stems_map[stem_part]['sound_type'] in suffix_info['applies_to_sound']:
-                    if stem_part.endswith('ە') and suffix.startswith(('ا', 'ە')): continue
-                    return ValidationResult(is_correct=True, is_bad=stem_part in linguistic_data.get('bad_words_set', set()))
-            
-            if suffix.startswith(('ا', 'ە')):
-                original_stem_guess = stem_part + 'ە'
-                if original_stem_guess in stems_map:
-                    return ValidationResult(is_correct=True, is_bad=original_stem_guess in linguistic_data.get('bad_words_set', set()))
-
-    return ValidationResult(is_correct=False)
+        return ValidationResult(is_correct=True, is_bad=word_to_check in data.get('bad_words_set', set()))
+
+    return _check_suffixes_in_memory(word_to_check, SUFFIX_STACK_DEPTH, data) or ValidationResult(is_correct=False)
+
+def _check_suffixes_in_memory(word_to_check: str, stack_depth: int, data: Dict[str, Any]) -> Optional[ValidationResult]:
+    """
+    Checks whether the word is a known stem followed by suffixes, using the reversed suffix trie.
+    Returns None if no analysis is found.
+    """
+    stems_map = data.get('stems_map', {})
+    bad_words_set = data.get('bad_words_set', set())
+    suffix_matches = data['suffix_trie'].matches(word_to_check)
+
+    for match in suffix_matches:
+        stem_part = word_to_check[:-len(match.suffix)]
+
+        if stem_part in stems_map:
+            if stems_map[stem_part]['sound_type'] in match.applies_to:
+                if stem_part.endswith('ە') and match.drops_final_e: continue
+                return ValidationResult(is_correct=True, is_bad=stem_part in bad_words_set)
+
+        if match.drops_final_e:
+            original_stem_guess = stem_part + 'ە'
+            if original_stem_guess in stems_map:
+                return ValidationResult(is_correct=True, is_bad=original_stem_guess in bad_words_set)
+
+    # Optionally peel one more suffix and check the rest as a derived word itself.
+    if stack_depth > 1:
+        suffix_trie: SuffixTrie = data['suffix_trie']
+        for match in suffix_matches:
+            inner_word = word_to_check[:-len(match.suffix)]
+            if len(inner_word) < 2 or suffix_trie.sound_type_of(inner_word) not in match.applies_to:
+                continue
+            result = _check_suffixes_in_memory(inner_word, stack_depth - 1, data)
+            if result is not None:
+                return result
+
+    return None
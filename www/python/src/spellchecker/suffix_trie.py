@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+CKB Bijar Spellchecker - Reversed Suffix Trie
+This module stores every suffix back to front, so a single walk from the end
+of a word finds all the suffixes it actually ends with, instead of calling
+`endswith` for every entry of the suffix list.
+"""
+from __future__ import annotations
+
+from collections import Counter
+from typing import Any, Dict, FrozenSet, Iterable, List, Mapping, NamedTuple
+
+# Suffixes starting with these letters drop the final 'ە' of a stem ("tomato" rule).
+E_DROPPING_SUFFIX_STARTS = ('ا', 'ە')
+
+class SuffixMatch(NamedTuple):
+    """A suffix the word ends with, along with its precomputed rules."""
+    order: int                      # Position in the original suffix list, to keep its priority.
+    suffix: str
+    applies_to: FrozenSet[str]      # The stem sound types this suffix can attach to.
+    drops_final_e: bool             # Whether the 'ە'-stem rule applies to this suffix.
+
+class _TrieNode:
+    __slots__ = ('children', 'matches')
+
+    def __init__(self):
+        self.children: Dict[str, _TrieNode] = {}
+        self.matches: List[SuffixMatch] = []
+
+class SuffixTrie:
+    """A trie of reversed suffixes with the sound-type rules resolved at build time."""
+    def __init__(self, suffixes_list: Iterable[Dict[str, Any]], stems_map: Mapping[str, Any]):
+        self._root = _TrieNode()
+
+        # `applies_to_sound` is matched by substring, exactly like the original loop did,
+        # but only once per (suffix, sound type) instead of once per word.
+        sound_types = {info['sound_type'] for info in stems_map.values()}
+        for order, suffix_info in enumerate(suffixes_list):
+            suffix = suffix_info['suffix']
+            if not suffix:
+                continue
+            applies_to = frozenset(t for t in sound_types if t in suffix_info['applies_to_sound'])
+            match = SuffixMatch(order, suffix, applies_to, suffix.startswith(E_DROPPING_SUFFIX_STARTS))
+
+            node = self._root
+            for char in reversed(suffix):
+                child = node.children.get(char)
+                if child is None:
+                    child = node.children[char] = _TrieNode()
+                node = child
+            node.matches.append(match)
+
+        # The most common sound type of the stems ending in each letter. Used to decide
+        # which suffixes can follow another suffix when stacking is enabled.
+        final_letter_votes: Dict[str, Counter] = {}
+        for stem, info in stems_map.items():
+            if stem:
+                final_letter_votes.setdefault(stem[-1], Counter())[info['sound_type']] += 1
+        self._sound_type_by_final_letter: Dict[str, str] = {
+            letter: votes.most_common(1)[0][0] for letter, votes in final_letter_votes.items()
+        }
+
+    def matches(self, word: str) -> List[SuffixMatch]:
+        """Returns every suffix `word` ends with, in suffix-list order."""
+        found: List[SuffixMatch] = []
+        node = self._root
+        for i in range(len(word) - 1, -1, -1):
+            node = node.children.get(word[i])
+            if node is None:
+                break
+            found.extend(node.matches)
+        found.sort()
+        return found
+
+    def sound_type_of(self, word: str) -> str:
+        """Guesses the sound type of a (derived) word from the stems sharing its final letter."""
+        return self._sound_type_by_final_letter.get(word[-1:], '')
@@ -4,46 +4,120 @@ CKB Bijar Spellchecker - Suggestion Engine
 This module is the "Detective" of the spellchecker. It contains the
 SuggestionFinder class responsible for intelligently finding corrections.
 """
+from __future__ import annotations
 
-from typing import Any, Dict, List, Set, Tuple
+import sys
+import time
+from types import MappingProxyType
+from typing import Any, Dict, FrozenSet, Iterator, List, Mapping, NamedTuple, Set, Tuple
 import Levenshtein
-from .constants import GROUP_1_PRONOUNS
+from .constants import GROUP_1_PRONOUNS, MAX_LEVENSHTEIN_DISTANCE
+from .deletion_index import DeletionIndex
+from . import metrics, profiling
+
+class SuggestionIndex(NamedTuple):
+    """
+    The read-only search structures shared by every SuggestionFinder.
+    Built once by `load_all_data_into_memory` instead of on every cache miss.
+    """
+    stems_map: Mapping[str, Any]
+    stem_index: DeletionIndex
+    sorted_suffixes: Tuple[Dict[str, Any], ...]
+    single_word_verb_forms: Set[str]
+    multi_word_phrases: Set[str]
+    all_prefixes: FrozenSet[str]
+    deletion_index: DeletionIndex
+    build_seconds: float
+    size_bytes: int
+
+    @classmethod
+    def build(cls, data: Dict[str, Any]) -> SuggestionIndex:
+        """
+        Builds the index from the loaded linguistic data and reports its cost.
+        Deletion indexes already present in the data (e.g. from a snapshot) are reused.
+        """
+        start_time = time.perf_counter()
+
+        stems_map: Dict[str, Any] = data.get('stems_map', {})
+        stem_index = data.get('stem_index') or DeletionIndex(stems_map, MAX_LEVENSHTEIN_DISTANCE)
+
+        sorted_suffixes = tuple(sorted(
+            data.get('suffixes_list', []),
+            key=lambda s: len(s.get('suffix', '')),
+            reverse=True
+        ))
+        deletion_index = data.get('deletion_index') or DeletionIndex(_iter_base_words(data), MAX_LEVENSHTEIN_DISTANCE)
+
+        size_bytes = (
+            deletion_index.approx_size_bytes()
+            + stem_index.approx_size_bytes()
+            + sys.getsizeof(sorted_suffixes)
+        )
+        build_seconds = time.perf_counter() - start_time
+
+        index = cls(
+            stems_map=MappingProxyType(stems_map),
+            stem_index=stem_index,
+            sorted_suffixes=sorted_suffixes,
+            single_word_verb_forms=data.get('single_word_verb_forms', set()),
+            multi_word_phrases=data.get('multi_word_verb_phrases', set()),
+            all_prefixes=frozenset(data.get('all_prefixes', set())),
+            deletion_index=deletion_index,
+            build_seconds=build_seconds,
+            size_bytes=size_bytes
+        )
+        print(f"✅ Suggestion index built for {len(deletion_index):,} words in {build_seconds * 1000:.2f} ms "
+              f"(approx. {size_bytes / (1024 * 1024):.2f} MB).")
+        return index
+
+def _iter_base_words(data: Dict[str, Any]) -> Iterator[str]:
+    """Yields the stems, infinitives, single-word verb forms and particles."""
+    yield from data.get('stems_map', {})
+    yield from data.get('verb_infinitives', set())
+    yield from data.get('single_word_verb_forms', set())
+    yield from data.get('particles_set', set())
 
 class SuggestionFinder:
     """A self-contained engine to find suggestions for a single misspelled word."""
-    def __init__(self, word: str, limit: int, max_distance: int, data: Dict[str, Any]):
+    def __init__(self, word: str, limit: int, max_distance: int, index: SuggestionIndex):
         self.word = word
         self.limit = limit
         self.max_distance = max_distance
         self.candidates: Dict[str, float] = {}
         
-        # --- Data setup ---
-        self.stems_map: Dict[str, Any] = data.get('stems_map', {})
-        self.stems_by_len: Dict[int, Set[str]] = {}
-        for stem in self.stems_map:
-            self.stems_by_len.setdefault(len(stem), set()).add(stem)
-
-        self.multi_word_phrases: Set[str] = data.get('multi_word_verb_phrases', set())
-        self.single_word_verb_forms: Set[str] = data.get('single_word_verb_forms', set())
-        self.all_prefixes: Set[str] = data.get('all_prefixes', set())
-        self.master_dictionary: Set[str] = {
-            *self.stems_map.keys(),
-            *data.get('verb_infinitives', set()),
-            *self.single_word_verb_forms,
-            *data.get('particles_set', set())
-        }
-        self.sorted_suffixes: List[Dict[str, Any]] = sorted(
-            data.get('suffixes_list', []),
-            key=lambda s: len(s.get('suffix', '')), 
-            reverse=True
-        )
+        # --- Data setup (shared, never modified) ---
+        self.stems_map = index.stems_map
+        self.stem_index = index.stem_index
+        self.multi_word_phrases = index.multi_word_phrases
+        self.single_word_verb_forms = index.single_word_verb_forms
+        self.all_prefixes = index.all_prefixes
+        self.deletion_index = index.deletion_index
+        self.sorted_suffixes = index.sorted_suffixes
 
     def get_suggestions(self) -> List[str]:
         """Main method to run the entire suggestion process."""
+        start_time = time.perf_counter()
         self._find_simple_word_suggestions()
+        simple_done, simple_count = time.perf_counter(), len(self.candidates)
         self._find_stem_suffix_suggestions()
+        stem_suffix_done, stem_suffix_count = time.perf_counter(), len(self.candidates)
         self._find_structural_verb_suggestions()
-        return self._rank_suggestions()
+        verb_done = time.perf_counter()
+        suggestions = self._rank_suggestions()
+        rank_done = time.perf_counter()
+
+        metrics.suggestion_hypothesis_seconds.inc(simple_done - start_time, ('simple_word',))
+        metrics.suggestion_hypothesis_seconds.inc(stem_suffix_done - simple_done, ('stem_suffix',))
+        metrics.suggestion_hypothesis_seconds.inc(verb_done - stem_suffix_done, ('structural_verb',))
+        metrics.suggestion_hypothesis_seconds.inc(rank_done - verb_done, ('ranking',))
+        profile = profiling.current_profile()
+        if profile is not None:
+            # The number of new candidates each hypothesis found.
+            profile.record('simple_word', simple_done - start_time, simple_count, 'candidates')
+            profile.record('stem_suffix', stem_suffix_done - simple_done, stem_suffix_count - simple_count, 'candidates')
+            profile.record('structural_verb', verb_done - stem_suffix_done, len(self.candidates) - stem_suffix_count, 'candidates')
+            profile.record('ranking', rank_done - verb_done, len(suggestions), 'suggestions')
+        return suggestions
 
     def _add_candidate(self, candidate: str, distance: int, bonus: float = 1.0):
         """Calculates a smart score and adds the candidate."""
@@ -56,12 +130,8 @@ class SuggestionFinder:
 
     def _find_simple_word_suggestions(self):
         """Hypothesis A: The word is a simple misspelling of a base word."""
-        for candidate in self.master_dictionary:
-            if abs(len(self.word) - len(candidate)) > self.max_distance:
-                continue
-            dist = Levenshtein.distance(self.word, candidate)
-            if dist <= self.max_distance:
-                self._add_candidate(candidate, dist)
+        for candidate, dist in self.deletion_index.lookup(self.word, self.max_distance):
+            self._add_candidate(candidate, dist)
 
     def _find_stem_suffix_suggestions(self):
         """Hypothesis B: A definitive, high-speed, suffix-first search."""
@@ -72,32 +142,36 @@ class SuggestionFinder:
             hypothetical_stem = self.word[:i]
             hypothetical_suffix = self.word[i:]
 
-            # The core optimization: loop through the small suffix list FIRST.
+            # The core optimization: compare the ending with the small suffix list FIRST.
+            plausible_suffixes: List[Tuple[Dict[str, Any], str, int]] = []
             for suffix_info in self.sorted_suffixes:
                 real_suffix = suffix_info.get('suffix', '')
                 if not real_suffix: continue
 
                 # If the suffix is too different from the word's ending, skip entirely.
                 suffix_dist = Levenshtein.distance(hypothetical_suffix, real_suffix)
-                if suffix_dist > self.max_distance:
-                    continue
+                if suffix_dist <= self.max_distance:
+                    plausible_suffixes.append((suffix_info, real_suffix, suffix_dist))
+            if not plausible_suffixes: continue
 
+            # Fetch only the stems within the budget left by the closest suffix for this split.
+            stem_budget = self.max_distance - min(suffix_dist for _, _, suffix_dist in plausible_suffixes)
+            near_stems = list(self.stem_index.lookup(hypothetical_stem, stem_budget))
+
+            for suffix_info, real_suffix, suffix_dist in plausible_suffixes:
                 remaining_dist = self.max_distance - suffix_dist
 
                 # --- Strategy 1: The General Search ---
-                # Now that we have a plausible suffix, find a close stem.
-                len_range = range(len(hypothetical_stem) - remaining_dist, len(hypothetical_stem) + remaining_dist + 1)
-                for length in len_range:
-                    for real_stem in self.stems_by_len.get(length, set()):
-                        if (real_stem, real_suffix) in processed_pairs: continue
-                        
-                        if Levenshtein.distance(hypothetical_stem, real_stem) <= remaining_dist:
-                            if self.stems_map[real_stem]['sound_type'] in suffix_info.get('applies_to_sound', ''):
-                                reconstructed = (real_stem[:-1] if real_stem.endswith('ە') and real_suffix.startswith(('ا', 'ە')) else real_stem) + real_suffix
-                                final_dist = Levenshtein.distance(self.word, reconstructed)
-                                if final_dist <= self.max_distance:
-                                    self._add_candidate(reconstructed, final_dist)
-                                processed_pairs.add((real_stem, real_suffix))
+                # Now that we have a plausible suffix, keep the close stems that fit the remaining budget.
+                for real_stem, stem_dist in near_stems:
+                    if stem_dist > remaining_dist or (real_stem, real_suffix) in processed_pairs: continue
+
+                    if self.stems_map[real_stem]['sound_type'] in suffix_info.get('applies_to_sound', ''):
+                        reconstructed = (real_stem[:-1] if real_stem.endswith('ە') and real_suffix.startswith(('ا', 'ە')) else real_stem) + real_suffix
+                        final_dist = Levenshtein.distance(self.word, reconstructed)
+                        if final_dist <= self.max_distance:
+                            self._add_candidate(reconstructed, final_dist)
+                        processed_pairs.add((real_stem, real_suffix))
                 
                 # --- Strategy 2: The "Tomato Fix" (fast and targeted) ---
                 if real_suffix.startswith(('ا', 'ە')):
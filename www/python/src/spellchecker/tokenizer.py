@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+"""
+CKB Bijar Spellchecker - Tokenizer
+Finds the words of a text that are checked, and normalizes the ways they are commonly typed
+into the spelling the dictionary uses:
+  - Arabic letters typed on Arabic/Persian keyboard layouts (ي ى ك) are read as the Kurdish ی and ک.
+  - A zero-width non-joiner (ZWNJ, U+200C) inside a word doesn't split it. The legacy 'ه' + ZWNJ
+    is read as 'ە', also at the end of a word (e.g. 'که‌'); any other ZWNJ is dropped.
+  - Runs of letters joined to digits (Kurdish, Arabic or Latin) or Latin letters, e.g. 'ساڵی2020',
+    are not words and are skipped as a whole.
+The offsets of a token always cover the text as it was written.
+"""
+from __future__ import annotations
+
+import re
+from typing import Iterator
+
+KURDISH_LETTERS = 'ئابپتجچحخدرڕزژسشعغفڤقکگلڵمنوۆھهەیێ'
+ZWNJ = '\u200c'
+
+# Arabic letters typed in place of the Kurdish ones, and what they are read as.
+LETTER_VARIANTS = {'ي': 'ی', 'ى': 'ی', 'ك': 'ک'}
+
+# A run of letters, possibly joined by ZWNJs, that doesn't touch other word characters (letters of
+# other scripts, digits, '_') on either side. A final 'ه' + ZWNJ is part of the word (the ZWNJ
+# makes it 'ە'). Compiled once: it runs over every checked text.
+_WORD_PATTERN = re.compile(
+    rf"\b[{KURDISH_LETTERS}]+(?:{ZWNJ}+[{KURDISH_LETTERS}]+)*(?:(?<=ه){ZWNJ}+(?![\w{ZWNJ}])|\b)")
+
+_LETTER_VARIANTS_TABLE = str.maketrans(LETTER_VARIANTS)
+
+def tokenize(text: str) -> Iterator[re.Match[str]]:
+    """
+    Yields a match for every word of `text`, in order. The matches are made on the text with the
+    letter variants replaced (which leaves the offsets unchanged), so a match's text still needs
+    `normalize_word` but its span is the word as written.
+    """
+    if any(variant in text for variant in LETTER_VARIANTS):
+        text = text.translate(_LETTER_VARIANTS_TABLE)
+    return _WORD_PATTERN.finditer(text)
+
+def normalize_word(token: str) -> str:
+    """The spelling a token is checked as, e.g. 'كتێب' -> 'کتێب', 'ده‌كه‌م' -> 'دەکەم'."""
+    if ZWNJ in token:
+        token = token.replace('ه' + ZWNJ, 'ە').replace(ZWNJ, '')
+    return token.translate(_LETTER_VARIANTS_TABLE)
@@ -27,6 +27,21 @@ class Verb:
         self.is_transitive = bool(is_transitive)
         self.valid_prefixes = valid_prefixes
 
+    @property
+    def past_pronouns(self) -> Set[str]:
+        """The pronoun endings of the past tenses: agent pronouns for transitive verbs, subject endings otherwise."""
+        return GROUP_1_PRONOUNS if self.is_transitive else GROUP_2_PRONOUNS
+
+    @property
+    def perfect_base_stem(self) -> str:
+        """The past stem extended for the perfect tense (e.g., "گرتوو")."""
+        return self.past_stem + ('وو' if self.past_stem.endswith(('د', 'ت')) else 'و')
+
+    @property
+    def present_forms(self) -> List[str]:
+        """The present stem with each subject ending, before the 'دە' (e.g., "گرم", "گرێت")."""
+        return self._generate_present_forms()
+
     def generate_all_conjugations(self) -> Set[str]:
         """The definitive engine for creating every possible correct verb form."""
         # --- Phase 1: Generate all PREFIX-LESS forms and BASE forms for prefixing ---
@@ -38,11 +53,11 @@ class Verb:
         base_prefixable_forms: Set[str] = {self.past_stem}
         
         # Generate present tense forms (e.g., "دەگرم")
-        present_stems_inflected = {'دە' + f for f in self._generate_present_forms()}
+        present_stems_inflected = {'دە' + f for f in self.present_forms}
         all_forms.update(present_stems_inflected)
 
         # Generate past tense forms with pronouns (e.g., "گرتم")
-        past_pronouns = GROUP_1_PRONOUNS if self.is_transitive else GROUP_2_PRONOUNS
+        past_pronouns = self.past_pronouns
         all_forms.update(self.past_stem + p for p in past_pronouns)
 
         # Generate past far forms (e.g., "گرتبوو", "گرتبووم")
@@ -51,7 +66,7 @@ class Verb:
         all_forms.update(past_far_base + p for p in past_pronouns)
 
         # Generate perfect tense forms (e.g., "گرتوویە", "گرتوومە")
-        perfect_base_stem = self.past_stem + ('وو' if self.past_stem.endswith(('د', 'ت')) else 'و')
+        perfect_base_stem = self.perfect_base_stem
         perfect_base_form = perfect_base_stem + 'ە'
         base_prefixable_forms.add(perfect_base_form)
         all_forms.update(perfect_base_stem + p + 'ە' for p in past_pronouns)
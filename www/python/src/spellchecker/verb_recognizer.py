@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+"""
+CKB Bijar Spellchecker - Rule-Based Verb Recognizer
+This module recognizes conjugated verb forms by parsing them back into
+prefix / pronoun / aspect / stem / person, instead of materialising every
+conjugation of every verb. It follows exactly the rules of
+`Verb.generate_all_conjugations` (including `INVALID_PRONOUN_PAIRS`), so it
+accepts the same forms while only indexing the verbs' stems.
+"""
+from __future__ import annotations
+
+import sys
+from collections.abc import Set as AbstractSet
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from .constants import GROUP_1_PRONOUNS, GROUP_2_PRONOUNS
+from .verb_engine import INVALID_PRONOUN_PAIRS, Verb
+
+# Every non-empty personal ending a past tense can take.
+_PAST_ENDINGS = tuple(sorted((GROUP_1_PRONOUNS | GROUP_2_PRONOUNS) - {''}, key=len, reverse=True))
+_PROGRESSIVE = 'دە'
+_PAST_FAR = 'بوو'
+_PERFECT_ENDING = 'ە'
+_ADDITIVE = 'یش'
+
+class VerbRecognizer:
+    """Decides which verbs (if any) generate a given form, by parsing it against the verbs' stems."""
+    def __init__(self, verbs: Sequence[Verb]):
+        self.verbs: List[Verb] = list(verbs)
+        self._by_infinitive: Dict[str, List[int]] = {}
+        self._by_past_stem: Dict[str, List[int]] = {}
+        self._by_perfect_stem: Dict[str, List[int]] = {}
+        # 'دە' + present form -> (verb, subject ending as the generator isolates it).
+        self._present_forms: Dict[str, List[Tuple[int, str]]] = {}
+        self._prefixes_by_first_char: Dict[str, List[str]] = {}
+
+        for i, verb in enumerate(self.verbs):
+            self._by_infinitive.setdefault(verb.infinitive, []).append(i)
+            self._by_past_stem.setdefault(verb.past_stem, []).append(i)
+            self._by_perfect_stem.setdefault(verb.perfect_base_stem, []).append(i)
+            for form in verb.present_forms:
+                present_form = _PROGRESSIVE + form
+                subject_pronoun = present_form.replace(_PROGRESSIVE + verb.present_stem, '', 1)
+                self._present_forms.setdefault(present_form, []).append((i, subject_pronoun))
+        for prefix in sorted({p for verb in self.verbs for p in verb.valid_prefixes}):
+            self._prefixes_by_first_char.setdefault(prefix[:1], []).append(prefix)
+
+        self.single_word_forms = RecognizedVerbForms(self, multi_word=False)
+        self.multi_word_phrases = RecognizedVerbForms(self, multi_word=True)
+
+    def approx_size_bytes(self) -> int:
+        """Approximates the memory held by the recognizer's indexes (the Verb objects excluded)."""
+        total = 0
+        for table in (self._by_infinitive, self._by_past_stem, self._by_perfect_stem, self._present_forms):
+            total += sys.getsizeof(table) + sum(sys.getsizeof(k) + sys.getsizeof(v) for k, v in table.items())
+        return total
+
+    def matching_verbs(self, form: str) -> Set[int]:
+        """Returns the indexes of every verb whose `generate_all_conjugations` contains `form`."""
+        found = self._unprefixed_verbs(form, bases_only=False)
+        for prefix in self._prefixes_of(form):
+            rest = form[len(prefix):]
+            found.update(i for i in self._unprefixed_verbs(rest, bases_only=True)
+                         if prefix in self.verbs[i].valid_prefixes)
+            if ' ' in rest:
+                found.update(self._phrase_verbs(prefix, rest))
+        return found
+
+    def __contains__(self, form: object) -> bool:
+        return isinstance(form, str) and bool(self.matching_verbs(form))
+
+    def _prefixes_of(self, form: str) -> Iterator[str]:
+        """Yields every verb prefix that `form` starts with."""
+        yield from self._prefixes_by_first_char.get('', ())
+        for prefix in self._prefixes_by_first_char.get(form[:1], ()) if form else ():
+            if form.startswith(prefix):
+                yield prefix
+
+    def _unprefixed_verbs(self, form: str, bases_only: bool) -> Set[int]:
+        """
+        Parses a form without a verb prefix. With `bases_only`, only the forms a prefix can attach
+        to are considered: the infinitive, the past stem, and the past far, perfect and (for
+        transitive verbs) past continuous bases.
+        """
+        verbs, by_past_stem = self.verbs, self._by_past_stem
+        found: Set[int] = set(self._by_infinitive.get(form, ()))
+
+        found.update(by_past_stem.get(form, ()))                                        # گرت
+        if form.endswith(_PAST_FAR):
+            found.update(by_past_stem.get(form[:-len(_PAST_FAR)], ()))                 # گرتبوو
+        if form.endswith(_PERFECT_ENDING):
+            found.update(self._by_perfect_stem.get(form[:-len(_PERFECT_ENDING)], ()))  # گرتووە
+        if form.startswith(_PROGRESSIVE):
+            found.update(i for i in by_past_stem.get(form[len(_PROGRESSIVE):], ()) if verbs[i].is_transitive)  # دەگرت
+        if bases_only:
+            return found
+
+        # Past tenses with a personal ending: گرتم, گرتبووم, گرتوومە
+        for ending in _PAST_ENDINGS:
+            if form.endswith(ending):
+                stem = form[:-len(ending)]
+                found.update(i for i in by_past_stem.get(stem, ()) if ending in verbs[i].past_pronouns)
+                if stem.endswith(_PAST_FAR):
+                    found.update(i for i in by_past_stem.get(stem[:-len(_PAST_FAR)], ()) if ending in verbs[i].past_pronouns)
+            if form.endswith(ending + _PERFECT_ENDING):
+                perfect_stem = form[:-len(ending + _PERFECT_ENDING)]
+                found.update(i for i in self._by_perfect_stem.get(perfect_stem, ()) if ending in verbs[i].past_pronouns)
+
+        if form.startswith(_PROGRESSIVE):
+            # Present tense: دەگرم
+            found.update(i for i, _ in self._present_forms.get(form, ()))
+            # Past continuous with an agent pronoun (transitive verbs): دەمگرت
+            rest = form[len(_PROGRESSIVE):]
+            for pronoun in GROUP_1_PRONOUNS:
+                if rest.startswith(pronoun):
+                    found.update(i for i in by_past_stem.get(rest[len(pronoun):], ()) if verbs[i].is_transitive)
+        return found
+
+    def _phrase_verbs(self, prefix: str, rest: str) -> Iterator[int]:
+        """
+        Parses the rest of a two-word phrase after its verb prefix: an optional 'یش', a group 1
+        pronoun, a space and the verb itself (e.g. "ھەڵم گرت", "ھەڵیشم دەگرێت").
+        """
+        variations = [rest]
+        if rest.startswith(_ADDITIVE):
+            variations.append(rest[len(_ADDITIVE):])
+        for variation in variations:
+            for pronoun in GROUP_1_PRONOUNS:
+                if variation.startswith(pronoun + ' '):
+                    for i in self._phrase_verb_word(variation[len(pronoun) + 1:], pronoun):
+                        verb = self.verbs[i]
+                        if verb.is_transitive and prefix in verb.valid_prefixes:
+                            yield i
+
+    def _phrase_verb_word(self, form: str, pronoun: str) -> Iterator[int]:
+        """Yields the verbs that can follow `pronoun` as the second word of a phrase."""
+        by_past_stem = self._by_past_stem
+
+        # Past tenses where the pronoun is the subject: گرت, گرتووە, گرتبوو
+        yield from by_past_stem.get(form, ())
+        if form.endswith(_PERFECT_ENDING):
+            yield from self._by_perfect_stem.get(form[:-len(_PERFECT_ENDING)], ())
+        if form.endswith(_PAST_FAR):
+            yield from by_past_stem.get(form[:-len(_PAST_FAR)], ())
+
+        # Present tense, where the pronoun is the object: دەگرێت
+        for i, subject_pronoun in self._present_forms.get(form, ()):
+            if (pronoun, subject_pronoun) not in INVALID_PRONOUN_PAIRS:
+                yield i
+
+        # Past tenses with an object ending: گرتیت, دەگرتیت, گرتبوویت
+        for ending in GROUP_2_PRONOUNS:
+            if (pronoun, ending) in INVALID_PRONOUN_PAIRS or not form.endswith(ending):
+                continue
+            stem = form[:len(form) - len(ending)]
+            yield from by_past_stem.get(stem, ())
+            if stem.startswith(_PROGRESSIVE):
+                yield from by_past_stem.get(stem[len(_PROGRESSIVE):], ())
+            if stem.endswith(_PAST_FAR):
+                yield from by_past_stem.get(stem[:-len(_PAST_FAR)], ())
+
+class RecognizedVerbForms(AbstractSet):
+    """
+    A read-only, set-like view of the single-word forms or the multi-word phrases a
+    recognizer accepts. Membership is parsed; iteration generates the forms verb by verb.
+    """
+    def __init__(self, recognizer: VerbRecognizer, multi_word: bool):
+        self._recognizer = recognizer
+        self._multi_word = multi_word
+        self._length: Optional[int] = None
+
+    def __contains__(self, form: object) -> bool:
+        return isinstance(form, str) and (' ' in form) == self._multi_word and form in self._recognizer
+
+    def __iter__(self) -> Iterator[str]:
+        # A form several verbs generate is only yielded for the first of them.
+        matching_verbs = self._recognizer.matching_verbs
+        for i, verb in enumerate(self._recognizer.verbs):
+            for form in verb.generate_all_conjugations():
+                if (' ' in form) == self._multi_word and min(matching_verbs(form)) == i:
+                    yield form
+
+    def first_words(self) -> Set[str]:
+        """
+        The words the phrases start with, without generating them: a verb prefix, an optional
+        'یش' and a group 1 pronoun (e.g. "ھەڵم", "ھەڵیشم"). Single words have none.
+        """
+        if not self._multi_word:
+            return set()
+        return {prefix + additive + pronoun
+                for verb in self._recognizer.verbs if verb.is_transitive
+                for prefix in verb.valid_prefixes
+                for additive in ('', _ADDITIVE)
+                for pronoun in GROUP_1_PRONOUNS}
+
+    def __len__(self) -> int:
+        if self._length is None:
+            self._length = sum(1 for _ in self)
+        return self._length
@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+"""
+CKB Bijar Spellchecker - Wikitext Masking
+Blanks out the parts of raw wikitext that are markup rather than prose, so that
+check_text_block (`mode=wikitext`) only tokenises what readers see:
+  - comments, templates and parser functions (with all their parameters);
+  - <ref> and the other tags whose content isn't prose (math, code, gallery, ...), and the
+    attributes of every other tag;
+  - category, interlanguage and file links (a file's caption is kept), and the targets of
+    the other links (their labels are kept);
+  - URLs, bare or in external links (the labels are kept);
+  - table syntax: the {| |- |} lines, the cell separators and the cell attributes.
+Masked characters are replaced with spaces, so every offset in the text stays the same.
+The text is scanned once; unbalanced brackets and braces are left as they are.
+"""
+from __future__ import annotations
+
+import re
+from typing import Dict, List, Optional, Pattern, Tuple
+
+# Tags whose whole content is skipped, as well as the tag itself.
+OPAQUE_TAGS = frozenset({
+    'ref', 'references', 'math', 'chem', 'ce', 'code', 'pre', 'syntaxhighlight', 'source', 'gallery',
+    'timeline', 'score', 'graph', 'templatedata', 'mapframe', 'maplink', 'imagemap', 'hiero', 'categorytree',
+})
+
+# Namespace names (English and Central Kurdish) of the links that aren't shown as links.
+FILE_NAMESPACES = frozenset({'file', 'image', 'media', 'پەڕگە', 'وێنە', 'میدیا'})
+CATEGORY_NAMESPACES = frozenset({'category', 'پۆل'})
+
+# Interlanguage links ([[en:...]], [[fa:...]], [[zh-yue:...]]) are listed at the end of an article.
+_LANGUAGE_PREFIX = re.compile(r'[a-z]{2,3}(?:-[a-z0-9]+)*')
+
+# The syntax a table line starts with (after any indentation).
+_TABLE_LINE = re.compile(r'[ \t]*(?P<table>\{\||\|\}(?!\})|\|-|\|\+|\||!)')
+
+# Every alternative starts with a literal character, which lets the regex engine skip
+# straight to the next candidate ('<', '{', '}', '[', ']', 'h', 'f' or a line break).
+_MARKUP = re.compile(r"""
+    <!--(?P<comment>)
+  | <(?P<closing>/?)(?P<tag>[a-zA-Z][\w-]*)(?:\s[^<>]*?)?(?P<self_closing>/?)>
+  | \{\{(?P<open_template>)
+  | \}\}(?P<close_template>)
+  | \[\[(?P<open_link>)
+  | \]\](?P<close_link>)
+  | \[(?:(?:https?|ftp):)?//[^\s\[\]<>"]+(?P<external>)
+  | \[mailto:[^\s\[\]<>"]+(?P<mailto>)
+  | https?://[^\s\[\]<>"{}|]+(?P<url>)
+  | ftp://[^\s\[\]<>"{}|]+(?P<ftp>)
+  | \n""" + _TABLE_LINE.pattern + """
+""", re.VERBOSE)
+
+# The attributes of a table cell, up to the '|' that separates them from the content.
+_CELL_ATTRIBUTES = re.compile(r"""[ \t]*(?:[\w-]+[ \t]*=[ \t]*(?:"[^"\n]*"|'[^'\n]*'|[^\s|'"]+)[ \t]*)+\|(?!\|)""")
+
+_closing_tags: Dict[str, Pattern[str]] = {}
+
+def mask_markup(text: str) -> str:
+    """Returns the text with its markup replaced by spaces (same length, same offsets)."""
+    spans: List[Tuple[int, int]] = []
+    templates: List[int] = []  # Where the open '{{' are.
+    links: List[int] = []  # Where the open '[[' are.
+    table_line = _TABLE_LINE.match(text)
+    pos = _mask_table_line(text, table_line, spans) if table_line else 0
+    while True:
+        match = _MARKUP.search(text, pos)
+        if match is None:
+            break
+        start, pos = match.span()
+        kind = 'tag' if match.group('tag') else match.lastgroup
+        if kind == 'comment':
+            end = text.find('-->', pos)
+            pos = len(text) if end < 0 else end + 3
+            spans.append((start, pos))
+        elif kind == 'tag':
+            name = match.group('tag').lower()
+            if name in OPAQUE_TAGS and not match.group('closing') and not match.group('self_closing'):
+                closing_tag = _closing_tags.get(name)
+                if closing_tag is None:
+                    closing_tag = _closing_tags[name] = re.compile(rf'</{re.escape(name)}\s*>', re.IGNORECASE)
+                end_match = closing_tag.search(text, pos)
+                if end_match is not None:
+                    pos = end_match.end()
+            spans.append((start, pos))
+        elif kind == 'open_template':
+            templates.append(start)
+        elif kind == 'close_template':
+            if templates:
+                spans.append((templates.pop(), pos))
+        elif kind == 'open_link':
+            links.append(start)
+        elif kind == 'close_link':
+            if links:
+                spans.extend(_link_masks(text, links.pop(), pos))
+        elif kind in ('external', 'mailto'):
+            spans.append((start, pos))
+            line_end = text.find('\n', pos)
+            end = text.find(']', pos, len(text) if line_end < 0 else line_end)
+            if end >= 0:
+                spans.append((end, end + 1))
+        elif kind in ('url', 'ftp'):
+            spans.append((start, pos))
+        else:
+            pos = _mask_table_line(text, match, spans)
+    return _apply_masks(text, spans)
+
+def _link_masks(text: str, start: int, end: int) -> List[Tuple[int, int]]:
+    """The parts of the link text[start:end] ('[[...]]') that aren't shown as prose."""
+    target, has_label, _ = text[start + 2:end - 2].partition('|')
+    namespace = target.split(':', 1)[0].strip().lower() if ':' in target else ''
+    if not target.startswith(':'):  # '[[:پۆل:...]]' shows a link to the category.
+        if namespace in CATEGORY_NAMESPACES or _LANGUAGE_PREFIX.fullmatch(namespace):
+            return [(start, end)]
+        if namespace in FILE_NAMESPACES:
+            caption = _last_top_level_pipe(text, start + 2, end - 2)
+            if caption is None:
+                return [(start, end)]
+            return [(start, caption + 1), (end - 2, end)]
+    if has_label:
+        return [(start, start + 2 + len(target) + 1), (end - 2, end)]
+    # The ':' that escapes a link ('[[:پۆل:زمان]]') isn't shown either.
+    opening = 3 if target.startswith(':') else 2
+    return [(start, start + opening), (end - 2, end)]
+
+def _last_top_level_pipe(text: str, start: int, end: int) -> Optional[int]:
+    """The offset of the last '|' in text[start:end] outside nested links and templates (None if there is none)."""
+    depth = 0
+    last = None
+    i = start
+    while i < end:
+        pair = text[i:i + 2]
+        if pair in ('[[', '{{'):
+            depth += 1
+            i += 2
+        elif pair in (']]', '}}'):
+            depth = max(0, depth - 1)
+            i += 2
+        else:
+            if text[i] == '|' and depth == 0:
+                last = i
+            i += 1
+    return last
+
+def _mask_table_line(text: str, match: re.Match, spans: List[Tuple[int, int]]) -> int:
+    """
+    Masks the table syntax of the line starting at `match`. Returns where to continue scanning:
+    the end of the line for '{|', '|-' and '|}' (which only hold attributes), else the end of
+    the marker, since cells and captions can hold links and templates.
+    """
+    marker_start, marker_end = match.span('table')
+    line_end = text.find('\n', marker_end)
+    if line_end < 0:
+        line_end = len(text)
+    marker = match.group('table')
+    if marker in ('{|', '|}', '|-'):
+        spans.append((marker_start, line_end))
+        return line_end
+    spans.append((marker_start, marker_end))
+    separator = '!!' if marker == '!' else '||'
+    cell_start = marker_end
+    while True:
+        attributes = _CELL_ATTRIBUTES.match(text, cell_start, line_end)
+        if attributes is not None:
+            spans.append(attributes.span())
+        next_cell = text.find(separator, cell_start, line_end)
+        if next_cell < 0:
+            return marker_end
+        spans.append((next_cell, next_cell + 2))
+        cell_start = next_cell + 2
+
+def _apply_masks(text: str, spans: List[Tuple[int, int]]) -> str:
+    if not spans:
+        return text
+    spans.sort()
+    pieces: List[str] = []
+    last = 0
+    for start, end in spans:
+        if end <= last:
+            continue  # Inside a span already masked (e.g. a link within a template).
+        start = max(start, last)
+        pieces.append(text[last:start])
+        pieces.append(' ' * (end - start))
+        last = end
+    pieces.append(text[last:])
+    return ''.join(pieces)
@@ -0,0 +1,321 @@
+# -*- coding: utf-8 -*-
+"""
+CKB Bijar Spellchecker - Background Writing of New-Word Requests
+With WORD_REQUEST_FLUSH_INTERVAL set, /api/request_new_word only checks a request against
+the ones this process has already seen and queues it. A background thread then writes the
+queued requests with `database_manager.add_new_word_requests`, one batch per transaction.
+
+Before a request is acknowledged, it is appended to a journal file. Each worker process has
+its own journal, named after its host and pid (workers in different containers can share a pid
+and the journal directory), and keeps it locked while it runs. The journal is emptied as the
+requests are written. At exit, the queue is written one last time. Whatever could not be
+written stays in the journal, and the next process to start takes it over.
+A process that can't open or lock its journal writes each request during the HTTP request
+instead, as if the queue were disabled.
+"""
+from __future__ import annotations
+
+import atexit
+import glob
+import itertools
+import json
+import os
+import socket
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, TextIO
+
+import psutil
+import pymysql
+
+from . import database_manager
+from .cache import LRUCache
+from .config import (
+    WORD_REQUEST_BATCH_SIZE, WORD_REQUEST_FLUSH_INTERVAL, WORD_REQUEST_JOURNAL_DIR, WORD_REQUEST_MAX_PENDING
+)
+from .database import PoolTimeoutError, get_db_connection
+
+try:
+    import fcntl
+except ImportError:  # Windows: a journal is taken over once no process with its pid is running.
+    fcntl = None  # type: ignore[assignment]
+
+# While the database is unreachable, the delay between attempts doubles up to this many seconds.
+MAX_RETRY_DELAY = 300
+
+# Errors after which the same batch can be written later (the connection, a lock wait, a deadlock).
+RETRYABLE_ERRORS = (pymysql.OperationalError, pymysql.InterfaceError, PoolTimeoutError)
+
+class WordRequestQueueError(Exception):
+    """Raised when a request cannot be queued; the client should try again later."""
+
+class WordRequestQueue:
+    """Acknowledges new-word requests right away and writes them to the database in batches."""
+    def __init__(self, journal_dir: str, flush_interval: float, batch_size: int, max_pending: int,
+                 connect: Callable[[], Any] = get_db_connection):
+        self.journal_dir = journal_dir
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self._connect = connect
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        # Requests waiting to be written (submission hash -> word), oldest first. They stay
+        # here until their batch is committed, so repeats keep being recognized meanwhile.
+        self._pending: Dict[str, str] = {}
+        # Submissions this process has written recently.
+        self._written = LRUCache('written_word_requests', 100000)
+        self._pid: Optional[int] = None
+        self._journal: Optional[TextIO] = None
+        self._thread: Optional[threading.Thread] = None
+        self._failures = 0
+        self.queued = self.duplicates = self.refused = self.written_directly = 0
+        self.written = self.skipped = self.failed_flushes = self.dead_lettered = 0
+        self.last_flush_at: Optional[datetime] = None
+        self.last_error: Optional[str] = None
+        atexit.register(self.close)
+
+    @property
+    def journal_path(self) -> str:
+        return os.path.join(self.journal_dir, f"requests.{_hostname()}.{os.getpid()}.jsonl")
+
+    def submit(self, word: str, user_hash: str) -> Dict[str, str]:
+        """Queues a user's request for a new word and returns the response for the user."""
+        self._ensure_started()
+        if self._journal is None:
+            # Without a journal, nothing would survive a crash: write the request right away.
+            with self._connect() as db_conn:
+                result = database_manager.add_new_word_request(word, user_hash, db_conn)
+            self.written_directly += 1
+            return result
+        submission = database_manager.submission_hash(word, user_hash)
+        with self._lock:
+            if submission in self._pending or submission in self._written:
+                self.duplicates += 1
+                return {"status": "success", "message": "پێشتر داواکاریت بۆ ئەم وشەیە ناردووە."}
+            if len(self._pending) >= self.max_pending:
+                self.refused += 1
+                raise WordRequestQueueError(f"Too many requests are waiting to be saved ({len(self._pending)}); try again later")
+            try:
+                self._append_to_journal({submission: word})
+            except OSError as e:
+                self.refused += 1
+                raise WordRequestQueueError(f"The request could not be saved: {e}") from e
+            self._pending[submission] = word
+            self.queued += 1
+            batch_ready = len(self._pending) >= self.batch_size
+        if batch_ready and not self._failures:
+            self._wakeup.set()
+        return {"status": "success", "message": "داواکارییەکەت بە سەرکەوتوویی تۆمار کرا."}
+
+    def _ensure_started(self):
+        """Opens this process's journal and starts its writer thread (once per process, after any fork)."""
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            # Anything inherited from the parent process belongs to the parent's journal.
+            self._pending = {}
+            self._journal = self._open_journal()
+            self._pid = os.getpid()
+            if self._journal is None:
+                return
+            self._take_over_orphaned_journals()
+            self._failures = 0
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='word-request-writer', daemon=True)
+            self._thread.start()
+        if self._pending:
+            self._wakeup.set()
+
+    def _open_journal(self) -> Optional[TextIO]:
+        """Opens and locks this process's journal, with the requests a previous process of the same host and pid left in it."""
+        journal = None
+        try:
+            os.makedirs(self.journal_dir, exist_ok=True)
+            journal = open(self.journal_path, 'a+', encoding='utf-8')
+            if fcntl is not None:
+                fcntl.flock(journal.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            journal.seek(0)
+            self._pending.update(_read_journal(journal))
+            return journal
+        except OSError as e:
+            if journal is not None:
+                journal.close()
+            print(f"WARNING: Could not open the new-word request journal '{self.journal_path}' ({e}); "
+                  f"this process writes requests directly to the database.")
+            return None
+
+    def _take_over_orphaned_journals(self):
+        """Moves the requests of journals whose process is gone into this process's journal."""
+        for path in glob.glob(os.path.join(self.journal_dir, 'requests.*.jsonl')):
+            if path == self.journal_path:
+                continue
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    if fcntl is not None:
+                        try:
+                            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                        except OSError:
+                            continue  # Its process is still running.
+                        # Another process may have taken it over (and removed it) while we waited.
+                        if not os.path.exists(path) or os.stat(path).st_ino != os.fstat(f.fileno()).st_ino:
+                            continue
+                    elif _pid_is_running(path):
+                        continue
+                    orphaned = {h: w for h, w in _read_journal(f).items() if h not in self._pending}
+                    self._append_to_journal(orphaned)
+                    self._pending.update(orphaned)
+                    os.remove(path)
+                if orphaned:
+                    print(f"Taking over {len(orphaned)} unsaved new-word request(s) from '{os.path.basename(path)}'.")
+            except OSError as e:
+                print(f"WARNING: Could not take over the new-word requests in '{path}': {e}")
+
+    def _append_to_journal(self, requests: Dict[str, str]):
+        if not requests or self._journal is None:
+            return
+        self._journal.write(''.join(json.dumps({"hash": h, "word": w}, ensure_ascii=False) + '\n' for h, w in requests.items()))
+        self._journal.flush()
+
+    def _rewrite_journal(self):
+        """Leaves only the requests still waiting in the journal. Call with `self._lock` held."""
+        if self._journal is None:
+            return
+        self._journal.seek(0)
+        self._journal.truncate()
+        self._append_to_journal(self._pending)
+
+    def _run(self):
+        while not self._stop.is_set():
+            if self._failures:
+                # Back off while the database is unreachable; a full batch doesn't cut the wait short.
+                self._stop.wait(min(self.flush_interval * 2 ** self._failures, MAX_RETRY_DELAY))
+            else:
+                self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            if not self._stop.is_set():
+                self.flush()
+
+    def flush(self) -> int:
+        """Writes the waiting requests, a batch per transaction. Returns how many were written."""
+        written = 0
+        with self._flush_lock:
+            while True:
+                with self._lock:
+                    batch = dict(itertools.islice(self._pending.items(), self.batch_size))
+                if not batch:
+                    break
+                try:
+                    written += self._write_batch(batch)
+                except RETRYABLE_ERRORS as e:
+                    self._failures += 1
+                    self.failed_flushes += 1
+                    self.last_error = f"{type(e).__name__}: {e}"
+                    print(f"WARNING: Saving {len(self._pending)} new-word request(s) failed ({self.last_error}). Will retry.")
+                    break
+                self._failures = 0
+                self.last_error = None
+                with self._lock:
+                    for submission in batch:
+                        self._pending.pop(submission, None)
+                        self._written.put(submission, True)
+                    self._rewrite_journal()
+            self.last_flush_at = datetime.now()
+        return written
+
+    def _write_batch(self, batch: Dict[str, str]) -> int:
+        with self._connect() as db_conn:
+            try:
+                written, skipped = database_manager.add_new_word_requests(batch, db_conn)
+            except RETRYABLE_ERRORS:
+                raise
+            except pymysql.MySQLError:
+                # The database rejected something in the batch: write the requests one at a
+                # time and set aside the ones it keeps rejecting instead of blocking the queue.
+                written = skipped = 0
+                for submission, word in batch.items():
+                    try:
+                        w, s = database_manager.add_new_word_requests({submission: word}, db_conn)
+                    except RETRYABLE_ERRORS:
+                        raise
+                    except pymysql.MySQLError as e:
+                        self._dead_letter(submission, word, e)
+                        continue
+                    written += w
+                    skipped += s
+        self.written += written
+        self.skipped += skipped
+        return written
+
+    def _dead_letter(self, submission: str, word: str, error: Exception):
+        """Keeps a request the database refuses in 'failed.jsonl' for a maintainer to look at."""
+        self.dead_lettered += 1
+        print(f"WARNING: The new-word request for '{word}' was rejected by the database ({error}); "
+              f"it is kept in '{os.path.join(self.journal_dir, 'failed.jsonl')}'.")
+        with open(os.path.join(self.journal_dir, 'failed.jsonl'), 'a', encoding='utf-8') as f:
+            f.write(json.dumps({"hash": submission, "word": word, "error": str(error),
+                                "failed_at": datetime.now().isoformat(timespec='seconds')}, ensure_ascii=False) + '\n')
+
+    def close(self):
+        """Stops the writer thread and writes what is still waiting (runs at exit)."""
+        if self._pid != os.getpid():
+            return
+        self._stop.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.flush()
+        if self._pending:
+            print(f"WARNING: {len(self._pending)} new-word request(s) could not be saved; "
+                  f"they are kept in '{self.journal_path}' for the next start.")
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the number of waiting requests and cumulative counters."""
+        return {
+            "pending": len(self._pending),
+            "queued": self.queued,
+            "duplicates": self.duplicates,
+            "refused": self.refused,
+            "written_directly": self.written_directly,
+            "written": self.written,
+            "skipped": self.skipped,
+            "failed_flushes": self.failed_flushes,
+            "dead_lettered": self.dead_lettered,
+            "last_flush_at": self.last_flush_at.isoformat(timespec='seconds') if self.last_flush_at else None,
+            "last_error": self.last_error,
+        }
+
+def _read_journal(f: TextIO) -> Dict[str, str]:
+    requests: Dict[str, str] = {}
+    for line in f:
+        try:
+            entry = json.loads(line)
+            requests[entry['hash']] = entry['word']
+        except (ValueError, KeyError, TypeError):
+            continue  # A line cut short by a crash.
+    return requests
+
+def _hostname() -> str:
+    return socket.gethostname().replace(os.sep, '_') or 'localhost'
+
+def _pid_is_running(path: str) -> bool:
+    """Whether the process of a journal ('requests.<host>.<pid>.jsonl') may still be running."""
+    parts = os.path.basename(path).split('.')
+    # Host names can contain dots; journals written before they were named after the host have none.
+    host = '.'.join(parts[1:-2])
+    if host and host != _hostname():
+        return True  # Its pid means nothing here.
+    try:
+        return psutil.pid_exists(int(parts[-2]))
+    except (ValueError, IndexError):
+        return False
+
+# The queue of this process (None when requests are written during the HTTP request).
+word_request_queue: Optional[WordRequestQueue] = (
+    WordRequestQueue(WORD_REQUEST_JOURNAL_DIR, WORD_REQUEST_FLUSH_INTERVAL, WORD_REQUEST_BATCH_SIZE, WORD_REQUEST_MAX_PENDING)
+    if WORD_REQUEST_FLUSH_INTERVAL > 0 else None
+)
@@ -12,10 +12,14 @@ document.addEventListener('DOMContentLoaded', function() {
     const entriesInfo = document.getElementById('entries-info');
 
     // --- State Variables ---
-    let allWords = [];
     let currentSort = { column: 'request_count', direction: 'desc' };
     let rowsPerPage = parseInt(rowsPerPageSelect.value, 10);
+    // The server pages with cursors: cursors[i] is the cursor of page i + 1 (null for the first page).
+    let cursors = [null];
     let currentPage = 1;
+    let nextCursor = null;
+    let searchTimer = null;
+    let requestId = 0;
 
     // --- Initial Loading State ---
     tableBody.innerHTML = `<tr><td colspan="5" style="text-align:center;">دراوەکان بار دەکرێن...</td></tr>`;
@@ -48,70 +52,64 @@ document.addEventListener('DOMContentLoaded', function() {
         entriesInfo.innerHTML = `پیشاندانی ${start} تا ${end} وشە لە کۆی گشتیی ${total} وشە`;
     }
 
-    // Advanced pagination function with Previous/Next and ellipsis
+    // Previous/Next pagination (the server only knows the next page, not page numbers)
     function renderPagination(totalItems) {
-        const pageCount = Math.ceil(totalItems / rowsPerPage);
         let html = '';
 
-        if (pageCount > 1) {
+        if (totalItems > rowsPerPage) {
             html += '<ul class="pagination">';
-            // Previous button
             html += `<li class="${currentPage === 1 ? 'disabled' : ''}"><a href="#" data-page="${currentPage - 1}">پێشوو</a></li>`;
-
-            let pages = [];
-            if (pageCount <= 7) { // Show all pages if 7 or less
-                for (let i = 1; i <= pageCount; i++) pages.push(i);
-            } else { // Handle ellipsis logic
-                pages.push(1);
-                if (currentPage > 3) pages.push('...');
-                
-                let start = Math.max(2, currentPage - 1);
-                let end = Math.min(pageCount - 1, currentPage + 1);
-                for (let i = start; i <= end; i++) pages.push(i);
-
-                if (currentPage < pageCount - 2) pages.push('...');
-                pages.push(pageCount);
-            }
-            
-            pages.forEach(p => {
-                if (p === '...') {
-                    html += `<li class="disabled"><span>...</span></li>`;
-                } else {
-                    html += `<li class="${p === currentPage ? 'active' : ''}"><a href="#" data-page="${p}">${indoArabicFormatter.format(p)}</a></li>`;
-                }
-            });
-            
-            // Next button
-            html += `<li class="${currentPage === pageCount ? 'disabled' : ''}"><a href="#" data-page="${currentPage + 1}">دواتر</a></li>`;
+            html += `<li class="active"><span>${indoArabicFormatter.format(currentPage)}</span></li>`;
+            html += `<li class="${nextCursor === null ? 'disabled' : ''}"><a href="#" data-page="${currentPage + 1}">دواتر</a></li>`;
             html += '</ul>';
         }
         bottomPaginationWrapper.innerHTML = html;
     }
 
-    function filterAndPaginate() {
-        const filter = searchInput.value.toLowerCase();
-        const filtered = allWords.filter(item => item.word.toLowerCase().includes(filter));
-        const sorted = sortData(filtered);
+    function fetchPage() {
+        const params = new URLSearchParams({
+            limit: rowsPerPage,
+            sort: currentSort.column,
+            order: currentSort.direction,
+        });
+        const query = searchInput.value.trim();
+        if (query) params.set('q', query);
+        const cursor = cursors[currentPage - 1];
+        if (cursor) params.set('cursor', cursor);
 
-        const startIndex = (currentPage - 1) * rowsPerPage;
-        const endIndex = startIndex + rowsPerPage;
-        const paginatedData = sorted.slice(startIndex, endIndex);
+        // Ignore responses that arrive after a newer request was sent
+        const thisRequest = ++requestId;
+        fetch(`/api/get_requested_words?${params}`)
+            .then(res => { if (!res.ok) throw new Error(res.statusText); return res.json(); })
+            .then(page => {
+                if (thisRequest !== requestId) return;
+                nextCursor = page.next_cursor;
+                cursors[currentPage] = nextCursor;
+                const startIndex = (currentPage - 1) * rowsPerPage;
+                renderTable(page.items);
+                updateEntriesInfo(page.total, startIndex, startIndex + page.items.length);
+                renderPagination(page.total);
+            })
+            .catch(err => { tableBody.innerHTML = `<tr><td colspan="5">ھەڵەیەک لە کاتی بارکردنی دراوەکە ڕووی دا: ${err.message}</td></tr>`; });
+    }
 
-        renderTable(paginatedData);
-        updateEntriesInfo(sorted.length, startIndex, endIndex);
-        renderPagination(sorted.length);
+    // Start again from the first page (after the search, sort or page size changed)
+    function reload() {
+        cursors = [null];
+        currentPage = 1;
+        fetchPage();
     }
 
     // --- Helper Functions ---
-    function sortData(data) { return data.sort((a, b) => { let valA = a[currentSort.column]; let valB = b[currentSort.column]; if (currentSort.column.includes('date') || currentSort.column.includes('seen')) { valA = new Date(valA); valB = new Date(valB); } if (valA < valB) return currentSort.direction === 'asc' ? -1 : 1; if (valA > valB) return currentSort.direction === 'asc' ? 1 : -1; return 0; }); }
     function updateSortIndicators() { tableHeaders.forEach(th => { th.classList.remove('sort-asc', 'sort-desc'); if (th.dataset.sort === currentSort.column) { th.classList.add(currentSort.direction === 'asc' ? 'sort-asc' : 'sort-desc'); } }); }
 
     // --- Event Listeners ---
-    searchInput.addEventListener('input', () => { currentPage = 1; filterAndPaginate(); });
-    rowsPerPageSelect.addEventListener('change', () => { rowsPerPage = parseInt(rowsPerPageSelect.value, 10); currentPage = 1; filterAndPaginate(); });
-    tableHeaders.forEach(header => { header.addEventListener('click', () => { const column = header.dataset.sort; const newDirection = currentSort.column === column && currentSort.direction === 'desc' ? 'asc' : 'desc'; currentSort = { column, direction: newDirection }; currentPage = 1; filterAndPaginate(); updateSortIndicators(); }); });
-    bottomPaginationWrapper.addEventListener('click', function(e) { if (e.target.tagName === 'A' && !e.target.parentElement.classList.contains('disabled')) { e.preventDefault(); currentPage = parseInt(e.target.dataset.page, 10); filterAndPaginate(); } });
+    searchInput.addEventListener('input', () => { clearTimeout(searchTimer); searchTimer = setTimeout(reload, 300); });
+    rowsPerPageSelect.addEventListener('change', () => { rowsPerPage = parseInt(rowsPerPageSelect.value, 10); reload(); });
+    tableHeaders.forEach(header => { header.addEventListener('click', () => { const column = header.dataset.sort; const newDirection = currentSort.column === column && currentSort.direction === 'desc' ? 'asc' : 'desc'; currentSort = { column, direction: newDirection }; reload(); updateSortIndicators(); }); });
+    bottomPaginationWrapper.addEventListener('click', function(e) { if (e.target.tagName === 'A' && !e.target.parentElement.classList.contains('disabled')) { e.preventDefault(); currentPage = parseInt(e.target.dataset.page, 10); fetchPage(); } });
     
     // --- Initial Fetch ---
-    fetch('/api/get_requested_words').then(res => res.json()).then(data => { allWords = data; filterAndPaginate(); updateSortIndicators(); }).catch(err => { tableBody.innerHTML = `<tr><td colspan="5">ھەڵەیەک لە کاتی بارکردنی دراوەکە ڕووی دا: ${err.message}</td></tr>`; });
+    fetchPage();
+    updateSortIndicators();
 });
\ No newline at end of file